@@ -1,7 +1,11 @@
 from pathlib import Path
+import importlib.util
 import os
+import tempfile
 from datetime import timedelta
 import dj_database_url
+from corsheaders.defaults import default_headers
+from django.core.exceptions import ImproperlyConfigured
 
 if os.path.isfile('env.py'):
     import env
@@ -24,7 +28,6 @@ INSTALLED_APPS = [
     'dj_rest_auth.registration',
     'rest_framework',
     'rest_framework_simplejwt',
-    'rest_framework.authtoken',
     'rest_framework_simplejwt.token_blacklist',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -37,23 +40,38 @@ INSTALLED_APPS = [
     'allauth.account',
     'allauth.socialaccount',
 
-    # Social providers (example: Google + Facebook)
-    'allauth.socialaccount.providers.google',
-    'allauth.socialaccount.providers.facebook',
-
     'transactions',
     'core',
 ]
 
+# Social login providers to install, comma-separated (e.g.
+# "google,facebook"). Each provider imports an HTTP client and JWT
+# tooling at startup, so none are loaded unless listed here.
+SOCIAL_LOGIN_PROVIDERS = [
+    name.strip()
+    for name in os.environ.get("SOCIAL_LOGIN_PROVIDERS", "").split(",")
+    if name.strip()
+]
+INSTALLED_APPS += [
+    f'allauth.socialaccount.providers.{name}'
+    for name in SOCIAL_LOGIN_PROVIDERS
+]
+
 SITE_ID = 1
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'core.middleware.ServerTimingMiddleware',
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.SlowQueryLogMiddleware',
+    'core.middleware.TrafficCaptureMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.DatabaseCheckoutMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.RequestProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'allauth.account.middleware.AccountMiddleware',
@@ -61,6 +79,7 @@ MIDDLEWARE = [
 
 CORS_ALLOWED_ORIGINS = os.getenv("CORS_ALLOWED_ORIGINS", "").split(",")
 CORS_ALLOW_CREDENTIALS = True
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
 
 SESSION_COOKIE_SECURE = not DEBUG
 CSRF_COOKIE_SECURE = not DEBUG
@@ -86,18 +105,41 @@ REST_AUTH = {
     'JWT_AUTH_SAMESITE': os.environ.get("SAME_SITE"),
     'JWT_AUTH_SECURE': not DEBUG,
     'JWT_AUTH_HTTPONLY': True,
-    'OLD_PASSWORD_FIELD_ENABLED': True
+    'OLD_PASSWORD_FIELD_ENABLED': True,
+    # Logins issue JWTs only, so DRF's authtoken app is not installed
+    'TOKEN_MODEL': None,
 }
 
+# Set FAST_JSON to render and parse JSON with orjson, which must then
+# be installed. Responses are identical to the standard renderer's.
+FAST_JSON = 'FAST_JSON' in os.environ
+if FAST_JSON and importlib.util.find_spec('orjson') is None:
+    raise ImproperlyConfigured(
+        "FAST_JSON is set but orjson is not installed.")
+
+if FAST_JSON:
+    JSON_RENDERER = 'core.renderers.ORJSONRenderer'
+    JSON_PARSER = 'core.renderers.ORJSONParser'
+else:
+    JSON_RENDERER = 'rest_framework.renderers.JSONRenderer'
+    JSON_PARSER = 'rest_framework.parsers.JSONParser'
+
+PARSER_CLASSES = [
+    JSON_PARSER,
+    'rest_framework.parsers.FormParser',
+    'rest_framework.parsers.MultiPartParser',
+]
+
 if DEBUG:
     REST_FRAMEWORK = {
         'DEFAULT_RENDERER_CLASSES': [
-            'rest_framework.renderers.JSONRenderer',
+            JSON_RENDERER,
             'rest_framework.renderers.BrowsableAPIRenderer',
         ],
+        'DEFAULT_PARSER_CLASSES': PARSER_CLASSES,
         'DEFAULT_AUTHENTICATION_CLASSES': [
             'rest_framework.authentication.SessionAuthentication',
-            'dj_rest_auth.jwt_auth.JWTCookieAuthentication',
+            'core.authentication.CachedJWTCookieAuthentication',
         ],
         'TEST_REQUEST_DEFAULT_FORMAT': (
             'json'
@@ -106,11 +148,12 @@ if DEBUG:
 else:
     REST_FRAMEWORK = {
         'DEFAULT_RENDERER_CLASSES': [
-            'rest_framework.renderers.JSONRenderer',
+            JSON_RENDERER,
         ],
+        'DEFAULT_PARSER_CLASSES': PARSER_CLASSES,
         'DEFAULT_AUTHENTICATION_CLASSES': [
-            'dj_rest_auth.jwt_auth.JWTCookieAuthentication',
-            'rest_framework_simplejwt.authentication.JWTAuthentication',
+            'core.authentication.CachedJWTCookieAuthentication',
+            'core.authentication.CachedJWTAuthentication',
         ],
         'DEFAULT_PERMISSION_CLASSES': (
             'rest_framework.permissions.IsAuthenticated',
@@ -130,6 +173,114 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_REFRESH_SERIALIZER': (
+        'core.serializers.CachedTokenRefreshSerializer'),
+}
+
+# Seconds a JWT-authenticated user's record stays cached. Saving or
+# deleting the user invalidates it, but only in caches shared by every
+# worker, so keep the default of 0 (read the user from the database)
+# unless CACHES points at one, such as Redis or Memcached.
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get("AUTH_USER_CACHE_TIMEOUT", 0))
+
+# Seconds a refresh token found not blacklisted is remembered, capped
+# at its remaining lifetime, so refreshes skip the blacklist query.
+# Blacklisting the token overwrites the entry, but only in caches
+# shared by every worker, so keep the default of 0 unless CACHES points
+# at one.
+TOKEN_BLACKLIST_CACHE_TIMEOUT = int(
+    os.environ.get("TOKEN_BLACKLIST_CACHE_TIMEOUT", 0))
+
+# Set SCHEDULED_PURGE when purge_old_transactions runs on a schedule,
+# so old records are no longer deleted inline during the monthly rollover
+SCHEDULED_PURGE = 'SCHEDULED_PURGE' in os.environ
+
+# Set ARCHIVE_OLD_TRANSACTIONS to copy records into the archive table
+# before they are deleted for leaving the visible window
+ARCHIVE_OLD_TRANSACTIONS = 'ARCHIVE_OLD_TRANSACTIONS' in os.environ
+
+# How long a create response is replayed for a repeated Idempotency-Key
+IDEMPOTENCY_KEY_TTL = timedelta(
+    hours=int(os.environ.get("IDEMPOTENCY_KEY_TTL_HOURS", 24)))
+
+# Set ASYNC_SUMMARY_VIEWS when serving SFT_API.asgi so the summary
+# endpoints run their independent queries concurrently
+ASYNC_SUMMARY_VIEWS = 'ASYNC_SUMMARY_VIEWS' in os.environ
+
+# Seconds a summary response stays in the cache. Entries are keyed by
+# data version, so writes invalidate them before this expires.
+SUMMARY_CACHE_TIMEOUT = int(os.environ.get("SUMMARY_CACHE_TIMEOUT", 3600))
+
+# Share of requests (0-1) that get a Server-Timing header with their
+# database, auth, view and render times. 0 removes the middleware.
+SERVER_TIMING_SAMPLE_RATE = float(
+    os.environ.get("SERVER_TIMING_SAMPLE_RATE", 1 if DEBUG else 0))
+
+# Set SERVER_TIMING_LOG to also log each sampled request's timings as
+# a JSON line
+SERVER_TIMING_LOG = 'SERVER_TIMING_LOG' in os.environ
+
+# Directory where each worker process writes its metrics, at most every
+# METRICS_FLUSH_INTERVAL seconds, so /internal/metrics/ can sum them.
+# Without it, the endpoint reports only the process that serves it.
+METRICS_DIR = os.environ.get("METRICS_DIR")
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", 5))
+
+# Token Prometheus sends as `Authorization: Metrics <token>` to scrape
+# /internal/metrics/ without a staff account
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+# Queries slower than this many milliseconds are logged and kept in a
+# ring buffer of the last SLOW_QUERY_BUFFER_SIZE, viewable by staff at
+# /internal/slow-queries/. 0 turns the slow query log off.
+SLOW_QUERY_THRESHOLD_MS = float(
+    os.environ.get("SLOW_QUERY_THRESHOLD_MS", 500))
+SLOW_QUERY_BUFFER_SIZE = int(os.environ.get("SLOW_QUERY_BUFFER_SIZE", 100))
+
+# Share of slow SELECTs (0-1) whose plan is captured: EXPLAIN (ANALYZE,
+# BUFFERS) on PostgreSQL, which runs the query a second time, or
+# EXPLAIN QUERY PLAN on SQLite
+SLOW_QUERY_EXPLAIN_RATE = float(
+    os.environ.get("SLOW_QUERY_EXPLAIN_RATE", 0))
+
+# Lets staff profile any request with ?__profile=cprofile, pyinstrument
+# (if installed) or tracemalloc. Always on in development.
+REQUEST_PROFILING = DEBUG or 'REQUEST_PROFILING' in os.environ
+
+# Directory shared by the worker processes where profile reports are
+# kept for download, and the number of reports kept there
+PROFILE_DIR = os.environ.get(
+    "PROFILE_DIR", os.path.join(tempfile.gettempdir(), 'sft-profiles'))
+PROFILE_STORE_SIZE = int(os.environ.get("PROFILE_STORE_SIZE", 20))
+
+# Set TRAFFIC_CAPTURE_FILE to append a sampled, anonymized record of
+# API requests to that file as JSON lines, for replay_traffic.
+# TRAFFIC_CAPTURE_SAMPLE_RATE is the share of requests recorded (0-1),
+# and users are recorded as one of TRAFFIC_CAPTURE_USER_BUCKETS buckets.
+TRAFFIC_CAPTURE_FILE = os.environ.get("TRAFFIC_CAPTURE_FILE")
+TRAFFIC_CAPTURE_SAMPLE_RATE = float(
+    os.environ.get("TRAFFIC_CAPTURE_SAMPLE_RATE", 0.1))
+TRAFFIC_CAPTURE_USER_BUCKETS = int(
+    os.environ.get("TRAFFIC_CAPTURE_USER_BUCKETS", 1000))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.server_timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'core.slow_queries': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
 }
 
 ROOT_URLCONF = 'SFT_API.urls'
@@ -157,10 +308,29 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'SFT_API.wsgi.application'
 
+# Connection reuse. DB_CONN_MAX_AGE keeps each worker's connection open
+# for that many seconds (health-checked before reuse). Alternatively,
+# DB_POOL_MAX_SIZE enables psycopg 3's connection pool, which requires
+# the psycopg[pool] package and replaces persistent connections.
+DB_POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", 0))
+
 DATABASES = {
-    'default': dj_database_url.parse(os.environ.get("DATABASE_URL"))
+    'default': dj_database_url.parse(
+        os.environ.get("DATABASE_URL"),
+        conn_max_age=(
+            0 if DB_POOL_MAX_SIZE
+            else int(os.environ.get("DB_CONN_MAX_AGE", 0))),
+        conn_health_checks=True,
+    )
 }
 
+if DB_POOL_MAX_SIZE:
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+        'max_size': DB_POOL_MAX_SIZE,
+        'timeout': float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+    }
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
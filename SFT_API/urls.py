@@ -1,7 +1,14 @@
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from core.views import (ChangeEmailView,
-                        CustomUserDetailsView)
+                        CustomUserDetailsView,
+                        CachedTokenRefreshView,
+                        DatabaseConnectionMetricsView,
+                        MetricsView,
+                        ProfileDetailView,
+                        ProfileListView,
+                        SlowQueryLogView)
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -10,9 +17,10 @@ from rest_framework_simplejwt.views import (
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api-auth/', include('rest_framework.urls')),
     path("dj-rest-auth/user/", CustomUserDetailsView.as_view(),
          name="user-details"),
+    re_path(r'^dj-rest-auth/token/refresh/?$',
+            CachedTokenRefreshView.as_view(), name='cookie_token_refresh'),
     path('dj-rest-auth/', include('dj_rest_auth.urls')),
     path('dj-rest-auth/registration/',
          include('dj_rest_auth.registration.urls')),
@@ -23,4 +31,16 @@ urlpatterns = [
          name='token_refresh'),
     path('', include('transactions.urls')),
     path('change-email/', ChangeEmailView.as_view(), name='change_email'),
+    path('internal/db-connections/', DatabaseConnectionMetricsView.as_view(),
+         name='db_connection_metrics'),
+    path('internal/metrics/', MetricsView.as_view(), name='metrics'),
+    path('internal/slow-queries/', SlowQueryLogView.as_view(),
+         name='slow_queries'),
+    path('internal/profiles/', ProfileListView.as_view(), name='profiles'),
+    path('internal/profiles/<str:profile_id>/', ProfileDetailView.as_view(),
+         name='profile_detail'),
 ]
+
+# The browsable API's session login is only rendered in development
+if settings.DEBUG:
+    urlpatterns.append(path('api-auth/', include('rest_framework.urls')))
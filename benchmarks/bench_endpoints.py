@@ -0,0 +1,239 @@
+"""
+Query count, latency and peak memory benchmarks for every API endpoint
+the frontend uses, checked against benchmarks/baselines.json.
+
+Each endpoint fails if it runs more queries than its baseline, or its
+median time or peak memory exceed the baseline by more than the
+configured tolerance. The response cache is disabled, so every request
+computes its data.
+
+Run with:
+    python manage.py test benchmarks --pattern "bench_*.py"
+
+Environment variables:
+    BENCHMARK_USERS             users seeded (default 5)
+    BENCHMARK_SERIES            recurring series per user (default 20)
+    BENCHMARK_ITERATIONS        timed requests per endpoint (default 5)
+    BENCHMARK_TIME_TOLERANCE    allowed median time ratio (default 2.0)
+    BENCHMARK_MEMORY_TOLERANCE  allowed peak memory ratio (default 1.5)
+    BENCHMARK_UPDATE_BASELINES  set to rewrite baselines.json from this run
+
+Baselines are only comparable for the default dataset size and the
+database backend they were recorded on.
+"""
+import json
+import os
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from transactions.models import (
+    Income,
+    Expenditure,
+    DisposableIncomeSpending,
+    DisposableIncomeBudget,
+    Currency,
+)
+from transactions.utils import (
+    generate_weekly_repeats_for_6_months,
+    generate_monthly_repeats_for_6_months,
+)
+
+
+BASELINES_PATH = Path(__file__).with_name('baselines.json')
+
+USERS = int(os.environ.get('BENCHMARK_USERS', 5))
+SERIES = int(os.environ.get('BENCHMARK_SERIES', 20))
+ITERATIONS = int(os.environ.get('BENCHMARK_ITERATIONS', 5))
+TIME_TOLERANCE = float(os.environ.get('BENCHMARK_TIME_TOLERANCE', 2.0))
+MEMORY_TOLERANCE = float(os.environ.get('BENCHMARK_MEMORY_TOLERANCE', 1.5))
+UPDATE_BASELINES = 'BENCHMARK_UPDATE_BASELINES' in os.environ
+
+# (method, path, body). Writes run last so reads see the seeded data.
+ENDPOINTS = [
+    ('GET', '/income/', None),
+    ('GET', '/expenditures/', None),
+    ('GET', '/disposable-spending/', None),
+    ('GET', '/expenditures/?format=stream', None),
+    ('GET', '/expenditures/?format=compact', None),
+    ('GET', '/disposable-budget/', None),
+    ('GET', '/currency/', None),
+    ('GET', '/archive/', None),
+    ('GET', '/monthly-summary/', None),
+    ('GET', '/weekly-summary/', None),
+    ('GET', '/calendar-summary/', None),
+    ('GET', '/calendar-summary/?format=compact', None),
+    ('GET', '/dj-rest-auth/user/', None),
+    ('POST', '/income/', {
+        'title': 'Salary', 'amount': 500, 'repeated': 'WEEKLY'}),
+    ('POST', '/expenditures/', {
+        'title': 'Rent', 'amount': 300, 'type': 'BILL',
+        'repeated': 'MONTHLY'}),
+    ('POST', '/disposable-spending/', {'title': 'Coffee', 'amount': 3}),
+]
+
+# Share of recurring series per repeat type; most are weekly
+REPEAT_WEIGHTS = {'WEEKLY': 8, 'MONTHLY': 1, 'NEVER': 1}
+
+CURRENCIES = ['GBP', 'USD', 'EUR']
+
+NO_CACHE = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+}
+
+
+def seed_user(user: User, series: int, rng: random.Random) -> None:
+    """
+    Gives a user a currency, `series` income and expenditure series
+    starting this month (repeated with the app's own generators),
+    daily disposable spending and this month's budget.
+    """
+    month_start = now().replace(
+        day=1, hour=12, minute=0, second=0, microsecond=0)
+
+    Currency.objects.create(owner=user, currency=rng.choice(CURRENCIES))
+    DisposableIncomeBudget.objects.create(
+        owner=user, amount=40000, date=month_start)
+
+    repeats = rng.choices(
+        list(REPEAT_WEIGHTS), weights=REPEAT_WEIGHTS.values(), k=series)
+    for i, repeated in enumerate(repeats):
+        date = month_start + timedelta(days=rng.randrange(28))
+        if i % 2:
+            model = Income
+            entry = Income.objects.create(
+                owner=user, title=f'Income {i}', repeated=repeated,
+                amount=rng.randrange(1000, 300000), date=date)
+        else:
+            model = Expenditure
+            entry = Expenditure.objects.create(
+                owner=user, title=f'Bill {i}', repeated=repeated,
+                amount=rng.randrange(500, 150000), date=date,
+                type=rng.choice(['BILL', 'SAVING', 'INVESTMENT']))
+
+        if repeated == 'WEEKLY':
+            generate_weekly_repeats_for_6_months(entry, model)
+        elif repeated == 'MONTHLY':
+            generate_monthly_repeats_for_6_months(entry, model)
+
+    DisposableIncomeSpending.objects.bulk_create([
+        DisposableIncomeSpending(
+            owner=user, title=f'Spend {day}',
+            amount=rng.randrange(100, 5000),
+            date=month_start + timedelta(days=day))
+        for day in range(28)
+    ])
+
+
+@override_settings(CACHES=NO_CACHE)
+class EndpointBenchmarks(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(0)
+        cls.users = [
+            User.objects.create_user(
+                username=f'bench{i}', email=f'bench{i}@example.com',
+                password='pass')
+            for i in range(USERS)
+        ]
+        for user in cls.users:
+            seed_user(user, SERIES, rng)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.users[0])}')
+        self.baselines = json.loads(BASELINES_PATH.read_text())
+
+    def _request(self, method: str, path: str, body: dict | None):
+        # Sent over HTTPS, so production settings don't answer every
+        # request with SECURE_SSL_REDIRECT's redirect
+        if method == 'GET':
+            response = self.client.get(path, secure=True)
+        else:
+            response = self.client.post(
+                path, {**body, 'date': now().isoformat()}, format='json',
+                secure=True)
+        if response.streaming:
+            # Read and discard the chunks, as a server writing them out
+            # would, since streamed responses query as they are read
+            for _ in response.streaming_content:
+                pass
+            self.assertTrue(status.is_success(response.status_code))
+        else:
+            self.assertTrue(
+                status.is_success(response.status_code), response.content)
+        return response
+
+    def _measure(self, method: str, path: str, body: dict | None) -> dict:
+        """
+        Returns the query count of one request, the median time of
+        ITERATIONS requests and the peak memory allocated by one request.
+        """
+        # Warm-up request, so lazy imports don't count against the first
+        self._request(method, path, body)
+
+        with CaptureQueriesContext(connection) as queries:
+            self._request(method, path, body)
+        query_count = len(queries)
+
+        timings = []
+        for _ in range(ITERATIONS):
+            started = time.perf_counter()
+            self._request(method, path, body)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        tracemalloc.start()
+        try:
+            self._request(method, path, body)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'queries': query_count,
+            'time_ms': round(statistics.median(timings), 2),
+            'peak_kb': round(peak / 1024, 1),
+        }
+
+    def test_endpoints_within_baselines(self):
+        results = {}
+        for method, path, body in ENDPOINTS:
+            name = f'{method} {path}'
+            results[name] = result = self._measure(method, path, body)
+
+            if UPDATE_BASELINES:
+                continue
+            with self.subTest(endpoint=name):
+                baseline = self.baselines.get(name)
+                self.assertIsNotNone(
+                    baseline, f"No baseline recorded for {name}")
+                self.assertLessEqual(
+                    result['queries'], baseline['queries'],
+                    f"{name} query count regressed")
+                self.assertLessEqual(
+                    result['time_ms'], baseline['time_ms'] * TIME_TOLERANCE,
+                    f"{name} median time regressed")
+                self.assertLessEqual(
+                    result['peak_kb'],
+                    baseline['peak_kb'] * MEMORY_TOLERANCE,
+                    f"{name} peak memory regressed")
+
+        print(f"\n{'endpoint':<36}{'queries':>8}{'ms':>9}{'peak KB':>10}")
+        for name, result in results.items():
+            print(f"{name:<36}{result['queries']:>8}"
+                  f"{result['time_ms']:>9.2f}{result['peak_kb']:>10.1f}")
+
+        if UPDATE_BASELINES:
+            BASELINES_PATH.write_text(
+                json.dumps(results, indent=4) + '\n')
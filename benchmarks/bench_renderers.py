@@ -0,0 +1,101 @@
+"""
+Compares DRF's standard JSON renderer and parser with the orjson ones
+enabled by FAST_JSON, on the data of the calendar summary and list
+endpoints.
+
+Each endpoint's response data is rendered and parsed
+BENCHMARK_RENDER_ITERATIONS times with each implementation, and the
+median times are printed. The test fails if the orjson renderer's
+output differs from the standard renderer's in any byte, and is
+skipped when orjson is not installed.
+
+Run with:
+    python manage.py test benchmarks --pattern "bench_renderers.py"
+
+Environment variables:
+    BENCHMARK_USERS              users seeded (default 5)
+    BENCHMARK_SERIES             recurring series per user (default 20)
+    BENCHMARK_RENDER_ITERATIONS  timed renders per endpoint (default 50)
+"""
+import io
+import os
+import random
+import statistics
+import time
+from unittest import skipUnless
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from core.renderers import ORJSONParser, ORJSONRenderer, orjson
+from .bench_endpoints import NO_CACHE, SERIES, USERS, seed_user
+
+
+ITERATIONS = int(os.environ.get('BENCHMARK_RENDER_ITERATIONS', 50))
+
+ENDPOINTS = [
+    '/calendar-summary/',
+    '/income/',
+    '/expenditures/',
+    '/disposable-spending/',
+]
+
+
+def median_ms(function, *args) -> float:
+    timings = []
+    for _ in range(ITERATIONS):
+        started = time.perf_counter()
+        function(*args)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+@skipUnless(orjson, "orjson is not installed")
+@override_settings(CACHES=NO_CACHE)
+class RendererBenchmarks(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(0)
+        cls.users = [
+            User.objects.create_user(
+                username=f'bench{i}', email=f'bench{i}@example.com',
+                password='pass')
+            for i in range(USERS)
+        ]
+        for user in cls.users:
+            seed_user(user, SERIES, rng)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.users[0])
+
+    def _measure(self, data) -> dict:
+        standard, fast = JSONRenderer(), ORJSONRenderer()
+        content = standard.render(data)
+        self.assertEqual(fast.render(data), content)
+
+        return {
+            'size_kb': len(content) / 1024,
+            'render': median_ms(standard.render, data),
+            'fast_render': median_ms(fast.render, data),
+            'parse': median_ms(
+                lambda: JSONParser().parse(io.BytesIO(content))),
+            'fast_parse': median_ms(
+                lambda: ORJSONParser().parse(io.BytesIO(content))),
+        }
+
+    def test_orjson_output_matches_standard(self):
+        results = {}
+        for path in ENDPOINTS:
+            response = self.client.get(path, secure=True)
+            self.assertEqual(response.status_code, 200)
+            with self.subTest(endpoint=path):
+                results[path] = self._measure(response.data)
+
+        print(f"\n{'endpoint':<24}{'KB':>8}{'render ms':>11}"
+              f"{'orjson':>9}{'parse ms':>10}{'orjson':>9}")
+        for path, result in results.items():
+            print(f"{path:<24}{result['size_kb']:>8.1f}"
+                  f"{result['render']:>11.3f}{result['fast_render']:>9.3f}"
+                  f"{result['parse']:>10.3f}{result['fast_parse']:>9.3f}")
@@ -0,0 +1,118 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from dj_rest_auth.jwt_auth import JWTCookieAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from core.utils.metrics import record_cache_lookup
+from core.utils.server_timing import timed
+
+
+# User fields cached for authentication: the whole row except the
+# password hash, which is deferred and only loaded if a view reads it.
+CACHED_USER_FIELDS = [
+    field.attname for field in User._meta.concrete_fields
+    if field.attname != 'password'
+]
+
+
+def user_cache_key(user_id) -> str:
+    return f"auth-user:{user_id}"
+
+
+def invalidate_cached_user(user_id) -> None:
+    cache.delete(user_cache_key(user_id))
+
+
+def get_cached_user(user_id) -> User | None:
+    """
+    Returns the user with only CACHED_USER_FIELDS loaded, from the
+    cache when AUTH_USER_CACHE_TIMEOUT enables it and the entry exists,
+    or None if the user does not exist.
+
+    The result is a real User instance, so it can be assigned to
+    foreign keys and compared with `obj.owner`; only reading the
+    deferred `password` queries the database.
+    """
+    timeout = settings.AUTH_USER_CACHE_TIMEOUT
+    key = user_cache_key(user_id)
+    values = None
+    if timeout:
+        values = cache.get(key)
+        record_cache_lookup('auth_user', values is not None)
+    if values is None:
+        values = User.objects.filter(pk=user_id).values(
+            *CACHED_USER_FIELDS).first()
+        if values is None:
+            return None
+        if timeout:
+            cache.set(key, values, timeout)
+
+    # from_db expects the loaded fields in model field order
+    field_names = [
+        field.attname for field in User._meta.concrete_fields
+        if field.attname in values
+    ]
+    return User.from_db(
+        User.objects.db, field_names,
+        [values[name] for name in field_names]
+    )
+
+
+class CachedUserAuthenticationMixin:
+    """
+    Resolves the token's user from the user cache instead of selecting
+    the full auth_user row on every request.
+
+    Cached users are invalidated whenever a User is saved or deleted
+    (see core.signals), so deactivation takes effect on the next
+    request. This only holds when every worker shares the cache: a
+    per-process cache such as the default LocMemCache is cleared in
+    the saving worker alone. Bulk updates bypass signals and are
+    picked up once the entry expires after AUTH_USER_CACHE_TIMEOUT
+    seconds. With the default timeout of 0 the cache is not used, and
+    the user is read from the database without the password hash.
+    """
+
+    def authenticate(self, request):
+        with timed('auth'):
+            return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        # Revocation compares the password hash, which is not cached
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification"))
+
+        user = get_cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive")
+
+        return user
+
+
+class CachedJWTCookieAuthentication(
+        CachedUserAuthenticationMixin, JWTCookieAuthentication):
+    """
+    dj-rest-auth's JWT cookie authentication with cached users.
+    """
+
+
+class CachedJWTAuthentication(
+        CachedUserAuthenticationMixin, JWTAuthentication):
+    """
+    simplejwt's Authorization header authentication with cached users.
+    """
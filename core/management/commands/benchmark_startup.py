@@ -0,0 +1,105 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# What a preloaded gunicorn master runs before forking workers
+BOOT_CODE = (
+    "from SFT_API.wsgi import application; "
+    "from SFT_API.warmup import warm_up; "
+    "warm_up()"
+)
+
+
+def parse_importtime(output: str) -> Counter:
+    """
+    Sums the self import time of each top-level package from the
+    output of `python -X importtime`.
+
+    Returns:
+        Counter: Microseconds spent importing each package.
+    """
+    totals = Counter()
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            continue
+        totals[name.strip().split('.')[0]] += int(self_us)
+    return totals
+
+
+class Command(BaseCommand):
+    """
+    Measures how long a fresh process takes to load the app and warm
+    it up, as a preloaded gunicorn master does on dyno boot, and
+    reports which packages the imports spend that time in.
+
+    Each run is a new Python interpreter started with -X importtime,
+    so results include interpreter startup and nothing is cached
+    between runs. Use it to compare startup before and after changes
+    to INSTALLED_APPS, middleware or module-level imports.
+
+    Usage:
+        python manage.py benchmark_startup
+        python manage.py benchmark_startup --runs 10 --top 20
+    """
+    help = "Benchmark process startup time and import cost per package."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=5,
+            help="Fresh processes to start (default: 5)."
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=10,
+            help="Packages to list by import time (default: 10)."
+        )
+
+    def handle(self, *args, **options):
+        runs = options['runs']
+        if runs < 1:
+            raise CommandError("--runs must be at least 1.")
+
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE,
+        }
+        timings = []
+        imports = Counter()
+
+        for _ in range(runs):
+            started = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', BOOT_CODE],
+                cwd=settings.BASE_DIR,
+                env=env,
+                capture_output=True,
+                text=True,
+            )
+            timings.append((time.perf_counter() - started) * 1000)
+            if result.returncode != 0:
+                raise CommandError(
+                    f"Startup failed:\n{result.stderr[-2000:]}")
+            imports.update(parse_importtime(result.stderr))
+
+        self.stdout.write(
+            f"Startup: {statistics.median(timings):.0f} ms median, "
+            f"{min(timings):.0f} ms min, {max(timings):.0f} ms max "
+            f"over {runs} runs")
+        self.stdout.write(
+            f"Imports: {sum(imports.values()) / runs / 1000:.0f} ms")
+
+        self.stdout.write(f"{'package':<32}{'ms':>8}")
+        for package, total in imports.most_common(options['top']):
+            self.stdout.write(f"{package:<32}{total / runs / 1000:>8.1f}")
@@ -0,0 +1,118 @@
+import time
+from collections import Counter
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.utils import aware_utcnow
+from core.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    """
+    Deletes expired outstanding refresh tokens and their blacklist
+    entries, and expired idempotency keys, in primary-key-ordered
+    batches.
+
+    Every login and token refresh adds rows to the token tables, and
+    expired tokens are rejected on their expiry claim alone, so their
+    rows are no longer needed. Idempotency keys are only replayed
+    within IDEMPOTENCY_KEY_TTL, and are otherwise cleared only when
+    their owner sends another keyed create. Unlike simplejwt's
+    flushexpiredtokens, which deletes every expired row in one
+    statement, each batch is a short DELETE so the command can run
+    alongside live refreshes.
+
+    Usage:
+        python manage.py prune_tokens
+        python manage.py prune_tokens --batch-size 5000 --sleep 0.1
+        python manage.py prune_tokens --dry-run
+    """
+    help = ("Delete expired outstanding and blacklisted tokens and "
+            "idempotency keys in batches.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Maximum rows deleted per statement (default: 1000)."
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.0,
+            help="Seconds to pause between batches (default: 0)."
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Report how many rows would be deleted without deleting."
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        pause = options['sleep']
+
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        if pause < 0:
+            raise CommandError("--sleep cannot be negative.")
+
+        expired = OutstandingToken.objects.filter(
+            expires_at__lte=aware_utcnow())
+        expired_keys = IdempotencyKey.objects.filter(
+            created_at__lt=aware_utcnow() - settings.IDEMPOTENCY_KEY_TTL)
+
+        if options['dry_run']:
+            outstanding = expired.count()
+            blacklisted = BlacklistedToken.objects.filter(
+                token__in=expired).count()
+            keys = expired_keys.count()
+            verb = "would be deleted"
+        else:
+            deleted = self._delete_in_batches(expired, batch_size, pause)
+            deleted.update(
+                self._delete_in_batches(expired_keys, batch_size, pause))
+            outstanding = deleted[OutstandingToken._meta.label]
+            blacklisted = deleted[BlacklistedToken._meta.label]
+            keys = deleted[IdempotencyKey._meta.label]
+            verb = "deleted"
+
+        self.stdout.write(f"Outstanding tokens: {outstanding} {verb}")
+        self.stdout.write(f"Blacklisted tokens: {blacklisted} {verb}")
+        self.stdout.write(f"Idempotency keys: {keys} {verb}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Total: {outstanding + blacklisted + keys} rows {verb}"))
+
+    def _delete_in_batches(self, queryset, batch_size: int,
+                           pause: float) -> Counter:
+        """
+        Deletes the queryset's rows in ascending primary-key batches.
+        Returns the number of rows deleted by model label, including
+        cascades such as the blacklist entries of outstanding tokens.
+        """
+        deleted = Counter()
+        last_pk = 0
+
+        while True:
+            pks = list(
+                queryset.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+
+            _, counts = queryset.model.objects.filter(pk__in=pks).delete()
+            deleted.update(counts)
+            last_pk = pks[-1]
+
+            if len(pks) < batch_size:
+                break
+            if pause:
+                time.sleep(pause)
+
+        return deleted
@@ -0,0 +1,228 @@
+import json
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from core.utils.traffic import fill_body, fill_query_value
+
+
+class Command(BaseCommand):
+    """
+    Replays traffic recorded by TrafficCaptureMiddleware against a
+    running server and reports throughput and latency percentiles per
+    endpoint.
+
+    Each recorded user bucket is mapped onto one of the --users
+    synthetic users created by seed_finance_data (<prefix><n>), which
+    log in through /api/token/. Months and dates are replayed relative
+    to today, bodies are rebuilt from their recorded shape, and {pk}
+    path arguments are filled with an id from the user's own list
+    endpoint. Requests are sent from --concurrency threads as fast as
+    the server answers.
+
+    Usage:
+        python manage.py seed_finance_data --users 100
+        python manage.py replay_traffic traffic.jsonl --users 100
+        python manage.py replay_traffic traffic.jsonl --users 100 \\
+            --base-url http://127.0.0.1:8000 --concurrency 8 --limit 5000
+    """
+    help = "Replay captured API traffic and report latency per endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'capture_file',
+            help="JSONL file written by TrafficCaptureMiddleware."
+        )
+        parser.add_argument(
+            '--base-url',
+            default='http://127.0.0.1:8000',
+            help="Server to replay against (default: http://127.0.0.1:8000)."
+        )
+        parser.add_argument(
+            '--users',
+            type=int,
+            required=True,
+            help="Number of seeded users to spread the traffic over."
+        )
+        parser.add_argument(
+            '--prefix',
+            default='seed',
+            help="Username prefix of the seeded users (default: seed)."
+        )
+        parser.add_argument(
+            '--password',
+            default='password',
+            help="Password of the seeded users (default: password)."
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help="Requests in flight at once (default: 4)."
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help="Replay at most this many records."
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=30.0,
+            help="Seconds before a request is abandoned (default: 30)."
+        )
+
+    def handle(self, *args, **options):
+        if options['users'] < 1:
+            raise CommandError("--users must be at least 1.")
+        if options['concurrency'] < 1:
+            raise CommandError("--concurrency must be at least 1.")
+
+        records = self._read_records(options['capture_file'], options['limit'])
+        if not records:
+            raise CommandError("The capture file has no records.")
+
+        self.options = options
+        self.base_url = options['base_url'].rstrip('/')
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.tokens = {}
+        self.ids = {}
+        self.results = {}
+        self.skipped = 0
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options['concurrency']) as executor:
+            list(executor.map(self._replay, records))
+        elapsed = time.perf_counter() - started
+
+        self._report(elapsed)
+
+    def _read_records(self, path: str, limit: int | None) -> list[dict]:
+        try:
+            with open(path) as file:
+                records = [json.loads(line) for line in file if line.strip()]
+        except OSError as exc:
+            raise CommandError(f"Cannot read {path}: {exc}")
+        except ValueError as exc:
+            raise CommandError(f"{path} is not valid JSONL: {exc}")
+        return records[:limit] if limit else records
+
+    def _session(self) -> requests.Session:
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def _token(self, username: str) -> str:
+        with self.lock:
+            token = self.tokens.get(username)
+        if token is None:
+            response = self._session().post(
+                f'{self.base_url}/api/token/',
+                json={'username': username,
+                      'password': self.options['password']},
+                timeout=self.options['timeout'])
+            if response.status_code != 200:
+                raise CommandError(
+                    f"Could not log in as {username!r} "
+                    f"({response.status_code}); seed the users with "
+                    f"seed_finance_data first.")
+            token = response.json()['access']
+            with self.lock:
+                self.tokens[username] = token
+        return token
+
+    def _fill_path(self, path: str, headers: dict) -> str | None:
+        """
+        Replaces a {pk} argument with the id of one of the user's own
+        entries from the matching list endpoint, or returns None if the
+        user has none.
+        """
+        if '{' not in path:
+            return path
+        list_path = path[:path.index('{')]
+        key = (headers['Authorization'], list_path)
+
+        with self.lock:
+            ids = self.ids.get(key)
+        if ids is None:
+            response = self._session().get(
+                f'{self.base_url}{list_path}', headers=headers,
+                timeout=self.options['timeout'])
+            data = response.json() if response.status_code == 200 else []
+            if isinstance(data, dict):
+                data = data.get('results', [])
+            ids = [str(item['id']) for item in data if 'id' in item]
+            with self.lock:
+                self.ids[key] = ids
+        if not ids:
+            return None
+
+        segment = path[path.index('{'):path.index('}') + 1]
+        return path.replace(segment, random.choice(ids))
+
+    def _replay(self, record: dict) -> None:
+        bucket = record['user_bucket'] % self.options['users']
+        username = f"{self.options['prefix']}{bucket}"
+        headers = {'Authorization': f'Bearer {self._token(username)}'}
+
+        path = self._fill_path(record['path'], headers)
+        if path is None:
+            with self.lock:
+                self.skipped += 1
+            return
+
+        today = timezone.localdate()
+        params = {
+            name: fill_query_value(value, today)
+            for name, value in record['query'].items()
+        }
+        body = fill_body(record['body'], timezone.now())
+
+        started = time.perf_counter()
+        try:
+            response = self._session().request(
+                record['method'], f'{self.base_url}{path}', params=params,
+                json=body, headers=headers, timeout=self.options['timeout'])
+            failed = response.status_code >= 400
+        except requests.RequestException:
+            failed = True
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        endpoint = f"{record['method']} {record['url_name']}"
+        with self.lock:
+            timings, errors = self.results.setdefault(endpoint, ([], [0]))
+            timings.append(elapsed_ms)
+            errors[0] += failed
+
+    @staticmethod
+    def _percentile(sorted_values: list[float], percent: float) -> float:
+        index = round(percent / 100 * (len(sorted_values) - 1))
+        return sorted_values[index]
+
+    def _report(self, elapsed: float) -> None:
+        total = sum(len(timings) for timings, _ in self.results.values())
+
+        self.stdout.write(
+            f"{'endpoint':<36}{'requests':>9}{'errors':>8}{'mean ms':>9}"
+            f"{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}")
+        for endpoint, (timings, errors) in sorted(self.results.items()):
+            millis = sorted(timings)
+            self.stdout.write(
+                f"{endpoint:<36}{len(millis):>9}{errors[0]:>8}"
+                f"{statistics.mean(millis):>9.2f}"
+                f"{self._percentile(millis, 50):>9.2f}"
+                f"{self._percentile(millis, 90):>9.2f}"
+                f"{self._percentile(millis, 99):>9.2f}")
+
+        if self.skipped:
+            self.stdout.write(
+                f"Skipped {self.skipped} requests for entries the "
+                f"replay users do not have.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Replayed {total} requests in {elapsed:.1f}s "
+            f"({total / elapsed:.1f} requests/s)"))
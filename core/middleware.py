@@ -0,0 +1,342 @@
+import json
+import logging
+import random
+import time
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse, JsonResponse
+from django.urls import reverse
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from core.utils import metrics
+from core.utils.db_metrics import checkout_stats
+from core.utils.profiling import (
+    PROFILERS,
+    ProfilerUnavailable,
+    profile_store,
+    profiling_lock,
+)
+from core.utils.traffic import (
+    capture_record,
+    read_body_shape,
+    should_capture,
+    write_record,
+)
+from core.utils.slow_queries import (
+    enable_slow_query_log,
+    reset_current_request,
+    set_current_request,
+)
+from core.utils.server_timing import (
+    enable_query_timing,
+    get_request_timings,
+    start_request_timings,
+    stop_request_timings,
+)
+
+
+logger = logging.getLogger('core.server_timing')
+
+
+class DatabaseCheckoutMiddleware:
+    """
+    Obtains the request's database connection up front and records
+    whether the worker's connection was reused or had to be opened
+    (or checked out of the pool), and how long that took.
+
+    The connection would be opened by the first query anyway, so this
+    adds no work, only makes the cost measurable.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        connection = connections[DEFAULT_DB_ALIAS]
+        reused = connection.connection is not None
+
+        started = time.perf_counter()
+        connection.ensure_connection()
+        checkout_stats.record(
+            reused, (time.perf_counter() - started) * 1000)
+
+        return self.get_response(request)
+
+
+class ServerTimingMiddleware:
+    """
+    Records where a sampled request's time went and returns it in a
+    Server-Timing header, which browser developer tools display:
+
+    - db: total query time, with the query count as its description
+    - auth: DRF authentication (see core.authentication)
+    - view: the view, up to rendering its response
+    - render: rendering the response, e.g. DRF's JSON encoding
+    - total: the rest of the middleware chain, view and rendering
+
+    A share of requests given by SERVER_TIMING_SAMPLE_RATE is sampled;
+    the middleware is removed entirely when the rate is 0. With
+    SERVER_TIMING_LOG set, each sampled request is also logged as a
+    JSON line to the core.server_timing logger.
+    """
+
+    def __init__(self, get_response):
+        self.sample_rate = settings.SERVER_TIMING_SAMPLE_RATE
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        enable_query_timing()
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        timings, token = start_request_timings()
+        request._server_timings = timings
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_request_timings(token)
+
+        # Responses that aren't rendered (redirects, plain HttpResponses)
+        # never reach process_template_response
+        view_started = getattr(request, '_view_started', None)
+        if view_started is not None:
+            timings.add('view', self._elapsed_ms(view_started))
+        timings.add('total', self._elapsed_ms(started))
+
+        response['Server-Timing'] = timings.header_value()
+        if settings.SERVER_TIMING_LOG:
+            self._log(request, response, timings)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if hasattr(request, '_server_timings'):
+            request._view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Called once the view has returned, right before rendering
+        view_started = getattr(request, '_view_started', None)
+        if view_started is None:
+            return response
+
+        timings = request._server_timings
+        timings.add('view', self._elapsed_ms(view_started))
+        request._view_started = None
+
+        render_started = time.perf_counter()
+        response.add_post_render_callback(
+            lambda response: timings.add(
+                'render', self._elapsed_ms(render_started)))
+        return response
+
+    @staticmethod
+    def _elapsed_ms(started: float) -> float:
+        return (time.perf_counter() - started) * 1000
+
+    def _log(self, request, response, timings) -> None:
+        match = request.resolver_match
+        user = getattr(request, 'user', None)
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'url_name': match.view_name if match else None,
+            'status': response.status_code,
+            'user_id': user.pk if user is not None else None,
+            **timings.as_dict(),
+        }))
+
+
+class MetricsMiddleware:
+    """
+    Counts every request and its database queries, and records its
+    latency, in the metrics registry under the request's URL name
+    (e.g. monthly-summary, income-list). Requests that match no URL
+    are grouped under "unmatched", so paths never become labels.
+
+    Query counts reuse ServerTimingMiddleware's timings when the
+    request is sampled, and start their own otherwise. Streaming
+    responses are recorded once their content has been sent, so their
+    latency and queries include the streamed rows.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        enable_query_timing()
+
+    def __call__(self, request):
+        timings, token = get_request_timings(), None
+        if timings is None:
+            timings, token = start_request_timings()
+        queries_before, db_ms_before = timings.db_queries, timings.db_ms
+
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            if token is not None:
+                stop_request_timings(token)
+
+        def record():
+            match = request.resolver_match
+            url_name = match.view_name if match else 'unmatched'
+            metrics.http_requests.inc(
+                url_name=url_name, method=request.method,
+                status=response.status_code)
+            metrics.http_request_duration.observe(
+                time.perf_counter() - started, url_name=url_name)
+            metrics.db_queries.inc(
+                timings.db_queries - queries_before, url_name=url_name)
+            metrics.db_query_duration.inc(
+                (timings.db_ms - db_ms_before) / 1000, url_name=url_name)
+            metrics.registry.flush()
+
+        if response.streaming and not response.is_async:
+            response.streaming_content = self._record_after(
+                response.streaming_content, record)
+        else:
+            record()
+        return response
+
+    @staticmethod
+    def _record_after(content, record):
+        """
+        Yields the streamed `content`, then calls `record`, also when
+        the client disconnects and the stream is closed early.
+        """
+        try:
+            yield from content
+        finally:
+            record()
+
+
+class SlowQueryLogMiddleware:
+    """
+    Logs queries slower than SLOW_QUERY_THRESHOLD_MS with the view and
+    user of the request that ran them (see core.utils.slow_queries).
+    The middleware is removed when the threshold is 0.
+    """
+
+    def __init__(self, get_response):
+        if settings.SLOW_QUERY_THRESHOLD_MS <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        enable_slow_query_log()
+
+    def __call__(self, request):
+        token = set_current_request(request)
+        try:
+            return self.get_response(request)
+        finally:
+            reset_current_request(token)
+
+
+class RequestProfilingMiddleware:
+    """
+    Lets staff profile any request by adding
+    `?__profile=cprofile|pyinstrument|tracemalloc`. The response is the
+    profile report instead of the view's response, and the report is
+    kept in the shared profile store for later download from
+    /internal/profiles/<id>/.
+
+    The parameter is ignored for everyone else, so other users get the
+    normal response. Only one request per process is profiled at a
+    time. The middleware is removed unless REQUEST_PROFILING is on.
+    """
+    parameter = '__profile'
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        name = request.GET.get(self.parameter)
+        if name is None or not self._is_staff(request):
+            return self.get_response(request)
+
+        if name not in PROFILERS:
+            return JsonResponse({
+                'detail': f"Unknown profiler '{name}'. Choose one of: "
+                          f"{', '.join(PROFILERS)}."
+            }, status=400)
+        try:
+            profiler = PROFILERS[name]()
+        except ProfilerUnavailable as exc:
+            return JsonResponse({'detail': str(exc)}, status=400)
+
+        if not profiling_lock.acquire(blocking=False):
+            return JsonResponse({
+                'detail': "Another request is being profiled."
+            }, status=503, headers={'Retry-After': '1'})
+        try:
+            profiler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.stop()
+        finally:
+            profiling_lock.release()
+
+        report = profiler.report()
+        profile_id = profile_store.add(
+            name, request.get_full_path(), request.user.pk, report,
+            profiler.content_type)
+        profiled = HttpResponse(report, content_type=profiler.content_type)
+        profiled['X-Profile-Id'] = profile_id
+        profiled['X-Profile-URL'] = reverse(
+            'profile_detail', args=[profile_id])
+        profiled['X-Profiled-Status'] = response.status_code
+        return profiled
+
+    @staticmethod
+    def _is_staff(request) -> bool:
+        """
+        Authenticates the request with the API's authentication
+        classes, which views would otherwise do after this middleware.
+        """
+        drf_request = Request(request, authenticators=[
+            auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+        ])
+        try:
+            return drf_request.user.is_staff
+        except APIException:
+            return False
+
+
+class TrafficCaptureMiddleware:
+    """
+    Appends a sampled, anonymized record of authenticated API requests
+    to TRAFFIC_CAPTURE_FILE, one JSON object per line, for replay with
+    the replay_traffic command.
+
+    Records keep the method, URL name and path template (/income/{pk}/),
+    query parameters with months and dates stored relative to the
+    capture day, the field names and value types of the body, a keyed
+    hash bucket of the user, and the response status and duration. No
+    ids, amounts, titles or other user data are written.
+
+    The middleware is removed unless TRAFFIC_CAPTURE_FILE is set.
+    """
+
+    def __init__(self, get_response):
+        if not settings.TRAFFIC_CAPTURE_FILE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.TRAFFIC_CAPTURE_SAMPLE_RATE:
+            return self.get_response(request)
+
+        # Read before the view consumes the request stream
+        body = read_body_shape(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if should_capture(request):
+            write_record(capture_record(request, response, body, elapsed_ms))
+        return response
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:10
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_userprofile_last_repeat_check_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='Client-supplied Idempotency-Key header value.', max_length=255)),
+                ('path', models.CharField(help_text='Request path the key was used on.', max_length=255)),
+                ('request_hash', models.CharField(blank=True, default='', help_text="SHA-256 of the original request's method, path and data. Retries with other data are rejected.", max_length=64)),
+                ('status_code', models.PositiveSmallIntegerField(help_text='HTTP status code of the original response.')),
+                ('response_body', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Serialized data of the original response.')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, help_text='When the key was first used; keys expire after IDEMPOTENCY_KEY_TTL.')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='idempotency_keys', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('owner', 'key', 'path')},
+            },
+        ),
+    ]
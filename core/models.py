@@ -1,4 +1,5 @@
 from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.auth.models import User
 
 
@@ -20,3 +21,50 @@ class UserProfile(models.Model):
 
     def __str__(self) -> str:
         return f"{self.user.username} profile"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Stores the response of a successful create request sent with an
+    Idempotency-Key header, so client retries can be answered without
+    creating the entry (and its repeat chain) a second time.
+    """
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='idempotency_keys'
+    )
+    key = models.CharField(
+        max_length=255,
+        help_text="Client-supplied Idempotency-Key header value."
+    )
+    path = models.CharField(
+        max_length=255,
+        help_text="Request path the key was used on."
+    )
+    request_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        help_text="SHA-256 of the original request's method, path and "
+        "data. Retries with other data are rejected."
+    )
+    status_code = models.PositiveSmallIntegerField(
+        help_text="HTTP status code of the original response."
+    )
+    response_body = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        help_text="Serialized data of the original response."
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        help_text="When the key was first used; keys expire after "
+        "IDEMPOTENCY_KEY_TTL."
+    )
+
+    class Meta:
+        unique_together = ('owner', 'key', 'path')
+
+    def __str__(self) -> str:
+        return f"{self.owner.username} key {self.key} on {self.path}"
@@ -1,7 +1,12 @@
 import re
 from django.contrib.auth.models import User
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
 from django.core.exceptions import ValidationError
+from dj_rest_auth.jwt_auth import CookieTokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from .authentication import get_cached_user
+from .tokens import CachedRefreshToken
 
 
 class CustomUserSerializer(serializers.ModelSerializer):
@@ -55,3 +60,41 @@ class ChangeEmailSerializer(serializers.Serializer):
         if User.objects.filter(email__iexact=value).exists():
             raise ValidationError("Email is already in use")
         return value
+
+
+class CachedTokenRefreshSerializer(CookieTokenRefreshSerializer):
+    """
+    Refreshes a token pair from the refresh cookie or request body.
+
+    Same flow as simplejwt's TokenRefreshSerializer, but checks the
+    user against the authentication user cache and rotates with
+    CachedRefreshToken, so a refresh runs a blacklist lookup and the
+    rotation writes instead of repeated user and token SELECTs.
+    """
+    token_class = CachedRefreshToken
+
+    def validate(self, attrs: dict) -> dict:
+        refresh = self.token_class(self.extract_refresh_token())
+
+        user = get_cached_user(
+            refresh.payload.get(api_settings.USER_ID_CLAIM))
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages['no_active_account'],
+                'no_active_account',
+            )
+
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+
+            data['refresh'] = str(refresh)
+
+        return data
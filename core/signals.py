@@ -1,7 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from .authentication import invalidate_cached_user
 from .models import UserProfile
+from .tokens import cache_blacklist_status
 
 
 @receiver(post_save, sender=User)
@@ -18,3 +21,25 @@ def create_user_profile(
     """
     if created:
         UserProfile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance: User, **kwargs) -> None:
+    """
+    Drops the user's cached authentication record so changes such as
+    deactivation apply to their next request.
+    """
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def cache_blacklisted_token(
+    sender, instance: BlacklistedToken, **kwargs) -> None:
+    """
+    Overwrites a cached "not blacklisted" result when a token is
+    blacklisted outside CachedRefreshToken, e.g. on logout, so the
+    token is rejected on its next refresh.
+    """
+    cache_blacklist_status(
+        instance.token.jti, instance.token.expires_at, True)
@@ -0,0 +1,241 @@
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from core.authentication import user_cache_key
+from transactions.models import Income
+
+
+@override_settings(AUTH_USER_CACHE_TIMEOUT=300)
+class CachedJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='tester', email='user@example.com', password='pass')
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def _user_queries(self, queries) -> list:
+        return [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('SELECT "auth_user".')
+        ]
+
+    def test_repeat_requests_do_not_query_user(self):
+        """
+        Should load the user once, then authenticate from the cache.
+        """
+        self.client.get('/income/')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/income/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._user_queries(queries), [])
+
+    def test_deactivated_user_is_rejected(self):
+        """
+        Should reject the next request once the user is deactivated.
+        """
+        self.client.get('/income/')
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get('/income/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_deleted_user_is_rejected(self):
+        """
+        Should reject tokens of users deleted after the cache was filled.
+        """
+        self.client.get('/income/')
+        self.user.delete()
+
+        response = self.client.get('/income/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_cached_user_owns_created_entries(self):
+        """
+        Should assign the cached user as the owner of new entries.
+        """
+        response = self.client.post(
+            '/income/', {'title': 'Salary', 'amount': 100,
+                         'date': '2025-01-01T00:00:00Z'})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Income.objects.get().owner, self.user)
+
+    def test_user_details_served_from_cache(self):
+        """
+        Should return the user's details, such as email, without
+        querying the user table once the cache is warm.
+        """
+        self.client.get('/income/')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/dj-rest-auth/user/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['email'], 'user@example.com')
+        self.assertEqual(self._user_queries(queries), [])
+
+
+class UncachedJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def test_user_read_from_database_by_default(self):
+        """
+        Should ignore cached entries, which another worker may not have
+        invalidated, when AUTH_USER_CACHE_TIMEOUT is 0.
+        """
+        self.client.get('/income/')
+        cache.set(user_cache_key(self.user.pk), {
+            'id': self.user.pk, 'username': 'tester', 'is_active': True,
+            'is_staff': False, 'is_superuser': False})
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        response = self.client.get('/income/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_user_details_read_in_one_query(self):
+        """
+        Should load every field the user endpoint returns with the
+        user, instead of one query per deferred field.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/dj-rest-auth/user/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len([
+            query for query in queries.captured_queries
+            if query['sql'].startswith('SELECT "auth_user".')
+        ]), 1)
+
+
+class CachedTokenRefreshTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+        self.refresh = str(RefreshToken.for_user(self.user))
+        self.url = '/api/token/refresh/'
+
+    def _refresh(self, token: str):
+        return self.client.post(self.url, {'refresh': token})
+
+    def test_rotation_blacklists_old_token(self):
+        """
+        Should issue a new outstanding refresh token and blacklist the
+        one that was used.
+        """
+        response = self._refresh(self.refresh)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.data['refresh'], self.refresh)
+        self.assertEqual(OutstandingToken.objects.count(), 2)
+        self.assertEqual(
+            BlacklistedToken.objects.get().token.user, self.user)
+
+    def test_reused_token_rejected_from_cache(self):
+        """
+        Should reject a rotated token again without querying the
+        blacklist.
+        """
+        self._refresh(self.refresh)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self._refresh(self.refresh)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(any(
+            'token_blacklist_blacklistedtoken' in query['sql']
+            for query in queries.captured_queries))
+
+    def test_token_blacklisted_elsewhere_is_rejected(self):
+        """
+        Should fall back to the database when the blacklist cache has
+        no entry, e.g. for tokens blacklisted on logout.
+        """
+        RefreshToken(self.refresh).blacklist()
+
+        response = self._refresh(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(TOKEN_BLACKLIST_CACHE_TIMEOUT=300)
+    def test_rotated_token_refreshes_without_blacklist_query(self):
+        """
+        Should remember that a freshly rotated token is not blacklisted.
+        """
+        rotated = self._refresh(self.refresh).data['refresh']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self._refresh(rotated)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any(
+            'FROM "token_blacklist_blacklistedtoken"' in query['sql']
+            for query in queries.captured_queries))
+
+    @override_settings(
+        TOKEN_BLACKLIST_CACHE_TIMEOUT=300, AUTH_USER_CACHE_TIMEOUT=300)
+    @patch.object(api_settings, 'ROTATE_REFRESH_TOKENS', False)
+    def test_warm_refresh_runs_no_queries(self):
+        """
+        Should refresh without any query once the token's blacklist
+        status and user are cached.
+        """
+        self._refresh(self.refresh)
+
+        with self.assertNumQueries(0):
+            response = self._refresh(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(TOKEN_BLACKLIST_CACHE_TIMEOUT=300)
+    def test_logout_overrides_cached_status(self):
+        """
+        Should reject a token blacklisted elsewhere after it was cached
+        as not blacklisted.
+        """
+        rotated = self._refresh(self.refresh).data['refresh']
+        RefreshToken(rotated).blacklist()
+
+        response = self._refresh(rotated)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_inactive_user_cannot_refresh(self):
+        """
+        Should refuse to refresh tokens of deactivated users.
+        """
+        self.user.is_active = False
+        self.user.save()
+
+        response = self._refresh(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cookie_refresh_rotates_cookie(self):
+        """
+        Should refresh from the cookie and set a rotated refresh cookie.
+        """
+        self.client.cookies['refreshToken'] = self.refresh
+
+        response = self.client.post('/dj-rest-auth/token/refresh/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(
+            response.cookies['refreshToken'].value, self.refresh)
+        self.assertTrue(BlacklistedToken.objects.exists())
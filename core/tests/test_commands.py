@@ -0,0 +1,144 @@
+import json
+import os
+from io import StringIO
+from datetime import timedelta
+from tempfile import TemporaryDirectory
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import LiveServerTestCase, TestCase
+from django.utils.timezone import now
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from core.models import IdempotencyKey
+
+
+class PruneTokensCommandTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+
+    def _create_tokens(self, expires_at, count=1, blacklisted=False):
+        for _ in range(count):
+            token = OutstandingToken.objects.create(
+                user=self.user, jti=f'jti-{OutstandingToken.objects.count()}',
+                token='token', expires_at=expires_at)
+            if blacklisted:
+                BlacklistedToken.objects.create(token=token)
+
+    def _run(self, *args) -> str:
+        out = StringIO()
+        call_command('prune_tokens', *args, stdout=out)
+        return out.getvalue()
+
+    def test_deletes_expired_tokens_across_batches(self):
+        """
+        Should delete every expired token and its blacklist entry,
+        leaving unexpired tokens.
+        """
+        self._create_tokens(now() - timedelta(days=1), count=3)
+        self._create_tokens(
+            now() - timedelta(days=1), count=2, blacklisted=True)
+        self._create_tokens(now() + timedelta(days=1), blacklisted=True)
+
+        output = self._run('--batch-size', '2')
+
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+        self.assertIn('Outstanding tokens: 5 deleted', output)
+        self.assertIn('Blacklisted tokens: 2 deleted', output)
+
+    def test_dry_run_reports_without_deleting(self):
+        """
+        Should report counts but delete nothing.
+        """
+        self._create_tokens(
+            now() - timedelta(days=1), count=2, blacklisted=True)
+
+        output = self._run('--dry-run')
+
+        self.assertEqual(OutstandingToken.objects.count(), 2)
+        self.assertIn('Total: 4 rows would be deleted', output)
+
+    def test_deletes_expired_idempotency_keys(self):
+        """
+        Should delete idempotency keys older than IDEMPOTENCY_KEY_TTL.
+        """
+        for key in ['old', 'new']:
+            IdempotencyKey.objects.create(
+                owner=self.user, key=key, path='/income/',
+                status_code=201, response_body={})
+        IdempotencyKey.objects.filter(key='old').update(
+            created_at=now() - timedelta(days=2))
+
+        output = self._run()
+
+        self.assertEqual(
+            list(IdempotencyKey.objects.values_list('key', flat=True)),
+            ['new'])
+        self.assertIn('Idempotency keys: 1 deleted', output)
+
+    def test_rejects_invalid_batch_size(self):
+        """
+        Should raise CommandError for a batch size below 1.
+        """
+        with self.assertRaises(CommandError):
+            self._run('--batch-size', '0')
+
+
+class ReplayTrafficCommandTests(LiveServerTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='seed0', password='password')
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.capture_file = os.path.join(directory.name, 'traffic.jsonl')
+
+    def _write_records(self, *records):
+        with open(self.capture_file, 'w') as file:
+            for record in records:
+                file.write(json.dumps({
+                    'method': 'GET', 'query': {}, 'body': None,
+                    'user_bucket': 7, **record}) + '\n')
+
+    def _run(self, *args) -> str:
+        out = StringIO()
+        call_command(
+            'replay_traffic', self.capture_file, '--users', '1',
+            '--base-url', self.live_server_url, *args, stdout=out)
+        return out.getvalue()
+
+    def test_replays_requests_as_seeded_users(self):
+        """
+        Should send every record as a seeded user and report each
+        endpoint, skipping {pk} paths the user has no entries for.
+        """
+        self._write_records(
+            {'url_name': 'income-list', 'path': '/income/',
+             'query': {'month': '{month:0}'}},
+            {'url_name': 'income-list', 'path': '/income/'},
+            {'url_name': 'income-detail', 'path': '/income/{pk}/'},
+            {'method': 'POST', 'url_name': 'income-list',
+             'path': '/income/',
+             'body': {'title': 'str', 'amount': 'float', 'date': 'str'}},
+        )
+
+        output = self._run('--concurrency', '1')
+
+        self.assertRegex(output, r'GET income-list\s+2\s+0\s')
+        self.assertRegex(output, r'POST income-list\s+1\s+0\s')
+        self.assertIn('Skipped 1 requests', output)
+        self.assertIn('Replayed 3 requests', output)
+        self.assertEqual(self.user.incomes.get().title, 'Replayed entry')
+
+    def test_rejects_missing_users(self):
+        """
+        Should raise CommandError when the seeded users cannot log in.
+        """
+        self.user.delete()
+        self._write_records({'url_name': 'income-list', 'path': '/income/'})
+
+        with self.assertRaises(CommandError):
+            self._run()
@@ -0,0 +1,335 @@
+import json
+import os
+from datetime import timedelta
+from tempfile import TemporaryDirectory
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from core.utils import metrics
+from core.utils.db_metrics import checkout_stats
+from core.utils.profiling import ProfileStore, profile_store
+from core.utils.slow_queries import slow_queries
+from core.utils.traffic import user_bucket
+from transactions.models import Income
+from unittest.mock import patch
+
+
+def parse_server_timing(header: str) -> dict:
+    """
+    Returns {name: {'dur': ..., 'desc': ...}} for a Server-Timing
+    header value.
+    """
+    metrics = {}
+    for metric in header.split(', '):
+        name, *params = metric.split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+    return metrics
+
+
+@override_settings(SERVER_TIMING_SAMPLE_RATE=1.0)
+class ServerTimingMiddlewareTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def test_header_reports_request_phases(self):
+        """
+        Should report db, auth, view, render and total durations, with
+        the query count as the db description.
+        """
+        response = self.client.get('/income/')
+
+        metrics = parse_server_timing(response['Server-Timing'])
+        self.assertEqual(
+            set(metrics), {'db', 'auth', 'view', 'render', 'total'})
+        self.assertRegex(metrics['db']['desc'], r'^"[1-9]\d* quer(y|ies)"$')
+        self.assertGreaterEqual(
+            float(metrics['total']['dur']), float(metrics['view']['dur']))
+
+    def test_unrendered_responses_report_view_time(self):
+        """
+        Should time views whose responses are not rendered by DRF.
+        """
+        response = self.client.get('/admin/')
+
+        metrics = parse_server_timing(response['Server-Timing'])
+        self.assertIn('view', metrics)
+        self.assertNotIn('render', metrics)
+
+    @override_settings(SERVER_TIMING_LOG=True)
+    def test_logs_sampled_requests_as_json(self):
+        """
+        Should log the URL name, status, user and timings.
+        """
+        with self.assertLogs('core.server_timing', 'INFO') as logs:
+            self.client.get('/income/')
+
+        self.assertIn('"url_name": "income-list"', logs.output[0])
+        self.assertIn(f'"user_id": {self.user.pk}', logs.output[0])
+        self.assertIn('"db_queries":', logs.output[0])
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0.0)
+    def test_disabled_when_sample_rate_is_zero(self):
+        """
+        Should not add the header when sampling is off.
+        """
+        response = self.client.get('/income/')
+        self.assertNotIn('Server-Timing', response)
+
+
+@override_settings(SLOW_QUERY_EXPLAIN_RATE=1.0)
+class SlowQueryLogMiddlewareTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        slow_queries.clear()
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def _get_logging_every_query(self, path: str):
+        with self.settings(SLOW_QUERY_THRESHOLD_MS=1e-6), \
+                self.assertLogs('core.slow_queries', 'WARNING'):
+            return self.client.get(path)
+
+    def _income_queries(self) -> list:
+        return [
+            entry for entry in slow_queries.entries()
+            if 'FROM "transactions_income"' in entry['sql']
+        ]
+
+    def test_logs_slow_queries_with_view_owner_and_plan(self):
+        """
+        Should record the query's view, owner, parameter hash and plan.
+        """
+        self._get_logging_every_query('/income/')
+
+        entry = self._income_queries()[0]
+        self.assertEqual(entry['view'], 'income-list')
+        self.assertEqual(entry['owner_id'], self.user.pk)
+        # Parameters are only kept as a hash, never in the SQL
+        self.assertRegex(entry['params_hash'], r'^[0-9a-f]{16}$')
+        self.assertIn('%s', entry['sql'])
+        self.assertNotIn('params', entry)
+        self.assertTrue(entry['plan'])
+
+    def test_streamed_queries_attributed_to_request(self):
+        """
+        Should attribute the queries of a streamed list to its request,
+        and count them in its metrics once the stream has been sent.
+        """
+        queries = metrics.db_queries.get(url_name='income-list')
+
+        with self.settings(SLOW_QUERY_THRESHOLD_MS=1e-6), \
+                self.assertLogs('core.slow_queries', 'WARNING'):
+            response = self.client.get('/income/?format=stream')
+            self.assertEqual(
+                metrics.db_queries.get(url_name='income-list'), queries)
+            self.assertEqual(b''.join(response.streaming_content), b'[]')
+
+        entry = self._income_queries()[0]
+        self.assertEqual(entry['view'], 'income-list')
+        self.assertEqual(entry['owner_id'], self.user.pk)
+        self.assertGreater(
+            metrics.db_queries.get(url_name='income-list'), queries)
+
+    @override_settings(SLOW_QUERY_EXPLAIN_RATE=0.0)
+    def test_plans_only_captured_when_sampled(self):
+        """
+        Should skip EXPLAIN for queries outside the sample.
+        """
+        self._get_logging_every_query('/income/')
+
+        self.assertIsNone(self._income_queries()[0]['plan'])
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=60_000)
+    def test_fast_queries_not_logged(self):
+        """
+        Should ignore queries under the threshold.
+        """
+        self.client.get('/income/')
+        self.assertEqual(slow_queries.entries(), [])
+
+
+class RequestProfilingMiddlewareTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = self.settings(PROFILE_DIR=directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.staff = User.objects.create_user(
+            username='staff', password='pass', is_staff=True)
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+
+    def _get_as(self, user, path: str):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        return self.client.get(path)
+
+    def test_cprofile_report_returned_and_stored(self):
+        """
+        Should return a cProfile report and store it for download.
+        """
+        response = self._get_as(
+            self.staff, '/calendar-summary/?month=2025-04&__profile=cprofile')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Profiled-Status'], '200')
+        self.assertIn(b'cumulative', response.content)
+
+        download = self.client.get(response['X-Profile-URL'])
+        self.assertEqual(download.status_code, 200)
+        self.assertEqual(download.content, response.content)
+        self.assertEqual(
+            self.client.get('/internal/profiles/').data[0]['path'],
+            '/calendar-summary/?month=2025-04&__profile=cprofile')
+
+    def test_reports_shared_between_workers(self):
+        """
+        Should serve reports stored by another worker's store, and keep
+        only the newest PROFILE_STORE_SIZE.
+        """
+        other_worker = ProfileStore(size=2)
+        ids = [
+            other_worker.add('cprofile', f'/income/?page={page}', 1,
+                             'report', 'text/plain')
+            for page in range(3)
+        ]
+
+        self.assertIsNone(profile_store.get(ids[0]))
+        self.assertEqual(profile_store.get(ids[2])['content'], 'report')
+        self.assertEqual(
+            [profile['id'] for profile in profile_store.list()],
+            ids[:0:-1])
+        self.assertIsNone(profile_store.get('../traffic'))
+
+    def test_tracemalloc_report(self):
+        """
+        Should report peak memory and allocations by line.
+        """
+        response = self._get_as(self.staff, '/income/?__profile=tracemalloc')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Peak traced memory', response.content)
+
+    def test_non_staff_get_normal_response(self):
+        """
+        Should ignore the parameter for regular users.
+        """
+        response = self._get_as(self.user, '/income/?__profile=cprofile')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [])
+        self.assertEqual(profile_store.list(), [])
+
+    def test_unknown_or_missing_profiler_rejected(self):
+        """
+        Should return 400 for unknown profilers and for pyinstrument
+        when it is not installed.
+        """
+        response = self._get_as(self.staff, '/income/?__profile=perf')
+        self.assertEqual(response.status_code, 400)
+
+        with patch.dict('sys.modules', {'pyinstrument': None}):
+            response = self._get_as(
+                self.staff, '/income/?__profile=pyinstrument')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('not installed', response.json()['detail'])
+
+
+class TrafficCaptureMiddlewareTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.capture_file = os.path.join(directory.name, 'traffic.jsonl')
+        settings = self.settings(
+            TRAFFIC_CAPTURE_FILE=self.capture_file,
+            TRAFFIC_CAPTURE_SAMPLE_RATE=1.0)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def _records(self) -> list[dict]:
+        if not os.path.exists(self.capture_file):
+            return []
+        with open(self.capture_file) as file:
+            return [json.loads(line) for line in file]
+
+    def test_request_recorded_without_user_data(self):
+        """
+        Should record the path template, relative month, body shape and
+        user bucket, but no ids, titles or amounts.
+        """
+        income = Income.objects.create(
+            owner=self.user, title='Salary', amount=250000,
+            date=timezone.now())
+        last_month = (timezone.localdate().replace(day=1)
+                      - timedelta(days=1)).strftime('%Y-%m')
+
+        response = self.client.patch(
+            f'/income/{income.pk}/?month={last_month}&q=secret',
+            {'title': 'Private', 'amount': 99.5, 'repeated': 'MONTHLY'},
+            format='json')
+        self.assertEqual(response.status_code, 200)
+
+        [record] = self._records()
+        self.assertEqual(record['method'], 'PATCH')
+        self.assertEqual(record['path'], '/income/{pk}/')
+        self.assertEqual(record['query'], {'month': '{month:-1}'})
+        self.assertEqual(record['body'], {
+            'title': 'str', 'amount': 'float', 'repeated': 'MONTHLY'})
+        self.assertEqual(record['user_bucket'], user_bucket(self.user.pk))
+        self.assertEqual(record['status'], 200)
+        self.assertNotIn('Private', json.dumps(record))
+        self.assertNotIn(str(income.pk), record['path'])
+
+    def test_anonymous_and_internal_requests_not_recorded(self):
+        """
+        Should skip unauthenticated requests and internal endpoints.
+        """
+        self.client.credentials()
+        self.client.get('/income/')
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_authenticate(self.user)
+        self.client.get('/internal/slow-queries/')
+
+        self.assertEqual(self._records(), [])
+
+
+class DatabaseCheckoutMiddlewareTests(APITestCase):
+    def setUp(self):
+        checkout_stats.reset()
+
+    def test_records_connection_checkout(self):
+        """
+        Should record how each request obtained its connection.
+        """
+        self.client.get('/income/')
+
+        self.assertEqual(checkout_stats.snapshot()['requests'], 1)
+
+    @override_settings(SECURE_SSL_REDIRECT=True)
+    def test_ssl_redirect_skips_checkout(self):
+        """
+        Should not obtain a connection for requests SecurityMiddleware
+        redirects to HTTPS.
+        """
+        response = self.client.get('/income/')
+
+        self.assertEqual(response.status_code, 301)
+        self.assertEqual(checkout_stats.snapshot()['requests'], 0)
@@ -0,0 +1,114 @@
+import io
+import uuid
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from unittest import skipUnless
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from core.renderers import ORJSONParser, ORJSONRenderer, orjson
+from transactions.models import Expenditure
+from transactions.views import ExpenditureViewSet
+
+
+@skipUnless(orjson, "orjson is not installed")
+class ORJSONRendererTests(TestCase):
+    def test_output_matches_json_renderer(self):
+        """
+        Should render dates, Decimals and other special values exactly
+        as JSONRenderer does.
+        """
+        data = [{
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'date': datetime(2025, 3, 28, 9, 30, 15, 123456,
+                             tzinfo=timezone.utc),
+            'naive': datetime(2025, 3, 28, 9, 30),
+            'day': date(2025, 3, 28),
+            'at': time(9, 30, 15, 500000),
+            'amount': Decimal('12.50'),
+            'title': 'Café \u2028\u2029 "quoted" \U0001F600',
+            'label': gettext_lazy('Monthly'),
+            1: None,
+            'nested': {'values': [1, 2.5, True, None]},
+        }]
+
+        self.assertEqual(
+            ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indented_output_falls_back(self):
+        """
+        Should indent like JSONRenderer when asked to.
+        """
+        data = {'a': [1, 2]}
+        media_type = 'application/json; indent=4'
+
+        self.assertEqual(
+            ORJSONRenderer().render(data, media_type),
+            JSONRenderer().render(data, media_type))
+
+
+@skipUnless(orjson, "orjson is not installed")
+class ORJSONParserTests(TestCase):
+    def test_parses_like_json_parser(self):
+        """
+        Should return the same data as JSONParser.
+        """
+        body = '{"title": "Café", "amount": 12.5, "ids": [1, 2]}'
+
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(body.encode())),
+            JSONParser().parse(io.BytesIO(body.encode())))
+
+    def test_invalid_json_raises_parse_error(self):
+        """
+        Should raise ParseError for malformed bodies and NaN.
+        """
+        for body in [b'{"title": ', b'{"amount": NaN}']:
+            with self.assertRaises(ParseError):
+                ORJSONParser().parse(io.BytesIO(body))
+
+
+@skipUnless(orjson, "orjson is not installed")
+class ORJSONViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+        self.client.force_authenticate(user=self.user)
+        self.params = {'month': '2025-03'}
+        for day in range(1, 4):
+            Expenditure.objects.create(
+                owner=self.user, title=f'Bill {day}', amount=day * 100,
+                type='BILL',
+                date=datetime(2025, 3, day, tzinfo=timezone.utc))
+
+    def test_list_and_streamed_list_match_standard_renderer(self):
+        """
+        Should render and stream the same list as the standard
+        renderer, and accept JSON bodies.
+        """
+        regular = self.client.get('/expenditures/', self.params)
+
+        with patch.object(ExpenditureViewSet, 'renderer_classes',
+                          [ORJSONRenderer]), \
+                patch.object(ExpenditureViewSet, 'parser_classes',
+                             [ORJSONParser]):
+            fast = self.client.get('/expenditures/', self.params)
+            streamed = self.client.get(
+                '/expenditures/', {**self.params, 'format': 'stream'})
+            streamed_content = b''.join(streamed.streaming_content)
+            created = self.client.post('/expenditures/', {
+                'title': 'Rent', 'amount': '500.25', 'type': 'BILL',
+                'date': '2025-03-20T12:00:00Z', 'repeated': 'NEVER',
+            }, format='json')
+
+        self.assertEqual(fast.content, regular.content)
+        self.assertEqual(streamed_content, regular.content)
+        self.assertEqual(created.status_code, 201)
+        self.assertEqual(
+            Expenditure.objects.get(title='Rent').amount, 50025)
@@ -1,16 +1,25 @@
-from django.test import TestCase, RequestFactory
+from django.test import TestCase, RequestFactory, override_settings
 from django.contrib.auth.models import AnonymousUser, User
 from transactions.models.currency import Currency
 from core.utils.currency import get_currency_symbol, get_user_currency_symbol
-from datetime import datetime
+from datetime import date, datetime
 from unittest.mock import patch
 from django.utils.timezone import make_aware, now
 from core.utils.date_helpers import (
     get_user_and_month_range,
     get_weeks_in_month_clipped
 )
+from core.utils.db_metrics import ConnectionCheckoutStats
+from core.utils.metrics import MetricsRegistry, render_prometheus
 from core.utils.repeat_check import check_and_run_monthly_repeat
+from core.utils.traffic import anonymize_value, fill_body, fill_query_value
 from core.models import UserProfile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from SFT_API.warmup import warm_up
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from concurrent.futures import ThreadPoolExecutor
 
 
 class CurrencyUtilsTests(TestCase):
@@ -65,6 +74,16 @@ class CurrencyUtilsTests(TestCase):
         request.user = self.user
         self.assertEqual(get_user_currency_symbol(request), '¥')
 
+    def test_get_user_currency_symbol_queries_once_per_request(self):
+        """
+        Should reuse the symbol for repeated calls on the same request.
+        """
+        request = self.factory.get('/')
+        request.user = self.user
+        get_user_currency_symbol(request)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_currency_symbol(request), '£')
+
 
 class DateHelpersTests(TestCase):
     def setUp(self):
@@ -206,3 +225,219 @@ class CheckAndRunMonthlyRepeatTests(TestCase):
             day=1))
         self.assertEqual(mock_repeat.call_count, 2)
         mock_clean.assert_called_once_with(self.user)
+
+    @patch("core.utils.repeat_check.generate_6th_month_repeats")
+    @patch("core.utils.repeat_check.clean_old_transactions")
+    def test_skips_if_concurrent_request_completed_rollover(
+            self, mock_clean, mock_repeat):
+        """
+        Should re-check the profile after acquiring the lock and skip
+        repeat logic if another request already ran it this month.
+        """
+        current_month = now().date().replace(day=1)
+        profile, _ = UserProfile.objects.update_or_create(
+            user=self.user,
+            defaults={"last_repeat_check": current_month}
+        )
+        # Simulate the stale read taken before the other request committed
+        profile.last_repeat_check = None
+
+        with patch.object(UserProfile.objects, "get_or_create",
+                          return_value=(profile, False)):
+            check_and_run_monthly_repeat(self.request, self.user)
+
+        mock_repeat.assert_not_called()
+        mock_clean.assert_not_called()
+
+    @override_settings(SCHEDULED_PURGE=True)
+    @patch("core.utils.repeat_check.generate_6th_month_repeats")
+    @patch("core.utils.repeat_check.clean_old_transactions")
+    def test_skips_inline_cleanup_when_purge_is_scheduled(
+            self, mock_clean, mock_repeat):
+        """
+        Should still generate repeats but leave old-record cleanup to
+        the purge_old_transactions command when SCHEDULED_PURGE is set.
+        """
+        check_and_run_monthly_repeat(self.request, self.user)
+
+        self.assertEqual(mock_repeat.call_count, 2)
+        mock_clean.assert_not_called()
+
+
+class ConnectionCheckoutStatsTests(TestCase):
+    def test_snapshot_separates_reused_and_opened_connections(self):
+        """
+        Should count reuses separately and only time opened connections.
+        """
+        stats = ConnectionCheckoutStats()
+        stats.record(reused=True, elapsed_ms=0.01)
+        stats.record(reused=False, elapsed_ms=4.0)
+        stats.record(reused=False, elapsed_ms=2.0)
+
+        self.assertEqual(stats.snapshot(), {
+            'requests': 3,
+            'reused': 1,
+            'opened': 2,
+            'checkout_ms_avg': 3.0,
+            'checkout_ms_max': 4.0,
+        })
+
+
+class WarmUpTests(TestCase):
+    def test_warms_views_and_serializers_without_queries(self):
+        """
+        Should load every routed view and serializer without touching
+        the database, since it runs in the master before forking.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            warmed = warm_up()
+
+        self.assertEqual(len(queries), 0)
+        self.assertGreater(warmed['views'], 0)
+        self.assertGreater(warmed['serializers'], 0)
+
+
+class MetricsRegistryTests(TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.requests = self.registry.counter(
+            'requests_total', 'Requests.', ['url_name'])
+        self.latency = self.registry.histogram(
+            'latency_seconds', 'Latency.', ['url_name'], buckets=(0.1, 1.0))
+
+    def test_renders_prometheus_text(self):
+        """
+        Should render counters and cumulative histogram buckets.
+        """
+        self.requests.inc(url_name='income-list')
+        self.requests.inc(2, url_name='income-list')
+        self.latency.observe(0.05, url_name='income-list')
+        self.latency.observe(0.5, url_name='income-list')
+        self.latency.observe(3, url_name='income-list')
+
+        text = render_prometheus(self.registry.snapshot())
+
+        self.assertIn('# TYPE requests_total counter', text)
+        self.assertIn('requests_total{url_name="income-list"} 3', text)
+        self.assertIn(
+            'latency_seconds_bucket{url_name="income-list",le="0.1"} 1', text)
+        self.assertIn(
+            'latency_seconds_bucket{url_name="income-list",le="1.0"} 2', text)
+        self.assertIn(
+            'latency_seconds_bucket{url_name="income-list",le="+Inf"} 3',
+            text)
+        self.assertIn('latency_seconds_sum{url_name="income-list"} 3.55', text)
+        self.assertIn('latency_seconds_count{url_name="income-list"} 3', text)
+
+    def test_collect_sums_process_snapshots(self):
+        """
+        Should sum the snapshots every process wrote to METRICS_DIR.
+        """
+        other = MetricsRegistry()
+        other_requests = other.counter(
+            'requests_total', 'Requests.', ['url_name'])
+
+        with TemporaryDirectory() as directory, \
+                override_settings(METRICS_DIR=directory):
+            other_requests.inc(5, url_name='income-list')
+            other.flush(force=True)
+            self.requests.inc(url_name='income-list')
+
+            text = render_prometheus(self.registry.collect())
+
+        self.assertIn('requests_total{url_name="income-list"} 6', text)
+
+    def test_concurrent_flushes_from_threads(self):
+        """
+        Should write a complete snapshot when threads flush at once,
+        without errors or leftover temporary files.
+        """
+        with TemporaryDirectory() as directory, \
+                override_settings(METRICS_DIR=directory):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                list(pool.map(
+                    lambda _: self.registry.flush(force=True), range(200)))
+            files = [path.name for path in Path(directory).iterdir()]
+
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0].endswith('.json'))
+
+    def test_flush_errors_are_logged(self):
+        """
+        Should log, not raise, when the snapshot cannot be written.
+        """
+        with TemporaryDirectory() as directory, \
+                override_settings(METRICS_DIR=f'{directory}/missing'), \
+                self.assertLogs('core.metrics', 'WARNING'):
+            self.registry.flush(force=True)
+
+    def test_retired_workers_folded_into_one_file(self):
+        """
+        Should add each exiting process's totals to one retired file
+        and remove its own.
+        """
+        with TemporaryDirectory() as directory, \
+                override_settings(METRICS_DIR=directory):
+            for amount in [2, 3]:
+                worker = MetricsRegistry()
+                worker.counter(
+                    'requests_total', 'Requests.', ['url_name']
+                ).inc(amount, url_name='income-list')
+                worker.flush(force=True)
+                worker.retire()
+                worker.flush(force=True)
+            self.requests.inc(url_name='income-list')
+
+            text = render_prometheus(self.registry.collect())
+            files = [path.name for path in Path(directory).glob('*.json')]
+
+        self.assertIn('requests_total{url_name="income-list"} 6', text)
+        # The retired totals and the collecting process's own file
+        self.assertEqual(len(files), 2)
+        self.assertIn('retired.json', files)
+
+
+class TrafficUtilsTests(TestCase):
+    def test_months_and_dates_round_trip_relative_to_today(self):
+        """
+        Should store months and dates as offsets from the capture day
+        and replay them at the same offset from the replay day.
+        """
+        captured = date(2025, 3, 15)
+        month = anonymize_value('month', '2025-01', captured)
+        day = anonymize_value('since', '2025-03-20', captured)
+
+        self.assertEqual(month, '{month:-2}')
+        self.assertEqual(day, '{date:5}')
+        self.assertEqual(
+            fill_query_value(month, date(2026, 1, 10)), '2025-11')
+        self.assertEqual(
+            fill_query_value(day, date(2026, 1, 10)), '2026-01-15')
+
+    def test_free_text_values_dropped(self):
+        """
+        Should drop values that are not choices, months or dates.
+        """
+        captured = date(2025, 3, 15)
+        self.assertIsNone(anonymize_value('q', 'rent', captured))
+        self.assertIsNone(anonymize_value('month', '2025-13-45', captured))
+        self.assertEqual(anonymize_value('kind', 'INCOME', captured), 'INCOME')
+
+    def test_fill_body_uses_kept_and_synthetic_values(self):
+        """
+        Should keep recorded choices and fill other fields by name or
+        type.
+        """
+        replayed_at = make_aware(datetime(2026, 1, 10, 12))
+
+        body = fill_body({
+            'title': 'str', 'amount': 'float', 'repeated': 'MONTHLY',
+            'type': 'str', 'date': 'str', 'note': 'str', 'paid': 'bool',
+        }, replayed_at)
+
+        self.assertEqual(body, {
+            'title': 'Replayed entry', 'amount': 12.5, 'repeated': 'MONTHLY',
+            'type': 'BILL', 'date': replayed_at.isoformat(),
+            'note': 'replay', 'paid': False,
+        })
+        self.assertIsNone(fill_body(None, replayed_at))
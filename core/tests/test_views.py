@@ -1,9 +1,11 @@
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth.models import User
 from unittest.mock import patch
+from core.utils.slow_queries import slow_queries
 
 
 class ChangeEmailViewTests(APITestCase):
@@ -83,3 +85,120 @@ class CustomUserDetailsViewTests(APITestCase):
         self.client.logout()
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class DatabaseConnectionMetricsViewTests(APITestCase):
+    def setUp(self):
+        self.url = reverse('db_connection_metrics')
+        self.staff = User.objects.create_user(
+            username='staff', password='pass', is_staff=True)
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+
+    def test_staff_can_view_connection_metrics(self):
+        """
+        Should report the connection mode and checkout counters.
+        """
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            response.data['mode'], ['pool', 'persistent', 'per-request'])
+        self.assertGreaterEqual(response.data['checkouts']['requests'], 1)
+
+    def test_non_staff_cannot_view_connection_metrics(self):
+        """
+        Should return 403 for regular users.
+        """
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class MetricsViewTests(APITestCase):
+    def setUp(self):
+        self.url = reverse('metrics')
+        self.staff = User.objects.create_user(
+            username='staff', password='pass', is_staff=True)
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+
+    def test_staff_can_view_request_metrics(self):
+        """
+        Should report requests, queries and cache lookups by URL name
+        in the Prometheus text format.
+        """
+        self.client.force_authenticate(user=self.user)
+        self.client.get('/monthly-summary/')
+        self.client.get('/monthly-summary/')
+
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.get(self.url)
+        body = response.content.decode()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn(
+            'sft_http_requests_total{url_name="monthly-summary",'
+            'method="GET",status="200"}', body)
+        self.assertIn(
+            'sft_db_queries_total{url_name="monthly-summary"}', body)
+        self.assertIn(
+            'sft_cache_requests_total{cache="month_response",result="hit"}',
+            body)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_metrics_token_grants_access(self):
+        """
+        Should allow scrapers sending the metrics token, and no one
+        sending a wrong one.
+        """
+        response = self.client.get(
+            self.url, HTTP_AUTHORIZATION='Metrics scrape-secret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(
+            self.url, HTTP_AUTHORIZATION='Metrics wrong')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_non_staff_cannot_view_metrics(self):
+        """
+        Should return 403 for regular users.
+        """
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class SlowQueryLogViewTests(APITestCase):
+    def setUp(self):
+        self.url = reverse('slow_queries')
+        self.staff = User.objects.create_user(
+            username='staff', password='pass', is_staff=True)
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+        slow_queries.clear()
+        slow_queries.add({'sql': 'SELECT 1', 'duration_ms': 900.0})
+
+    def test_staff_can_view_and_clear_slow_queries(self):
+        """
+        Should list buffered slow queries, and empty them on DELETE.
+        """
+        self.client.force_authenticate(user=self.staff)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['queries'][0]['sql'], 'SELECT 1')
+
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(slow_queries.entries(), [])
+
+    def test_non_staff_cannot_view_slow_queries(self):
+        """
+        Should return 403 for regular users.
+        """
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
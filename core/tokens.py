@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow, datetime_from_epoch
+from core.utils.metrics import record_cache_lookup
+
+
+def blacklist_cache_key(jti: str) -> str:
+    return f"jwt-blacklisted:{jti}"
+
+
+def cache_blacklist_status(jti: str, expires_at, blacklisted: bool) -> None:
+    """
+    Caches whether a token is blacklisted, for no longer than it stays
+    valid. A "not blacklisted" result is also capped at
+    TOKEN_BLACKLIST_CACHE_TIMEOUT seconds and not cached at all when
+    that is 0.
+    """
+    remaining = (expires_at - aware_utcnow()).total_seconds()
+    if blacklisted:
+        timeout = int(remaining) + 1 if remaining > 0 else 0
+    else:
+        timeout = int(min(remaining, settings.TOKEN_BLACKLIST_CACHE_TIMEOUT))
+    if timeout > 0:
+        cache.set(blacklist_cache_key(jti), blacklisted, timeout)
+
+
+class CachedRefreshToken(RefreshToken):
+    """
+    Refresh token whose blacklist checks and rotation writes avoid
+    redundant queries.
+
+    - Blacklisted jtis are cached until the token expires, so replayed
+      or logged-out tokens are rejected without a query. With
+      TOKEN_BLACKLIST_CACHE_TIMEOUT set, jtis found not blacklisted
+      (including freshly rotated ones) are cached too, so a warm
+      refresh skips the lookup; blacklisting a token overwrites that
+      entry (see core.signals). A cache miss checks the database.
+    - Outstanding and blacklisted rows are written with the token's
+      user id instead of first selecting the user, and the blacklist
+      row with a single INSERT ... ON CONFLICT DO NOTHING.
+    """
+
+    def check_blacklist(self) -> None:
+        jti = self.payload[api_settings.JTI_CLAIM]
+        blacklisted = cache.get(blacklist_cache_key(jti))
+        record_cache_lookup('token_blacklist', blacklisted is not None)
+
+        if blacklisted is None:
+            blacklisted = BlacklistedToken.objects.filter(
+                token__jti=jti).exists()
+            cache_blacklist_status(jti, self._expires_at(), blacklisted)
+        if blacklisted:
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self) -> None:
+        token, _ = OutstandingToken.objects.get_or_create(
+            jti=self.payload[api_settings.JTI_CLAIM],
+            defaults=self._outstanding_fields(),
+        )
+        BlacklistedToken.objects.bulk_create(
+            [BlacklistedToken(token=token)], ignore_conflicts=True)
+        cache_blacklist_status(token.jti, self._expires_at(), True)
+
+    def outstand(self) -> None:
+        # Called for a freshly rotated jti, which cannot exist yet or
+        # be blacklisted
+        jti = self.payload[api_settings.JTI_CLAIM]
+        OutstandingToken.objects.create(
+            jti=jti, **self._outstanding_fields())
+        cache_blacklist_status(jti, self._expires_at(), False)
+
+    def _outstanding_fields(self) -> dict:
+        return {
+            'user_id': self.payload.get(api_settings.USER_ID_CLAIM),
+            'created_at': self.current_time,
+            'token': str(self),
+            'expires_at': self._expires_at(),
+        }
+
+    def _expires_at(self):
+        return datetime_from_epoch(self.payload['exp'])
@@ -0,0 +1,67 @@
+import asyncio
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+
+async def run_query(func, *args, **kwargs):
+    """
+    Runs a synchronous ORM function in a worker thread with its own
+    database connection, so independent queries passed to
+    asyncio.gather() execute concurrently.
+
+    Django's async ORM methods (aaggregate, afirst, ...) all run on the
+    single thread-sensitive executor, so gathering them still runs the
+    queries one after another.
+
+    The worker's connection is released under the same CONN_MAX_AGE
+    and health-check rules Django applies at the end of a request.
+    """
+    def call():
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return await sync_to_async(call, thread_sensitive=False)()
+
+
+class AsyncAPIViewMixin:
+    """
+    Lets a DRF APIView define `async def` handlers.
+
+    DRF's dispatch() is synchronous, so this replaces it with a
+    coroutine. Authentication, permissions, throttling and the view's
+    initial(), handle_exception() and finalize_response() hooks still
+    run as before (in the thread-sensitive executor); only the handler
+    itself runs on the event loop. Handlers must not touch the ORM
+    directly; use run_query().
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(),
+                                  self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if asyncio.iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(
+                    request, *args, **kwargs)
+
+        except Exception as exc:
+            response = await sync_to_async(self.handle_exception)(exc)
+
+        self.response = await sync_to_async(self.finalize_response)(
+            request, response, *args, **kwargs)
+        return self.response
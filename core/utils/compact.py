@@ -0,0 +1,66 @@
+from rest_framework.response import Response
+from core.renderers import (
+    CompactJSONRenderer,
+    ORJSONCompactRenderer,
+    add_json_variant,
+)
+
+
+# Currency reported for users who never chose one, as in
+# get_user_currency_symbol()
+DEFAULT_CURRENCY = 'GBP'
+
+
+class CompactResponseMixin:
+    """
+    View mixin adding a compact representation, selected with
+    ?format=compact, for clients that format amounts themselves.
+
+    Compact responses hold raw integer pence and ISO dates, with the
+    user's currency code once at the top level:
+
+        {"currency": "GBP", "<compact_key>": [...]}
+
+    Views without a compact_key merge their (dict) data into the top
+    level instead. No serializer runs, so formatting and currency
+    symbol lookups are skipped entirely.
+
+    Must be combined with ConditionalMonthMixin, which reads the
+    currency code along with the data version, and folds the format
+    into the ETag and response cache key.
+    """
+    compact_key = None
+
+    def get_renderers(self):
+        return add_json_variant(
+            super().get_renderers(), CompactJSONRenderer,
+            ORJSONCompactRenderer)
+
+    def is_compact(self) -> bool:
+        return isinstance(
+            getattr(self.request, 'accepted_renderer', None),
+            CompactJSONRenderer)
+
+    def compact_response(self, data) -> Response:
+        currency = getattr(self, '_currency_code', None) or DEFAULT_CURRENCY
+        if self.compact_key:
+            data = {self.compact_key: data}
+        return Response({'currency': currency, **data})
+
+
+class CompactListMixin(CompactResponseMixin):
+    """
+    CompactResponseMixin for month-scoped list viewsets. Compact lists
+    are read with QuerySet.values(compact_fields) under "results",
+    without building model instances.
+    """
+    compact_key = 'results'
+    compact_fields = ('id', 'title', 'amount', 'date')
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_compact():
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.compact_response(
+            list(queryset.values(*self.compact_fields)))
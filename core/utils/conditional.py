@@ -0,0 +1,134 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from core.utils.data_version import (
+    get_data_state,
+    make_data_etag,
+    month_key,
+)
+from core.utils.date_helpers import get_user_and_month_range
+from core.utils.metrics import record_cache_lookup
+
+
+class _EarlyResponse(Exception):
+    """
+    Raised from initial() to answer a request without running the
+    handler, e.g. 304 Not Modified or a cached response.
+    """
+
+    def __init__(self, response: Response):
+        self.response = response
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    """
+    Weak comparison of an ETag against an If-None-Match header value.
+    """
+    candidates = parse_etags(if_none_match)
+    if '*' in candidates:
+        return True
+    opaque = etag.removeprefix('W/')
+    return any(tag.removeprefix('W/') == opaque for tag in candidates)
+
+
+class ConditionalMonthMixin:
+    """
+    View mixin adding ETag validation to month-scoped reads.
+
+    GET/HEAD requests (the `list` action on viewsets) receive an ETag
+    derived from the user's data version for the requested ?month=,
+    so the response can be revalidated without recomputing it:
+
+    - A matching If-None-Match returns 304 Not Modified with no body,
+      after one lightweight query and before the view's own queries.
+    - Any write to the month's entries or budget, or a currency
+      change, produces a new ETag.
+    - Each representation (?format=) has its own ETag.
+    """
+    conditional_actions = (None, 'list')
+
+    def _is_conditional(self, request) -> bool:
+        return (
+            request.method in ('GET', 'HEAD')
+            and getattr(self, 'action', None) in self.conditional_actions
+        )
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        self._data_etag = None
+        if not self._is_conditional(request):
+            return
+
+        user, start, _ = get_user_and_month_range(request)
+        month = month_key(start)
+        self._data_version, self._currency_code = get_data_state(
+            user, month)
+        renderer = request.accepted_renderer
+        self._data_etag = make_data_etag(
+            user, month, self._data_version, self._currency_code,
+            getattr(renderer, 'etag_format', renderer.format))
+
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match and _etag_matches(self._data_etag, if_none_match):
+            raise _EarlyResponse(Response(
+                status=status.HTTP_304_NOT_MODIFIED,
+                headers={'ETag': self._data_etag}
+            ))
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _EarlyResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs)
+        etag = getattr(self, '_data_etag', None)
+        if etag and response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class CachedMonthResponseMixin(ConditionalMonthMixin):
+    """
+    Extends ConditionalMonthMixin with a server-side response cache.
+
+    Successful responses are stored in Django's cache under the view
+    name and the month's ETag, which already identifies the user,
+    month, data version, currency and representation. A write bumps
+    the data version, so stale entries are never read again and simply
+    expire after SUMMARY_CACHE_TIMEOUT. Hits skip the view's aggregate
+    queries.
+    """
+
+    def _response_cache_key(self) -> str:
+        return f"month-response:{type(self).__name__}:{self._data_etag}"
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        if self._data_etag:
+            data = cache.get(self._response_cache_key())
+            record_cache_lookup('month_response', data is not None)
+            if data is not None:
+                self._cache_hit = True
+                raise _EarlyResponse(Response(data))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs)
+        if (
+            getattr(self, '_data_etag', None)
+            and not getattr(self, '_cache_hit', False)
+            and response.status_code == status.HTTP_200_OK
+        ):
+            cache.set(
+                self._response_cache_key(),
+                response.data,
+                settings.SUMMARY_CACHE_TIMEOUT
+            )
+        return response
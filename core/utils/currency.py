@@ -27,6 +27,9 @@ def get_user_currency_symbol(request, default='GBP'):
     """
     Get the authenticated user's selected currency symbol.
 
+    The symbol is looked up once per request and reused, since
+    serializers call this for every formatted amount.
+
     Returns:
         str: The user's selected currency symbol, or the default
         if unauthenticated or not set.
@@ -34,7 +37,11 @@ def get_user_currency_symbol(request, default='GBP'):
     if not request or not request.user.is_authenticated:
         return get_currency_symbol(default)
 
-    user_currency = Currency.objects.only("currency").filter(
-        owner=request.user).first()
-    selected_code = user_currency.currency if user_currency else default
-    return get_currency_symbol(selected_code)
+    symbol = getattr(request, '_currency_symbol', None)
+    if symbol is None:
+        user_currency = Currency.objects.only("currency").filter(
+            owner=request.user).first()
+        selected_code = user_currency.currency if user_currency else default
+        symbol = get_currency_symbol(selected_code)
+        request._currency_symbol = symbol
+    return symbol
@@ -0,0 +1,95 @@
+import hashlib
+import uuid
+from datetime import date, datetime
+from django.contrib.auth.models import User
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import TruncMonth
+from django.utils.timezone import localtime
+from transactions.models import MonthDataVersion, Currency
+
+
+def month_key(value) -> date:
+    """
+    Returns the first day of the month a date or datetime falls in,
+    using the current timezone for aware datetimes.
+    """
+    if isinstance(value, datetime):
+        value = localtime(value).date()
+    return value.replace(day=1)
+
+
+def get_data_months(queryset) -> set[tuple[int, date]]:
+    """
+    Returns the distinct (owner_id, month) pairs covered by a queryset
+    of dated, owned records. Collect these before a queryset
+    update() or delete() and pass them to bump_data_versions() after.
+    """
+    rows = queryset.annotate(
+        data_month=TruncMonth('date')
+    ).values_list('owner_id', 'data_month').distinct().order_by()
+    return {(owner_id, month_key(month)) for owner_id, month in rows}
+
+
+def get_instance_months(instances) -> set[tuple[int, date]]:
+    """
+    Returns the distinct (owner_id, month) pairs for model instances.
+    """
+    return {(entry.owner_id, month_key(entry.date)) for entry in instances}
+
+
+def bump_data_versions(months) -> None:
+    """
+    Replaces the data version of each (owner_id, month) pair with a
+    new token in a single upsert, invalidating ETags for those months.
+    Call after the write so a concurrent reader never pairs the new
+    version with old data.
+    """
+    months = set(months)
+    if not months:
+        return
+
+    MonthDataVersion.objects.bulk_create(
+        [
+            MonthDataVersion(owner_id=owner_id, month=month,
+                             version=uuid.uuid4())
+            for owner_id, month in months
+        ],
+        update_conflicts=True,
+        unique_fields=['owner', 'month'],
+        update_fields=['version'],
+    )
+
+
+def get_data_state(user, month: date) -> tuple:
+    """
+    Returns (data_version, currency_code) for a user's month in one
+    query. Either is None if the month was never written or the user
+    has no currency row yet.
+    """
+    row = User.objects.filter(pk=user.pk).annotate(
+        data_version=Subquery(
+            MonthDataVersion.objects.filter(
+                owner=OuterRef('pk'), month=month
+            ).values('version')[:1]
+        ),
+        currency_code=Subquery(
+            Currency.objects.filter(
+                owner=OuterRef('pk')).values('currency')[:1]
+        ),
+    ).values_list('data_version', 'currency_code').first()
+    return row or (None, None)
+
+
+def make_data_etag(user, month: date, data_version, currency_code,
+                   representation: str) -> str:
+    """
+    Returns a weak ETag for a user's data in a month.
+
+    Combines the month's data version with the user's currency code,
+    since every amount is formatted with the currency symbol, and the
+    representation (the renderer format, e.g. json or compact), since
+    each has a different body.
+    """
+    token = (f"{user.pk}:{month:%Y-%m}:{data_version}:{currency_code}:"
+             f"{representation}")
+    return f'W/"{hashlib.md5(token.encode()).hexdigest()}"'
@@ -1,6 +1,6 @@
 from django.utils.timezone import now, make_aware
 from django.http import HttpRequest
-from datetime import timedelta, datetime
+from datetime import date, timedelta, datetime
 from dateutil.relativedelta import relativedelta
 
 
@@ -43,6 +43,15 @@ def get_user_and_month_range(request: HttpRequest):
     return user, start_of_month, end_of_month
 
 
+def get_month_range(month: date):
+    """
+    Returns the timezone-aware (start, exclusive end) datetimes of the
+    month containing `month`, matching get_user_and_month_range().
+    """
+    start_of_month = make_aware(datetime(month.year, month.month, 1))
+    return start_of_month, start_of_month + relativedelta(months=1)
+
+
 def get_weeks_in_month_clipped(request: HttpRequest):
     """
     Generates weekly ranges (start, end) clipped to the bounds
@@ -58,7 +67,15 @@ def get_weeks_in_month_clipped(request: HttpRequest):
             - Week ends are capped at the end of the month.
     """
     user, start_of_month, end_of_month = get_user_and_month_range(request)
+    weeks = get_weeks_clipped(start_of_month, end_of_month)
+    return user, weeks, start_of_month, end_of_month
 
+
+def get_weeks_clipped(start_of_month, end_of_month):
+    """
+    Returns weekly (start, end) ranges covering a month, with weeks
+    ending on Sunday and clipped to the month's bounds.
+    """
     weeks = []
     current = start_of_month
 
@@ -74,4 +91,4 @@ def get_weeks_in_month_clipped(request: HttpRequest):
         weeks.append((week_start, week_end))
         current = week_end
 
-    return user, weeks, start_of_month, end_of_month
+    return weeks
@@ -0,0 +1,75 @@
+import threading
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class ConnectionCheckoutStats:
+    """
+    Thread-safe, per-process counters of how requests obtained their
+    database connection. Recorded by DatabaseCheckoutMiddleware.
+
+    - reused: the worker's persistent connection was still open
+    - opened: a connection was opened, or checked out of the pool
+    - checkout_ms_total / checkout_ms_max: time spent opening or
+      checking out connections
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.reused = 0
+            self.opened = 0
+            self.checkout_ms_total = 0.0
+            self.checkout_ms_max = 0.0
+
+    def record(self, reused: bool, elapsed_ms: float) -> None:
+        with self._lock:
+            if reused:
+                self.reused += 1
+                return
+            self.opened += 1
+            self.checkout_ms_total += elapsed_ms
+            self.checkout_ms_max = max(self.checkout_ms_max, elapsed_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'requests': self.reused + self.opened,
+                'reused': self.reused,
+                'opened': self.opened,
+                'checkout_ms_avg': round(
+                    self.checkout_ms_total / self.opened, 3
+                ) if self.opened else 0.0,
+                'checkout_ms_max': round(self.checkout_ms_max, 3),
+            }
+
+
+checkout_stats = ConnectionCheckoutStats()
+
+
+def get_connection_metrics(alias: str = DEFAULT_DB_ALIAS) -> dict:
+    """
+    Returns this process's connection reuse settings and checkout
+    counters, plus psycopg pool statistics (size, available
+    connections, queued requests and wait times) when pooling is on.
+    """
+    connection = connections[alias]
+    pool = getattr(connection, 'pool', None)
+
+    if pool is not None:
+        mode = 'pool'
+    elif connection.settings_dict['CONN_MAX_AGE']:
+        mode = 'persistent'
+    else:
+        mode = 'per-request'
+
+    metrics = {
+        'mode': mode,
+        'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+        'checkouts': checkout_stats.snapshot(),
+    }
+    if pool is not None:
+        metrics['pool'] = pool.get_stats()
+    return metrics
@@ -0,0 +1,129 @@
+import hashlib
+import json
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils.timezone import now
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+from core.models import IdempotencyKey
+
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+
+class IdempotencyKeyReused(APIException):
+    """
+    Raised when an Idempotency-Key is retried with a different request.
+    """
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = (
+        "This Idempotency-Key was already used with a different request.")
+    default_code = 'idempotency_key_reused'
+
+
+def get_request_hash(request) -> str:
+    """
+    Returns a SHA-256 hex digest of the request's method, path and
+    parsed data. The data is hashed rather than the raw body, so
+    retries differing only in JSON key order or multipart boundary
+    still match.
+    """
+    data = request.data
+    if hasattr(data, 'lists'):
+        # QueryDict, from form and multipart bodies
+        data = dict(data.lists())
+    payload = json.dumps(
+        [request.method, request.path, data],
+        sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _get_live_key(user, key: str, path: str):
+    """
+    Returns the stored, unexpired IdempotencyKey for this user/key/path,
+    or None if there is none.
+    """
+    cutoff = now() - settings.IDEMPOTENCY_KEY_TTL
+    return IdempotencyKey.objects.filter(
+        owner=user,
+        key=key,
+        path=path,
+        created_at__gte=cutoff
+    ).first()
+
+
+def _replay(record: IdempotencyKey, request_hash: str) -> Response:
+    """
+    Rebuilds the original response from a stored IdempotencyKey, after
+    checking the retry sent the same request.
+    """
+    # Keys stored before request hashes were recorded have none
+    if record.request_hash and record.request_hash != request_hash:
+        raise IdempotencyKeyReused()
+    response = Response(record.response_body, status=record.status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+class IdempotentCreateMixin:
+    """
+    ViewSet mixin that honours the Idempotency-Key request header
+    on create (POST) actions.
+
+    - Without the header, create behaves exactly as before.
+    - The first successful request with a key stores its response.
+    - Retries with the same key (same user and path) within
+      IDEMPOTENCY_KEY_TTL return the stored response without
+      creating anything. Retries with different data get 422.
+    - Concurrent retries are resolved by the unique constraint on
+      (owner, key, path): the losing request is rolled back, including
+      any repeat entries it generated, and replays the winner's response.
+    """
+
+    def create(self, request, *args, **kwargs) -> Response:
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+
+        if len(key) > 255:
+            raise ValidationError(
+                {IDEMPOTENCY_HEADER: "Must be at most 255 characters."})
+
+        user = request.user
+        path = request.path
+        request_hash = get_request_hash(request)
+
+        record = _get_live_key(user, key, path)
+        if record:
+            return _replay(record, request_hash)
+
+        try:
+            with transaction.atomic():
+                # Clear this user's expired keys so the unique
+                # constraint only ever sees live ones
+                IdempotencyKey.objects.filter(
+                    owner=user,
+                    created_at__lt=now() - settings.IDEMPOTENCY_KEY_TTL
+                ).delete()
+
+                response = super().create(request, *args, **kwargs)
+
+                if status.is_success(response.status_code):
+                    IdempotencyKey.objects.create(
+                        owner=user,
+                        key=key,
+                        path=path,
+                        request_hash=request_hash,
+                        status_code=response.status_code,
+                        response_body=response.data,
+                    )
+        except IntegrityError:
+            # Another request with the same key committed first
+            record = _get_live_key(user, key, path)
+            if not record:
+                raise
+            return _replay(record, request_hash)
+
+        return response
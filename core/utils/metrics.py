@@ -0,0 +1,396 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows, where gunicorn does not run
+    fcntl = None
+
+
+logger = logging.getLogger('core.metrics')
+
+
+# Snapshot in METRICS_DIR holding the summed totals of exited workers
+RETIRED_SNAPSHOT = 'retired.json'
+
+# Upper bounds, in seconds, of the latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Metric:
+    """
+    A named counter or histogram with a fixed set of label names.
+    Values are kept per combination of label values.
+    """
+    type = None
+
+    def __init__(self, registry, name: str, documentation: str,
+                 labelnames: tuple):
+        self._registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def reset(self) -> None:
+        self._values = {}
+
+    def describe(self) -> dict:
+        return {
+            'type': self.type,
+            'help': self.documentation,
+            'labelnames': list(self.labelnames),
+        }
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._registry.lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> list:
+        return [[list(key), value] for key, value in self._values.items()]
+
+
+class Histogram(Metric):
+    """
+    Cumulative-bucket histogram. Each labelled value is stored as
+    [per-bucket counts..., +Inf count, sum].
+    """
+    type = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames,
+                 buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._registry.lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> list:
+        return [[list(key), list(counts)]
+                for key, counts in self._values.items()]
+
+    def describe(self) -> dict:
+        return {**super().describe(), 'buckets': list(self.buckets)}
+
+
+class MetricsRegistry:
+    """
+    Thread-safe, per-process store of counters and histograms,
+    rendered in the Prometheus text exposition format.
+
+    Gunicorn runs several worker processes, each with its own registry.
+    With METRICS_DIR set, each process writes its snapshot to its own
+    JSON file there (at most every METRICS_FLUSH_INTERVAL seconds, and
+    when the worker exits), and the /metrics endpoint sums every file.
+    Exiting workers fold their totals into a single RETIRED_SNAPSHOT
+    file, so counters never go backwards and recycled workers leave no
+    files behind.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Serializes writes of the snapshot file by the worker's threads
+        self._flush_lock = threading.Lock()
+        self._metrics = {}
+        self._snapshot_path = None
+        self._snapshot_pid = None
+        self._flushed_at = 0.0
+        self._retired = False
+
+    def counter(self, name: str, documentation: str,
+                labelnames=()) -> Counter:
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames=(),
+                  buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(
+            self, name, documentation, labelnames, buckets))
+
+    def _register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def reset(self) -> None:
+        with self.lock:
+            for metric in self._metrics.values():
+                metric.reset()
+
+    def snapshot(self) -> dict:
+        """
+        Returns every metric's definition and current samples, as
+        JSON-serializable data.
+        """
+        with self.lock:
+            return {
+                name: {**metric.describe(), 'samples': metric.samples()}
+                for name, metric in self._metrics.items()
+            }
+
+    def flush(self, force: bool = False) -> None:
+        """
+        Writes this process's snapshot to METRICS_DIR, if set and the
+        last write is older than METRICS_FLUSH_INTERVAL seconds.
+
+        Unforced flushes are skipped while another thread is writing.
+        Write errors are logged, never raised, so they cannot fail the
+        request that triggered the flush.
+        """
+        directory = settings.METRICS_DIR
+        if not directory:
+            return
+        if not self._flush_lock.acquire(blocking=force):
+            return
+        try:
+            # Retired totals are already counted in RETIRED_SNAPSHOT
+            if self._retired:
+                return
+            now = time.monotonic()
+            interval = settings.METRICS_FLUSH_INTERVAL
+            if not force and now - self._flushed_at < interval:
+                return
+            self._flushed_at = now
+
+            # Named once per process, so forked workers never share a
+            # file and a recycled worker's reused pid cannot overwrite
+            # its totals
+            if self._snapshot_pid != os.getpid():
+                self._snapshot_path = Path(directory) / (
+                    f'{os.getpid()}-{uuid.uuid4().hex}.json')
+                self._snapshot_pid = os.getpid()
+
+            _write_snapshot(self._snapshot_path, self.snapshot())
+        except OSError:
+            logger.warning(
+                "Could not write metrics to %s", directory, exc_info=True)
+        finally:
+            self._flush_lock.release()
+
+    def retire(self) -> None:
+        """
+        Adds this process's totals to METRICS_DIR's RETIRED_SNAPSHOT and
+        removes its own file. Called when a worker exits.
+        """
+        directory = settings.METRICS_DIR
+        if not directory:
+            return
+        retired_path = Path(directory) / RETIRED_SNAPSHOT
+        with self._flush_lock, \
+                _directory_lock(directory, exclusive=True):
+            snapshots = [self.snapshot()]
+            if retired_path.exists():
+                snapshots.append(json.loads(retired_path.read_text()))
+            _write_snapshot(retired_path, merge_snapshots(snapshots))
+            if self._snapshot_pid == os.getpid():
+                self._snapshot_path.unlink(missing_ok=True)
+            self._retired = True
+
+    def collect(self) -> dict:
+        """
+        Returns the snapshot summed across every process that wrote to
+        METRICS_DIR, or this process's own snapshot without it.
+        """
+        if not settings.METRICS_DIR:
+            return self.snapshot()
+
+        self.flush(force=True)
+        snapshots = []
+        # Locked so a retiring worker is never counted twice or missed
+        with _directory_lock(settings.METRICS_DIR, exclusive=False):
+            for path in Path(settings.METRICS_DIR).glob('*.json'):
+                try:
+                    snapshots.append(json.loads(path.read_text()))
+                except (OSError, ValueError):
+                    # Removed or half-written by another process
+                    continue
+        return merge_snapshots(snapshots)
+
+
+def _write_snapshot(path: Path, snapshot: dict) -> None:
+    """
+    Replaces the snapshot at `path` without readers ever seeing a
+    partial file.
+    """
+    # Unique, so concurrent writers never replace each other's file
+    temp_path = path.with_name(f'{path.stem}-{uuid.uuid4().hex}.tmp')
+    try:
+        temp_path.write_text(json.dumps(snapshot))
+        os.replace(temp_path, path)
+    except OSError:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def _directory_lock(directory: str, exclusive: bool):
+    """
+    Holds a lock on METRICS_DIR shared by every process, exclusive for
+    writers of RETIRED_SNAPSHOT. Does nothing where fcntl is missing.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(Path(directory) / '.lock', 'a') as lock_file:
+        fcntl.flock(
+            lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def merge_snapshots(snapshots: list[dict]) -> dict:
+    """
+    Sums the samples of several process snapshots by metric and label
+    values.
+    """
+    merged = {}
+    for snapshot in snapshots:
+        for name, data in snapshot.items():
+            target = merged.setdefault(name, {**data, 'samples': {}})
+            for labels, value in data['samples']:
+                key = tuple(labels)
+                if data['type'] == 'histogram':
+                    current = target['samples'].get(key, [0] * len(value))
+                    target['samples'][key] = [
+                        a + b for a, b in zip(current, value)]
+                else:
+                    target['samples'][key] = (
+                        target['samples'].get(key, 0) + value)
+
+    for data in merged.values():
+        data['samples'] = [
+            [list(key), value] for key, value in data['samples'].items()]
+    return merged
+
+
+def _escape(value: str) -> str:
+    return (value.replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def _format_labels(labelnames, labelvalues, extra=()) -> str:
+    pairs = list(zip(labelnames, labelvalues)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(
+        f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(snapshot: dict) -> str:
+    """
+    Renders a (merged) snapshot in the Prometheus text format.
+    """
+    lines = []
+    for name, data in sorted(snapshot.items()):
+        lines.append(f"# HELP {name} {data['help']}")
+        lines.append(f"# TYPE {name} {data['type']}")
+        labelnames = data['labelnames']
+
+        for labels, value in sorted(data['samples']):
+            if data['type'] != 'histogram':
+                lines.append(
+                    f"{name}{_format_labels(labelnames, labels)} "
+                    f"{_format_value(value)}")
+                continue
+
+            *counts, total = value
+            bounds = [repr(float(bound)) for bound in data['buckets']]
+            cumulative = 0
+            for bound, count in zip(bounds + ['+Inf'], counts):
+                cumulative += count
+                bucket_labels = _format_labels(
+                    labelnames, labels, [('le', bound)])
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+            label_text = _format_labels(labelnames, labels)
+            lines.append(f"{name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{name}_count{label_text} {cumulative}")
+    return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    'sft_http_requests_total',
+    'HTTP requests by URL name, method and status code.',
+    ['url_name', 'method', 'status'],
+)
+http_request_duration = registry.histogram(
+    'sft_http_request_duration_seconds',
+    'Time to produce a response, by URL name.',
+    ['url_name'],
+)
+db_queries = registry.counter(
+    'sft_db_queries_total',
+    'Database queries run by requests, by URL name.',
+    ['url_name'],
+)
+db_query_duration = registry.counter(
+    'sft_db_query_duration_seconds_total',
+    'Time spent in database queries by requests, by URL name.',
+    ['url_name'],
+)
+cache_requests = registry.counter(
+    'sft_cache_requests_total',
+    'Cache lookups by cache (auth_user, token_blacklist, '
+    'month_response) and result (hit or miss).',
+    ['cache', 'result'],
+)
+repeat_generations = registry.counter(
+    'sft_repeat_generations_total',
+    'Runs of the repeat generators, by generator.',
+    ['generator'],
+)
+repeat_entries_requested = registry.counter(
+    'sft_repeat_entries_requested_total',
+    'Repeat entries submitted for insertion, by generator and model, '
+    'including any skipped as already existing.',
+    ['generator', 'model'],
+)
+repeat_generation_duration = registry.histogram(
+    'sft_repeat_generation_duration_seconds',
+    'Time to generate repeats for one entry or month, by generator.',
+    ['generator'],
+)
+
+
+def record_cache_lookup(cache_name: str, hit: bool) -> None:
+    cache_requests.inc(cache=cache_name, result='hit' if hit else 'miss')
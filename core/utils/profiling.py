@@ -0,0 +1,183 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+from django.conf import settings
+from django.utils import timezone
+
+
+# Lines shown in cProfile and tracemalloc reports
+REPORT_LIMIT = 60
+
+
+class ProfilerUnavailable(Exception):
+    """
+    Raised when a profiler's optional package is not installed.
+    """
+
+
+class CProfileProfiler:
+    """
+    Deterministic function-level profile, sorted by cumulative time.
+    """
+    content_type = 'text/plain; charset=utf-8'
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self.profile.enable()
+
+    def stop(self) -> None:
+        self.profile.disable()
+
+    def report(self) -> str:
+        output = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=output)
+        stats.sort_stats('cumulative').print_stats(REPORT_LIMIT)
+        return output.getvalue()
+
+
+class PyinstrumentProfiler:
+    """
+    Sampling call-tree profile rendered as pyinstrument's interactive
+    HTML page. Requires the optional pyinstrument package.
+    """
+    content_type = 'text/html; charset=utf-8'
+
+    def __init__(self):
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            raise ProfilerUnavailable(
+                "pyinstrument is not installed on this server.")
+        self.profiler = Profiler()
+
+    def start(self) -> None:
+        self.profiler.start()
+
+    def stop(self) -> None:
+        self.profiler.stop()
+
+    def report(self) -> str:
+        return self.profiler.output_html()
+
+
+class TracemallocProfiler:
+    """
+    Memory still allocated when the response is ready, by source line,
+    with the peak traced during the request.
+    """
+    content_type = 'text/plain; charset=utf-8'
+
+    def start(self) -> None:
+        tracemalloc.start()
+
+    def stop(self) -> None:
+        self.snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ])
+        _, self.peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    def report(self) -> str:
+        statistics = self.snapshot.statistics('lineno')
+        lines = [
+            f"Peak traced memory: {self.peak / 1024:.1f} KiB",
+            f"Allocated at response: "
+            f"{sum(stat.size for stat in statistics) / 1024:.1f} KiB",
+            "",
+        ]
+        lines += [str(stat) for stat in statistics[:REPORT_LIMIT]]
+        return '\n'.join(lines) + '\n'
+
+
+PROFILERS = {
+    'cprofile': CProfileProfiler,
+    'pyinstrument': PyinstrumentProfiler,
+    'tracemalloc': TracemallocProfiler,
+}
+
+
+class ProfileStore:
+    """
+    Store of the most recent profile reports, keyed by id. Each report
+    is a JSON file in PROFILE_DIR, so every worker process can list and
+    serve the reports profiled by the others. Holds at most `size`
+    reports; the oldest are dropped first.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+
+    @property
+    def directory(self) -> Path:
+        return Path(settings.PROFILE_DIR)
+
+    def add(self, profiler: str, path: str, user_id, content: str,
+            content_type: str) -> str:
+        # Ids start with the creation time, so they sort oldest first
+        profile_id = f'{time.time_ns():016x}{uuid.uuid4().hex[:16]}'
+        profile = {
+            'id': profile_id,
+            'profiler': profiler,
+            'path': path,
+            'user_id': user_id,
+            'created_at': timezone.now().isoformat(),
+            'content': content,
+            'content_type': content_type,
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Written under a temporary name so readers never see a
+        # partial report
+        temp_path = self.directory / f'{profile_id}.tmp'
+        temp_path.write_text(json.dumps(profile))
+        os.replace(temp_path, self.directory / f'{profile_id}.json')
+
+        for old_path in self._paths()[self.size:]:
+            old_path.unlink(missing_ok=True)
+        return profile_id
+
+    def _paths(self) -> list[Path]:
+        """
+        Returns the paths of the stored reports, newest first.
+        """
+        return sorted(self.directory.glob('*.json'), reverse=True)
+
+    def _read(self, path: Path) -> dict | None:
+        try:
+            return json.loads(path.read_text())
+        except FileNotFoundError:
+            # Dropped by another worker
+            return None
+
+    def get(self, profile_id: str) -> dict | None:
+        if not re.fullmatch(r'[0-9a-f]{32}', profile_id):
+            return None
+        return self._read(self.directory / f'{profile_id}.json')
+
+    def list(self) -> list[dict]:
+        """
+        Returns every stored profile without its content, newest first.
+        """
+        profiles = []
+        for path in self._paths():
+            profile = self._read(path)
+            if profile is not None:
+                del profile['content']
+                profiles.append(profile)
+        return profiles
+
+
+# Profilers hook process-wide state (sys.monitoring, tracemalloc), so
+# only one request per process is profiled at a time
+profiling_lock = threading.Lock()
+
+profile_store = ProfileStore(settings.PROFILE_STORE_SIZE)
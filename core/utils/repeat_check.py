@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.db import transaction
 from django.utils.timezone import now
 from transactions.utils import (
     generate_6th_month_repeats,
@@ -14,6 +16,9 @@ def check_and_run_monthly_repeat(request, user: User) -> None:
     are generated only once per month for a given user.
 
     - Uses UserProfile.last_repeat_check to track last run month.
+    - The profile row is locked (SELECT ... FOR UPDATE) for the duration
+      of the run, so concurrent requests for the same user wait and then
+      see the updated check date instead of generating repeats twice.
     - If repeats for current month were already generated, the function
       exits early.
     - Otherwise, it triggers repeat generation and updates the profile.
@@ -28,16 +33,28 @@ def check_and_run_monthly_repeat(request, user: User) -> None:
     # Ensure user profile exists
     profile, _ = UserProfile.objects.get_or_create(user=user)
 
-    # Skip if repeats have already been generated this month
+    # Cheap unlocked check for the common case
     if profile.last_repeat_check == current_month:
         return
 
-    # Generate repeated entries
-    generate_6th_month_repeats(Income, user, current_month)
-    generate_6th_month_repeats(Expenditure, user, current_month)
+    with transaction.atomic():
+        # Re-read the profile under a row lock; another request may have
+        # completed the rollover while this one was waiting.
+        profile = UserProfile.objects.select_for_update().get(pk=profile.pk)
 
-    clean_old_transactions(user)
+        # Skip if repeats have already been generated this month
+        if profile.last_repeat_check == current_month:
+            return
 
-    # Update last repeat check timestamp
-    profile.last_repeat_check = current_month
-    profile.save(update_fields=["last_repeat_check"])
+        # Generate repeated entries
+        generate_6th_month_repeats(Income, user, current_month)
+        generate_6th_month_repeats(Expenditure, user, current_month)
+
+        # Inline cleanup is skipped when the batched purge command
+        # is scheduled instead
+        if not settings.SCHEDULED_PURGE:
+            clean_old_transactions(user)
+
+        # Update last repeat check timestamp
+        profile.last_repeat_check = current_month
+        profile.save(update_fields=["last_repeat_check"])
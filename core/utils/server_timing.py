@@ -0,0 +1,139 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+_current_timings = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """
+    Durations in milliseconds recorded during one sampled request,
+    keyed by phase name (auth, view, render, ...), plus the number and
+    total duration of its database queries.
+
+    Queries may run in worker threads (see core.utils.async_views), so
+    updates are locked.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.durations = {}
+        self.db_queries = 0
+        self.db_ms = 0.0
+
+    def add(self, name: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.durations[name] = self.durations.get(name, 0.0) + elapsed_ms
+
+    def add_query(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.db_queries += 1
+            self.db_ms += elapsed_ms
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            timings = {
+                name: round(elapsed_ms, 3)
+                for name, elapsed_ms in self.durations.items()
+            }
+            timings['db'] = round(self.db_ms, 3)
+            timings['db_queries'] = self.db_queries
+        return timings
+
+    def header_value(self) -> str:
+        """
+        Returns the timings as a Server-Timing header value, e.g.
+        `db;dur=3.1;desc="4 queries", auth;dur=0.4, view;dur=6.2`.
+        """
+        with self._lock:
+            queries = 'query' if self.db_queries == 1 else 'queries'
+            metrics = [
+                f'db;dur={self.db_ms:.3f};desc="{self.db_queries} {queries}"'
+            ]
+            metrics += [
+                f'{name};dur={elapsed_ms:.3f}'
+                for name, elapsed_ms in self.durations.items()
+            ]
+        return ', '.join(metrics)
+
+
+def start_request_timings() -> tuple[RequestTimings, object]:
+    """
+    Starts recording timings for the current request. Returns the
+    timings and a token for stop_request_timings().
+    """
+    timings = RequestTimings()
+    return timings, _current_timings.set(timings)
+
+
+def stop_request_timings(token) -> None:
+    _current_timings.reset(token)
+
+
+def get_request_timings() -> RequestTimings | None:
+    """
+    Returns the current request's timings, or None when the request
+    is not sampled.
+    """
+    return _current_timings.get()
+
+
+@contextmanager
+def timed(name: str):
+    """
+    Adds the duration of the block to the current request's timings
+    under `name`. Does nothing for requests that are not sampled.
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, (time.perf_counter() - started) * 1000)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper adding each query's duration to the
+    current request's timings. Installed on every connection by
+    enable_query_timing(); requests without timings only pay for the
+    context variable lookup.
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add_query((time.perf_counter() - started) * 1000)
+
+
+def install_query_timer(connection, **kwargs) -> None:
+    """
+    Adds record_query to a connection's execute wrappers once. Used as
+    a connection_created receiver, so connections opened by worker
+    threads are timed too.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def enable_query_timing() -> None:
+    """
+    Times the queries of requests with timings on every connection:
+    those already open in this thread and any opened later.
+    """
+    connection_created.connect(
+        install_query_timer, dispatch_uid='core.install_query_timer')
+    for connection in connections.all(initialized_only=True):
+        install_query_timer(connection=connection)
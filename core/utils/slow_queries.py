@@ -0,0 +1,178 @@
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.backends.signals import connection_created
+from django.utils import timezone
+from django.utils.functional import LazyObject, empty
+
+
+logger = logging.getLogger('core.slow_queries')
+
+_current_request = ContextVar('slow_query_request', default=None)
+
+
+class SlowQueryBuffer:
+    """
+    Thread-safe ring buffer of this process's most recent slow queries.
+    Holds at most SLOW_QUERY_BUFFER_SIZE entries; older ones drop off.
+    """
+
+    def __init__(self, size: int):
+        self._lock = threading.Lock()
+        self._entries = deque(maxlen=size)
+
+    def add(self, entry: dict) -> None:
+        with self._lock:
+            self._entries.append(entry)
+
+    def entries(self) -> list[dict]:
+        """
+        Returns the buffered queries, newest first.
+        """
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+slow_queries = SlowQueryBuffer(settings.SLOW_QUERY_BUFFER_SIZE)
+
+
+def set_current_request(request):
+    """
+    Makes `request` the one slow queries are attributed to, until
+    reset_current_request() is called with the returned token.
+    """
+    return _current_request.set(request)
+
+
+def reset_current_request(token) -> None:
+    _current_request.reset(token)
+
+
+def _request_context(request) -> dict:
+    if request is None:
+        return {'view': None, 'owner_id': None}
+
+    match = request.resolver_match
+    user = getattr(request, 'user', None)
+    # An unevaluated lazy user would query the database to resolve
+    if isinstance(user, LazyObject) and user._wrapped is empty:
+        user = None
+    return {
+        'view': match.view_name if match else None,
+        'owner_id': getattr(user, 'pk', None),
+    }
+
+
+def hash_params(params) -> str | None:
+    """
+    Returns a short, stable hash of query parameters, so repeated
+    queries can be matched without logging users' data.
+    """
+    if params is None:
+        return None
+    return hashlib.sha256(repr(params).encode()).hexdigest()[:16]
+
+
+def explain_query(connection, sql: str, params) -> str | None:
+    """
+    Returns the plan of a SELECT query: EXPLAIN (ANALYZE, BUFFERS) on
+    PostgreSQL, which runs the query again, or EXPLAIN QUERY PLAN on
+    SQLite. Returns None for other statements and databases, or if
+    the EXPLAIN fails.
+
+    The plan is read with a cursor from create_cursor(), which
+    bypasses execute wrappers, so it is never itself logged. It runs in
+    a savepoint, so a failed EXPLAIN leaves the request's transaction
+    usable.
+    """
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    if connection.vendor == 'postgresql':
+        prefix = 'EXPLAIN (ANALYZE, BUFFERS) '
+    elif connection.vendor == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    else:
+        return None
+
+    try:
+        with transaction.atomic(using=connection.alias):
+            cursor = connection.create_cursor()
+            try:
+                cursor.execute(prefix + sql, params)
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+    except Exception:
+        logger.exception("Could not explain slow query")
+        return None
+
+    if connection.vendor == 'sqlite':
+        # (id, parent, notused, detail)
+        return '\n'.join(row[-1] for row in rows)
+    return '\n'.join(row[0] for row in rows)
+
+
+def log_slow_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper logging queries slower than
+    SLOW_QUERY_THRESHOLD_MS, with their duration, SQL, a hash of the
+    parameters, and the view and user of the request that ran them.
+
+    Entries are logged as JSON to the core.slow_queries logger and kept
+    in the slow_queries ring buffer. A share of them given by
+    SLOW_QUERY_EXPLAIN_RATE also captures the query plan.
+    """
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if elapsed_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+        return result
+
+    entry = {
+        'logged_at': timezone.now().isoformat(),
+        'duration_ms': round(elapsed_ms, 3),
+        'sql': sql,
+        'params_hash': hash_params(params),
+        'many': many,
+        **_request_context(_current_request.get()),
+        'plan': None,
+    }
+    if not many and random.random() < settings.SLOW_QUERY_EXPLAIN_RATE:
+        entry['plan'] = explain_query(context['connection'], sql, params)
+
+    slow_queries.add(entry)
+    logger.warning(json.dumps(entry))
+    return result
+
+
+def install_slow_query_logger(connection, **kwargs) -> None:
+    """
+    Adds log_slow_query to a connection's execute wrappers once. Used
+    as a connection_created receiver.
+    """
+    if log_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(log_slow_query)
+
+
+def enable_slow_query_log() -> None:
+    """
+    Logs slow queries on every connection: those already open in this
+    thread and any opened later.
+    """
+    connection_created.connect(
+        install_slow_query_logger,
+        dispatch_uid='core.install_slow_query_logger')
+    for connection in connections.all(initialized_only=True):
+        install_slow_query_logger(connection=connection)
@@ -0,0 +1,51 @@
+from django.utils.timezone import now
+from transactions.models import MonthSnapshot
+from core.utils.data_version import month_key
+
+
+class MonthSnapshotMixin:
+    """
+    Summary view mixin that serves closed months from MonthSnapshot.
+
+    Views implement build_summary_data(user, start, end), returning
+    the raw (unformatted) summary data, and name the MonthSnapshot
+    field holding it in `snapshot_field`. For months before the
+    current one, get_summary_data() returns the frozen data when the
+    snapshot's version still matches the month's data version, and
+    falls back to building it from the ledger otherwise.
+
+    Must be combined with ConditionalMonthMixin, which reads the data
+    version for the request.
+    """
+    snapshot_field = None
+
+    def get_summary_data(self, user, start, end):
+        data = self._get_snapshot_data(user, start)
+        if data is not None:
+            return data
+        return self.build_summary_data(user, start, end)
+
+    def build_summary_data(self, user, start, end):
+        """
+        Returns the raw summary data for the user between start and end,
+        built from the ledger. Must be implemented by the view.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} must implement build_summary_data()")
+
+    def _get_snapshot_data(self, user, start):
+        """
+        Returns the frozen data for a closed month if its snapshot is
+        current, otherwise None.
+        """
+        month = month_key(start)
+        data_version = getattr(self, '_data_version', ...)
+
+        if data_version is ... or month >= month_key(now()):
+            return None
+
+        return MonthSnapshot.objects.filter(
+            owner=user,
+            month=month,
+            version=data_version
+        ).values_list(self.snapshot_field, flat=True).first()
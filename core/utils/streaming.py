@@ -0,0 +1,62 @@
+import contextvars
+from django.http import StreamingHttpResponse
+from core.renderers import (
+    ORJSONStreamingRenderer,
+    StreamingJSONRenderer,
+    add_json_variant,
+)
+
+
+class StreamingListMixin:
+    """
+    ViewSet mixin letting clients opt in to a streamed `list` response
+    with ?format=stream.
+
+    Rows are read with QuerySet.iterator() (a server-side cursor on
+    PostgreSQL), serialized one at a time and written out in chunks of
+    stream_chunk_size, so peak memory no longer grows with the number
+    of rows. The JSON is the same as the regular response, and is
+    encoded with orjson when the view's JSON renderer uses it; headers
+    set by other mixins, such as the ETag, still apply.
+
+    The rows are read after the middleware has returned, so the stream
+    is advanced in a copy of the view's context: the request's slow
+    queries stay attributed to it, and MetricsMiddleware still counts
+    its queries. The Server-Timing header is sent before any row is
+    read, so it does not include them.
+    """
+    stream_chunk_size = 500
+
+    def get_renderers(self):
+        return add_json_variant(
+            super().get_renderers(), StreamingJSONRenderer,
+            ORJSONStreamingRenderer)
+
+    def list(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, StreamingJSONRenderer):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer()
+        rows = (
+            serializer.to_representation(instance)
+            for instance in queryset.iterator(
+                chunk_size=self.stream_chunk_size)
+        )
+        return StreamingHttpResponse(
+            _run_in_context(
+                contextvars.copy_context(),
+                renderer.stream(rows, self.stream_chunk_size)),
+            content_type=renderer.media_type)
+
+
+def _run_in_context(context, iterator):
+    """
+    Yields the items of `iterator`, advancing it inside `context`.
+    """
+    while True:
+        try:
+            yield context.run(next, iterator)
+        except StopIteration:
+            return
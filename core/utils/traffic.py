@@ -0,0 +1,225 @@
+import hashlib
+import hmac
+import json
+import re
+import threading
+from datetime import date, timedelta
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.utils import timezone
+from django.utils.functional import LazyObject, empty
+
+
+# Requests under these paths are never captured
+CAPTURE_EXCLUDED_PREFIXES = (
+    '/admin/',
+    '/internal/',
+    '/accounts/',
+    '/api/token/',
+    '/dj-rest-auth/login/',
+    '/dj-rest-auth/logout/',
+    '/dj-rest-auth/password/',
+    '/dj-rest-auth/registration/',
+    '/dj-rest-auth/token/',
+)
+
+# Query parameters and body fields whose values are kept verbatim,
+# since they are choices rather than user data. Other values are
+# dropped, and month/date values are stored relative to the capture.
+KEPT_VALUES = {'format', 'kind', 'repeated', 'type', 'currency'}
+
+# Query parameters never recorded
+DROPPED_PARAMS = {'__profile'}
+
+MONTH_RE = re.compile(r'^\d{4}-\d{2}$')
+DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+_write_lock = threading.Lock()
+
+
+def user_bucket(user_id) -> int:
+    """
+    Maps a user id to one of TRAFFIC_CAPTURE_USER_BUCKETS buckets with
+    a keyed hash, so requests by the same user stay grouped without
+    recording who made them.
+    """
+    digest = hmac.new(
+        settings.SECRET_KEY.encode(), str(user_id).encode(), hashlib.sha256
+    ).digest()
+    return int.from_bytes(digest[:8], 'big') % (
+        settings.TRAFFIC_CAPTURE_USER_BUCKETS)
+
+
+def path_template(request) -> str:
+    """
+    Returns the request path with URL arguments replaced by their
+    names, e.g. /income/42/ becomes /income/{pk}/.
+    """
+    kwargs = {
+        str(value): name
+        for name, value in request.resolver_match.kwargs.items()
+    }
+    return '/'.join(
+        f'{{{kwargs[segment]}}}' if segment in kwargs else segment
+        for segment in request.path.split('/')
+    )
+
+
+def anonymize_value(name: str, value: str, today: date):
+    """
+    Returns the recorded form of a query parameter value: kept
+    verbatim for KEPT_VALUES, as a {month:N} / {date:N} offset from
+    today for months and dates, and None (dropped) otherwise.
+    """
+    if name in KEPT_VALUES:
+        return value
+    if MONTH_RE.match(value):
+        year, month = map(int, value.split('-'))
+        offset = (year - today.year) * 12 + month - today.month
+        return f'{{month:{offset}}}'
+    if DATE_RE.match(value):
+        try:
+            offset = (date.fromisoformat(value) - today).days
+        except ValueError:
+            return None
+        return f'{{date:{offset}}}'
+    return None
+
+
+def body_shape(data) -> dict | None:
+    """
+    Returns a JSON object body's field names with the type of each
+    value (str, int, float, bool, null, list or dict), keeping only
+    KEPT_VALUES fields' values.
+    """
+    if not isinstance(data, dict):
+        return None
+    type_names = {
+        str: 'str', int: 'int', float: 'float', bool: 'bool',
+        type(None): 'null', list: 'list', dict: 'dict',
+    }
+    return {
+        name: (value if name in KEPT_VALUES and isinstance(value, str)
+               else type_names.get(type(value), 'str'))
+        for name, value in data.items()
+    }
+
+
+def read_body_shape(request) -> dict | None:
+    """
+    Returns the shape of a JSON or form request body. Reading
+    request.body caches it, so the view can still parse it.
+    """
+    if request.content_type == 'application/json':
+        try:
+            return body_shape(json.loads(request.body or b'null'))
+        except ValueError:
+            return None
+    if request.content_type == 'application/x-www-form-urlencoded':
+        return body_shape(request.POST.dict())
+    return None
+
+
+def get_resolved_user(request):
+    """
+    Returns the request's authenticated user, without resolving a lazy
+    user that no view has evaluated (which would query the database).
+    """
+    user = getattr(request, 'user', None)
+    if isinstance(user, LazyObject) and user._wrapped is empty:
+        return None
+    if user is None or not user.is_authenticated:
+        return None
+    return user
+
+
+def should_capture(request) -> bool:
+    return (
+        request.resolver_match is not None
+        and not request.path.startswith(CAPTURE_EXCLUDED_PREFIXES)
+        and get_resolved_user(request) is not None
+    )
+
+
+def capture_record(request, response, body, elapsed_ms: float) -> dict:
+    """
+    Returns the anonymized JSONL record of a request.
+    """
+    today = timezone.localdate()
+    query = {}
+    for name, value in request.GET.items():
+        if name in DROPPED_PARAMS:
+            continue
+        recorded = anonymize_value(name, value, today)
+        if recorded is not None:
+            query[name] = recorded
+
+    return {
+        'captured_at': timezone.now().isoformat(timespec='seconds'),
+        'method': request.method,
+        'url_name': request.resolver_match.view_name,
+        'path': path_template(request),
+        'query': query,
+        'body': body,
+        'user_bucket': user_bucket(get_resolved_user(request).pk),
+        'status': response.status_code,
+        'duration_ms': round(elapsed_ms, 3),
+    }
+
+
+def write_record(record: dict) -> None:
+    """
+    Appends a record to TRAFFIC_CAPTURE_FILE as one line. Each line is
+    a single append, so worker processes can share the file.
+    """
+    line = json.dumps(record, separators=(',', ':')) + '\n'
+    with _write_lock, open(settings.TRAFFIC_CAPTURE_FILE, 'a') as file:
+        file.write(line)
+
+
+def fill_query_value(value: str, today: date) -> str:
+    """
+    Turns a recorded {month:N} / {date:N} offset back into a month or
+    date relative to `today`; other values are returned unchanged.
+    """
+    match = re.fullmatch(r'\{(month|date):(-?\d+)\}', value)
+    if not match:
+        return value
+    kind, offset = match.group(1), int(match.group(2))
+    if kind == 'month':
+        return (today + relativedelta(months=offset)).strftime('%Y-%m')
+    return (today + timedelta(days=offset)).isoformat()
+
+
+# Values sent for recorded body fields, by field name then by type
+REPLAY_FIELD_VALUES = {
+    'title': 'Replayed entry',
+    'amount': 12.5,
+    'repeated': 'NEVER',
+    'type': 'BILL',
+    'currency': 'GBP',
+}
+REPLAY_TYPE_VALUES = {
+    'str': 'replay', 'int': 1, 'float': 1.5, 'bool': False,
+    'null': None, 'list': [], 'dict': {},
+}
+
+
+def fill_body(shape: dict | None, now) -> dict | None:
+    """
+    Builds a request body from a recorded shape, using kept values
+    as recorded and synthetic values for everything else.
+    """
+    if shape is None:
+        return None
+    body = {}
+    for name, recorded in shape.items():
+        if name in KEPT_VALUES and recorded not in REPLAY_TYPE_VALUES:
+            body[name] = recorded
+        elif name == 'date':
+            body[name] = now.isoformat()
+        elif name in REPLAY_FIELD_VALUES:
+            body[name] = REPLAY_FIELD_VALUES[name]
+        else:
+            body[name] = REPLAY_TYPE_VALUES.get(recorded, 'replay')
+    return body
@@ -1,10 +1,22 @@
+import secrets
+from django.conf import settings
+from django.http import Http404, HttpResponse
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import (
+    BasePermission,
+    IsAuthenticated,
+    IsAdminUser,
+)
+from dj_rest_auth.jwt_auth import get_refresh_view
 from dj_rest_auth.views import UserDetailsView
-from .serializers import ChangeEmailSerializer
+from .serializers import ChangeEmailSerializer, CachedTokenRefreshSerializer
+from core.utils.db_metrics import get_connection_metrics
+from core.utils.metrics import registry, render_prometheus
+from core.utils.profiling import profile_store
 from core.utils.repeat_check import check_and_run_monthly_repeat
+from core.utils.slow_queries import slow_queries
 
 
 class ChangeEmailView(APIView):
@@ -38,3 +50,103 @@ class CustomUserDetailsView(UserDetailsView):
     def get(self, request, *args, **kwargs) -> Response:
         check_and_run_monthly_repeat(request, request.user)
         return super().get(request, *args, **kwargs)
+
+
+class DatabaseConnectionMetricsView(APIView):
+    """
+    Staff-only view of this worker process's database connection
+    reuse: mode (pool, persistent or per-request), checkout counts
+    and latency, and pool size and wait statistics when pooling.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs) -> Response:
+        return Response(get_connection_metrics())
+
+
+class HasMetricsToken(BasePermission):
+    """
+    Allows requests sending `Authorization: Metrics <METRICS_TOKEN>`,
+    so Prometheus can scrape without a user account. Denies everything
+    when METRICS_TOKEN is not set.
+    """
+
+    def has_permission(self, request, view) -> bool:
+        token = settings.METRICS_TOKEN
+        scheme, _, credentials = request.headers.get(
+            'Authorization', '').partition(' ')
+        return bool(token) and scheme == 'Metrics' and \
+            secrets.compare_digest(credentials, token)
+
+
+class MetricsView(APIView):
+    """
+    Request, database, cache and repeat generation metrics in the
+    Prometheus text format, summed across worker processes when
+    METRICS_DIR is set. Available to staff users and to scrapers
+    holding METRICS_TOKEN.
+    """
+    permission_classes = [HasMetricsToken | IsAdminUser]
+
+    def get(self, request, *args, **kwargs) -> HttpResponse:
+        return HttpResponse(
+            render_prometheus(registry.collect()),
+            content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class SlowQueryLogView(APIView):
+    """
+    Staff-only view of this worker process's most recent slow queries,
+    newest first, with their plans when captured. DELETE empties the
+    buffer, e.g. before reproducing a slow request. Other workers'
+    entries are only in the core.slow_queries log.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs) -> Response:
+        return Response({
+            'threshold_ms': settings.SLOW_QUERY_THRESHOLD_MS,
+            'queries': slow_queries.entries(),
+        })
+
+    def delete(self, request, *args, **kwargs) -> Response:
+        slow_queries.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfileListView(APIView):
+    """
+    Staff-only list of the profiles stored from `?__profile=`
+    requests by any worker process, newest first.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs) -> Response:
+        return Response(profile_store.list())
+
+
+class ProfileDetailView(APIView):
+    """
+    Staff-only download of a stored profile report.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id, *args, **kwargs) -> HttpResponse:
+        profile = profile_store.get(profile_id)
+        if profile is None:
+            raise Http404
+        extension = 'html' if 'html' in profile['content_type'] else 'txt'
+        response = HttpResponse(
+            profile['content'], content_type=profile['content_type'])
+        response['Content-Disposition'] = (
+            f'attachment; filename="{profile["profiler"]}-'
+            f'{profile_id}.{extension}"')
+        return response
+
+
+class CachedTokenRefreshView(get_refresh_view()):
+    """
+    dj-rest-auth's cookie-aware token refresh, using the cached
+    blacklist and user lookups of CachedTokenRefreshSerializer.
+    """
+    serializer_class = CachedTokenRefreshSerializer
@@ -0,0 +1,84 @@
+"""
+Gunicorn configuration for the web process (see Procfile).
+
+- preload_app loads Django, DRF and allauth once in the master, and
+  when_ready() warms URL, settings and serializer caches there, so
+  forked workers start warm instead of paying for it on their first
+  request.
+- With DB_POOL_MAX_SIZE set, post_worker_init() opens each worker's
+  connection pool before it accepts requests, so the first requests do
+  not wait on connection setup.
+- gthread workers serve WEB_CONCURRENCY processes with
+  GUNICORN_THREADS threads each. Each thread holds its own database
+  connection, so size DB_POOL_MAX_SIZE / the database's connection
+  limit accordingly.
+- Workers are recycled after GUNICORN_MAX_REQUESTS requests, with
+  jitter so they do not all restart at once, to bound memory growth.
+- With METRICS_DIR set, on_starting() clears metrics left by a previous
+  run and worker_exit() adds each worker's final metrics to the totals
+  of the workers that exited before it.
+"""
+import os
+from pathlib import Path
+
+
+preload_app = True
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+
+def on_starting(server):
+    """
+    Removes worker metrics files written before this server started.
+    """
+    directory = os.environ.get('METRICS_DIR')
+    if directory:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        for path in Path(directory).glob('*.json'):
+            path.unlink(missing_ok=True)
+
+
+def when_ready(server):
+    """
+    Warms the preloaded app in the master before any worker is forked.
+    """
+    from django.db import connections
+    from SFT_API.warmup import warm_up
+
+    warmed = warm_up()
+    # Never hand an open connection to forked workers
+    connections.close_all()
+    server.log.info(
+        "Warmed %(views)d views and %(serializers)d serializers", warmed)
+
+
+def post_worker_init(worker):
+    """
+    Opens the worker's database connection pool, when pooling is
+    enabled. The pool is shared by the worker's threads and starts
+    filling to DB_POOL_MIN_SIZE connections in the background.
+    """
+    from django.db import connections
+
+    for connection in connections.all():
+        pool = getattr(connection, 'pool', None)
+        if pool is not None:
+            pool.open(wait=False)
+
+
+def worker_exit(server, worker):
+    """
+    Adds the exiting worker's final metrics to the retired workers'
+    totals and removes its own file, so requests since its last
+    periodic write are still counted.
+    """
+    from core.utils.metrics import registry
+
+    registry.retire()
@@ -0,0 +1,120 @@
+import asyncio
+import statistics
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+from transactions.views import (
+    MonthlySummaryView,
+    WeeklySummaryView,
+    CalendarSummaryView,
+    AsyncMonthlySummaryView,
+    AsyncWeeklySummaryView,
+    AsyncCalendarSummaryView,
+)
+
+
+# (name, sync view, async view) pairs compared by the benchmark
+SUMMARY_VIEWS = [
+    ('monthly-summary', MonthlySummaryView, AsyncMonthlySummaryView),
+    ('weekly-summary', WeeklySummaryView, AsyncWeeklySummaryView),
+    ('calendar-summary', CalendarSummaryView, AsyncCalendarSummaryView),
+]
+
+
+class Command(BaseCommand):
+    """
+    Compares request latency of the sync and async summary views for
+    one user and month against the configured database.
+
+    The response cache is disabled for the run so every request
+    computes its summary. Async views are awaited on a single event
+    loop, as they would be under an ASGI server.
+
+    Usage:
+        python manage.py benchmark_summaries --user alice
+        python manage.py benchmark_summaries --user alice --month 2025-05 \
+            --iterations 200
+    """
+    help = "Benchmark sync vs async summary view latency."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            required=True,
+            help="Username whose data is summarised."
+        )
+        parser.add_argument(
+            '--month',
+            help="Month to summarise (YYYY-MM, default: current month)."
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help="Requests per view and mode (default: 50)."
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        if iterations < 1:
+            raise CommandError("--iterations must be at least 1.")
+
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']!r} does not exist.")
+
+        params = {'month': options['month']} if options['month'] else {}
+        factory = APIRequestFactory()
+
+        def make_request():
+            request = factory.get('/summary/', params)
+            force_authenticate(request, user=user)
+            return request
+
+        self.stdout.write(
+            f"{'endpoint':<18}{'mode':<7}{'mean ms':>9}{'p50 ms':>9}"
+            f"{'p95 ms':>9}")
+
+        dummy_cache = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+        }
+        with override_settings(CACHES=dummy_cache):
+            for name, sync_view, async_view in SUMMARY_VIEWS:
+                sync_times = self._time_sync(
+                    sync_view.as_view(), make_request, iterations)
+                async_times = asyncio.run(self._time_async(
+                    async_view.as_view(), make_request, iterations))
+
+                self._report(name, 'sync', sync_times)
+                self._report(name, 'async', async_times)
+
+    def _time_sync(self, view, make_request, iterations) -> list[float]:
+        timings = []
+        for _ in range(iterations):
+            request = make_request()
+            started = time.perf_counter()
+            view(request).render()
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    async def _time_async(self, view, make_request,
+                          iterations) -> list[float]:
+        timings = []
+        for _ in range(iterations):
+            request = make_request()
+            started = time.perf_counter()
+            response = await view(request)
+            response.render()
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    def _report(self, name: str, mode: str, timings: list[float]) -> None:
+        millis = sorted(t * 1000 for t in timings)
+        p95 = millis[min(len(millis) - 1, int(len(millis) * 0.95))]
+        self.stdout.write(
+            f"{name:<18}{mode:<7}{statistics.mean(millis):>9.2f}"
+            f"{statistics.median(millis):>9.2f}{p95:>9.2f}")
@@ -0,0 +1,117 @@
+from datetime import datetime
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import now
+from dateutil.relativedelta import relativedelta
+from core.utils.data_version import month_key
+from core.utils.date_helpers import get_month_range
+from transactions.models import (
+    DisposableIncomeBudget,
+    LedgerEntry,
+    MonthDataVersion,
+    MonthSnapshot,
+)
+from transactions.utils import get_cleanup_cutoff
+from transactions.views import (
+    MonthlySummaryView,
+    WeeklySummaryView,
+    CalendarSummaryView,
+)
+
+
+class Command(BaseCommand):
+    """
+    Freezes the monthly, weekly and calendar summaries of closed
+    months into MonthSnapshot rows.
+
+    By default every closed month in the visible window is checked.
+    Snapshots that are missing, or were taken at an older data version
+    because a historical row was edited since, are (re)built. Users
+    without entries or a budget in a month are skipped; their empty
+    summaries are cheap to compute live.
+
+    Usage:
+        python manage.py close_months
+        python manage.py close_months --month 2025-05
+    """
+    help = "Freeze summary snapshots for closed months."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--month',
+            help="Close a single month (YYYY-MM) instead of every closed "
+            "month in the visible window."
+        )
+
+    def handle(self, *args, **options):
+        current_month = month_key(now())
+
+        if options['month']:
+            try:
+                month = datetime.strptime(options['month'], "%Y-%m").date()
+            except ValueError:
+                raise CommandError("--month must be in YYYY-MM format.")
+            if month >= current_month:
+                raise CommandError("Only past months can be closed.")
+            months = [month]
+        else:
+            months = []
+            month = month_key(get_cleanup_cutoff())
+            while month < current_month:
+                months.append(month)
+                month += relativedelta(months=1)
+
+        total = 0
+        for month in months:
+            count = self._close_month(month)
+            total += count
+            self.stdout.write(f"{month:%Y-%m}: {count} snapshots frozen")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Total: {total} snapshots frozen"))
+
+    def _close_month(self, month) -> int:
+        """
+        Builds snapshots for every user with data in the month whose
+        snapshot is missing or stale. Returns the number written.
+        """
+        start, end = get_month_range(month)
+
+        owner_ids = set(LedgerEntry.objects.filter(
+            date__gte=start, date__lt=end
+        ).values_list('owner_id', flat=True).distinct().order_by())
+        owner_ids |= set(DisposableIncomeBudget.objects.filter(
+            date__gte=start, date__lt=end
+        ).values_list('owner_id', flat=True))
+
+        versions = dict(MonthDataVersion.objects.filter(
+            month=month, owner_id__in=owner_ids
+        ).values_list('owner_id', 'version'))
+        frozen = dict(MonthSnapshot.objects.filter(
+            month=month, owner_id__in=owner_ids
+        ).values_list('owner_id', 'version'))
+
+        stale_ids = [
+            owner_id for owner_id in owner_ids
+            if owner_id not in frozen
+            or frozen[owner_id] != versions.get(owner_id)
+        ]
+
+        for user in User.objects.filter(pk__in=stale_ids):
+            # The version is read before the data, so an edit made while
+            # building leaves the snapshot behind the current version
+            MonthSnapshot.objects.update_or_create(
+                owner=user,
+                month=month,
+                defaults={
+                    'version': versions.get(user.pk),
+                    'monthly': MonthlySummaryView().build_summary_data(
+                        user, start, end),
+                    'weekly': WeeklySummaryView().build_summary_data(
+                        user, start, end),
+                    'calendar': CalendarSummaryView().build_summary_data(
+                        user, start, end),
+                }
+            )
+
+        return len(stale_ids)
@@ -0,0 +1,123 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils.timezone import now
+from dateutil.relativedelta import relativedelta
+from core.utils.data_version import bump_data_versions, get_data_months
+from transactions import partitions
+from transactions.models import Income, Expenditure, DisposableIncomeSpending
+from transactions.utils import get_cleanup_cutoff, purge_transactions
+
+
+# Model stored in each partitioned table, used when archiving a month
+PARTITIONED_MODELS = {
+    model._meta.db_table: model
+    for model in (Income, Expenditure, DisposableIncomeSpending)
+}
+
+
+class Command(BaseCommand):
+    """
+    Maintains the monthly partitions of the transaction tables on
+    PostgreSQL.
+
+    - Creates partitions from the start of the visible window up to
+      --months-ahead months past the current month, so new rows and
+      generated repeats never land in the DEFAULT partition.
+    - With --drop-expired, detaches and drops partitions for months
+      before the visible window. Their rows are archived first when
+      ARCHIVE_OLD_TRANSACTIONS is enabled.
+
+    On other database backends the command does nothing.
+
+    Usage:
+        python manage.py manage_partitions
+        python manage.py manage_partitions --drop-expired
+        python manage.py manage_partitions --months-ahead 12 --dry-run
+    """
+    help = "Create upcoming and drop expired monthly transaction partitions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=6,
+            help="Months past the current month to create partitions for "
+            "(default: 6, one past the repeat horizon)."
+        )
+        parser.add_argument(
+            '--drop-expired',
+            action='store_true',
+            help="Drop partitions for months before the visible window."
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Report changes without applying them."
+        )
+
+    def handle(self, *args, **options):
+        months_ahead = options['months_ahead']
+        drop_expired = options['drop_expired']
+        dry_run = options['dry_run']
+
+        if months_ahead < 0:
+            raise CommandError("--months-ahead cannot be negative.")
+
+        if not partitions.is_supported(connection):
+            self.stdout.write(
+                "Month partitioning requires PostgreSQL; nothing to do.")
+            return
+
+        first_month = get_cleanup_cutoff().date()
+        current_month = now().date().replace(day=1)
+        wanted = []
+        month = first_month
+        while month <= current_month + relativedelta(months=months_ahead):
+            wanted.append(month)
+            month += relativedelta(months=1)
+
+        for table in partitions.PARTITIONED_TABLES:
+            with transaction.atomic(), connection.cursor() as cursor:
+                if not partitions.is_partitioned(cursor, table):
+                    self.stdout.write(self.style.WARNING(
+                        f"{table} is not partitioned; skipping"))
+                    continue
+
+                existing = partitions.list_month_partitions(cursor, table)
+
+                for month in wanted:
+                    if month in existing:
+                        continue
+                    if not dry_run:
+                        partitions.create_month_partition(
+                            cursor, table, month)
+                    self.stdout.write(
+                        f"Created {partitions.partition_name(table, month)}")
+
+                if drop_expired:
+                    for month in existing:
+                        if month >= first_month:
+                            continue
+                        if not dry_run:
+                            self._drop_month(cursor, table, month)
+                        name = partitions.partition_name(table, month)
+                        self.stdout.write(f"Dropped {name}")
+
+        self.stdout.write(self.style.SUCCESS("Partitions up to date"))
+
+    def _drop_month(self, cursor, table: str, month) -> None:
+        """
+        Drops a month's partition, archiving its rows first if enabled,
+        and bumps the data versions of the users who had rows in it.
+        """
+        start, end = partitions.month_bounds(month)
+        rows = PARTITIONED_MODELS[table].objects.filter(
+            date__gte=start, date__lt=end)
+
+        if settings.ARCHIVE_OLD_TRANSACTIONS:
+            purge_transactions(rows, archive=True)
+
+        months = get_data_months(rows)
+        partitions.drop_month_partition(cursor, table, month)
+        bump_data_versions(months)
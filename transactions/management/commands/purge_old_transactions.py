@@ -0,0 +1,113 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from transactions.utils import (
+    TRANSACTION_MODELS,
+    get_cleanup_cutoff,
+    purge_transactions,
+)
+
+
+class Command(BaseCommand):
+    """
+    Deletes financial records older than the visible window for all
+    users, in primary-key-ordered batches.
+
+    When ARCHIVE_OLD_TRANSACTIONS is enabled, each batch is copied into
+    the ArchivedTransaction table in the same transaction as its delete.
+
+    Each batch is a short DELETE ... WHERE id IN (...) statement, so
+    locks are held briefly and the command can run alongside live
+    traffic. An optional sleep between batches limits the load placed
+    on the database.
+
+    Usage:
+        python manage.py purge_old_transactions
+        python manage.py purge_old_transactions --batch-size 500 --sleep 0.1
+        python manage.py purge_old_transactions --dry-run
+    """
+    help = "Delete transactions older than the visible window in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Maximum rows deleted per statement (default: 1000)."
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.0,
+            help="Seconds to pause between batches (default: 0)."
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Report how many rows would be deleted without deleting."
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        pause = options['sleep']
+        dry_run = options['dry_run']
+
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        if pause < 0:
+            raise CommandError("--sleep cannot be negative.")
+
+        archive = settings.ARCHIVE_OLD_TRANSACTIONS
+
+        cutoff = get_cleanup_cutoff()
+        action = "Archiving" if archive else "Purging"
+        self.stdout.write(f"{action} records dated before {cutoff.date()}")
+
+        total = 0
+        for model in TRANSACTION_MODELS:
+            old_rows = model.objects.filter(date__lt=cutoff)
+
+            if dry_run:
+                count = old_rows.count()
+            else:
+                count = self._delete_in_batches(
+                    old_rows, batch_size, pause, archive)
+
+            total += count
+            verb = "would be deleted" if dry_run else "deleted"
+            self.stdout.write(
+                f"{model._meta.verbose_name}: {count} rows {verb}")
+
+        verb = "would be deleted" if dry_run else "deleted"
+        self.stdout.write(self.style.SUCCESS(f"Total: {total} rows {verb}"))
+
+    def _delete_in_batches(self, queryset, batch_size: int,
+                           pause: float, archive: bool) -> int:
+        """
+        Deletes the queryset's rows in ascending primary-key batches,
+        resuming after the last seen key so each batch is an index
+        range scan. Returns the number of rows deleted.
+        """
+        deleted = 0
+        last_pk = 0
+
+        while True:
+            pks = list(
+                queryset.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+
+            count = purge_transactions(
+                queryset.model.objects.filter(pk__in=pks), archive=archive)
+            deleted += count
+            last_pk = pks[-1]
+
+            if len(pks) < batch_size:
+                break
+            if pause:
+                time.sleep(pause)
+
+        return deleted
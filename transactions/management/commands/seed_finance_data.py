@@ -0,0 +1,245 @@
+import random
+import time as timer
+import uuid
+from calendar import monthrange
+from datetime import datetime, time, timedelta
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.timezone import make_aware, now
+from dateutil.relativedelta import relativedelta
+from core.models import UserProfile
+from core.utils.data_version import bump_data_versions, get_instance_months
+from transactions.models import (
+    Income,
+    Expenditure,
+    DisposableIncomeSpending,
+    DisposableIncomeBudget,
+    Currency,
+)
+from transactions.utils import get_repeat_dates
+
+
+# Range of recurring income and expenditure series per user
+SERIES_RANGE = (5, 50)
+
+# Disposable spending entries per day
+DAILY_SPENDING_RANGE = (0, 3)
+
+INCOME_TITLES = ['Salary', 'Freelance', 'Rental income', 'Dividends']
+EXPENDITURE_TITLES = {
+    'BILL': ['Rent', 'Council tax', 'Energy', 'Phone', 'Gym', 'Streaming'],
+    'SAVING': ['Emergency fund', 'Holiday fund', 'ISA'],
+    'INVESTMENT': ['Index fund', 'Pension top-up', 'Shares'],
+}
+SPENDING_TITLES = ['Coffee', 'Lunch', 'Groceries', 'Taxi', 'Cinema', 'Books']
+
+
+class Command(BaseCommand):
+    """
+    Generates deterministic synthetic users and financial data for
+    benchmarking, load and index testing.
+
+    Each user gets:
+    - a currency, drawn from every supported code
+    - 5-50 recurring income and expenditure series, weekly or monthly,
+      started across the seeded months and repeated on the app's own
+      schedule (transactions.utils.get_repeat_dates) through the end of
+      the visible window, 5 months ahead
+    - 0-3 disposable spending entries per day up to today
+    - a disposable budget per month
+
+    Rows are written with bulk_create in batches, so millions of rows
+    take minutes. The same --seed always produces the same data.
+    Repeat rollover is marked done for the current month so the first
+    request of a seeded user does not regenerate or purge anything.
+
+    Seeded users are named <prefix><n> and share the password given by
+    --password. On PostgreSQL, run manage_partitions afterwards to move
+    rows for months without a partition out of the DEFAULT partition.
+
+    Usage:
+        python manage.py seed_finance_data --users 100
+        python manage.py seed_finance_data --users 10000 --months 12 --seed 7
+    """
+    help = "Generate deterministic synthetic users and financial data."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users',
+            type=int,
+            required=True,
+            help="Number of users to create."
+        )
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=6,
+            help="Months of history up to the current month (default: 6)."
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help="Random seed (default: 0)."
+        )
+        parser.add_argument(
+            '--prefix',
+            default='seed',
+            help="Username prefix for created users (default: seed)."
+        )
+        parser.add_argument(
+            '--password',
+            default='password',
+            help="Password of every created user (default: password)."
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help="Rows per INSERT statement (default: 5000)."
+        )
+
+    def handle(self, *args, **options):
+        users = options['users']
+        months = options['months']
+        prefix = options['prefix']
+        self.batch_size = options['batch_size']
+
+        if users < 1:
+            raise CommandError("--users must be at least 1.")
+        if months < 1:
+            raise CommandError("--months must be at least 1.")
+        if self.batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        if User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError(
+                f"Users named {prefix}* already exist; choose another "
+                f"--prefix.")
+
+        self.rng = random.Random(options['seed'])
+        self.pending = {}
+        self.counts = {}
+        started = timer.perf_counter()
+
+        today = now()
+        self.current_month = today.replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0)
+        self.first_month = self.current_month - relativedelta(
+            months=months - 1)
+        final_month = self.current_month + relativedelta(months=5)
+        self.until = make_aware(datetime.combine(
+            final_month.replace(day=monthrange(
+                final_month.year, final_month.month)[1]).date(),
+            time.max
+        ))
+        self.today = today
+
+        password = make_password(options['password'])
+        for start in range(0, users, self.batch_size):
+            with transaction.atomic():
+                created = User.objects.bulk_create([
+                    User(username=f'{prefix}{n}', password=password,
+                         email=f'{prefix}{n}@example.com')
+                    for n in range(start, min(start + self.batch_size, users))
+                ])
+                self._add_profiles(created)
+                for user in created:
+                    self._seed_user(user)
+                self._flush_all()
+
+        elapsed = timer.perf_counter() - started
+        for model, count in self.counts.items():
+            self.stdout.write(
+                f"{model._meta.verbose_name}: {count} rows created")
+        self.stdout.write(self.style.SUCCESS(
+            f"Total: {sum(self.counts.values())} rows created "
+            f"in {elapsed:.1f}s"))
+
+    def _add_profiles(self, users: list[User]) -> None:
+        """
+        Adds the profiles and currencies that signals and views would
+        normally create, skipped by bulk_create.
+        """
+        current_month = self.current_month.date()
+        currencies = [code for code, _ in Currency.CURRENCY_TYPE_CHOICES]
+        for user in users:
+            self._add(UserProfile(
+                user=user, last_repeat_check=current_month))
+            self._add(Currency(
+                owner=user, currency=self.rng.choice(currencies)))
+        self.counts[User] = self.counts.get(User, 0) + len(users)
+
+    def _seed_user(self, user: User) -> None:
+        rng = self.rng
+
+        for _ in range(rng.randint(*SERIES_RANGE)):
+            repeated = rng.choice(['WEEKLY', 'MONTHLY'])
+            start = self._random_datetime(
+                self.first_month, self.current_month + relativedelta(months=1))
+            group_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+            dates = [start] + get_repeat_dates(start, repeated, self.until)
+
+            if rng.random() < 0.25:
+                model = Income
+                fields = {
+                    'title': rng.choice(INCOME_TITLES),
+                    'amount': rng.randrange(5_000, 400_000),
+                }
+            else:
+                model = Expenditure
+                expenditure_type = rng.choice(list(EXPENDITURE_TITLES))
+                fields = {
+                    'title': rng.choice(EXPENDITURE_TITLES[expenditure_type]),
+                    'amount': rng.randrange(500, 150_000),
+                    'type': expenditure_type,
+                }
+
+            for date in dates:
+                self._add(model(
+                    owner=user, date=date, repeated=repeated,
+                    repeat_group_id=group_id, **fields))
+
+        day = self.first_month
+        while day <= self.today:
+            for _ in range(rng.randint(*DAILY_SPENDING_RANGE)):
+                self._add(DisposableIncomeSpending(
+                    owner=user, title=rng.choice(SPENDING_TITLES),
+                    amount=rng.randrange(100, 10_000),
+                    date=day + timedelta(minutes=rng.randrange(24 * 60))))
+            day += timedelta(days=1)
+
+        month = self.first_month
+        while month <= self.current_month:
+            self._add(DisposableIncomeBudget(
+                owner=user, date=month,
+                amount=rng.randrange(10_000, 100_000, 1_000)))
+            month += relativedelta(months=1)
+
+    def _random_datetime(self, start: datetime, end: datetime) -> datetime:
+        seconds = int((end - start).total_seconds())
+        return start + timedelta(seconds=self.rng.randrange(seconds))
+
+    def _add(self, obj) -> None:
+        """
+        Queues a row and writes its model's queue once it is a full
+        batch.
+        """
+        queue = self.pending.setdefault(type(obj), [])
+        queue.append(obj)
+        if len(queue) >= self.batch_size:
+            self._flush(type(obj))
+
+    def _flush(self, model) -> None:
+        rows = self.pending.pop(model, [])
+        if not rows:
+            return
+        model.objects.bulk_create(rows)
+        if model not in (UserProfile, Currency):
+            bump_data_versions(get_instance_months(rows))
+        self.counts[model] = self.counts.get(model, 0) + len(rows)
+
+    def _flush_all(self) -> None:
+        for model in list(self.pending):
+            self._flush(model)
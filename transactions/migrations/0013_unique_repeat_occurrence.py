@@ -0,0 +1,48 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:08
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def remove_duplicate_repeats(apps, schema_editor):
+    """
+    Deletes repeated entries that share (owner, repeat_group_id, date),
+    keeping the oldest row, so the unique constraint can be applied.
+    """
+    for model_name in ('Income', 'Expenditure'):
+        model = apps.get_model('transactions', model_name)
+        duplicates = (
+            model.objects
+            .filter(repeat_group_id__isnull=False)
+            .values('owner', 'repeat_group_id', 'date')
+            .annotate(keep_id=Min('id'), rows=Count('id'))
+            .filter(rows__gt=1)
+        )
+        for group in duplicates:
+            model.objects.filter(
+                owner=group['owner'],
+                repeat_group_id=group['repeat_group_id'],
+                date=group['date'],
+            ).exclude(id=group['keep_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0012_alter_disposableincomespending_title_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_repeats, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='expenditure',
+            unique_together={('owner', 'repeat_group_id', 'date')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='income',
+            unique_together={('owner', 'repeat_group_id', 'date')},
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0013_unique_repeat_occurrence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('INCOME', 'Income'), ('EXPENDITURE', 'Expenditure'), ('DISPOSABLE_SPENDING', 'Disposable Income Spending'), ('DISPOSABLE_BUDGET', 'Disposable Income Budget')], help_text='Source model of the archived record.', max_length=20)),
+                ('source_id', models.BigIntegerField(help_text='Primary key of the original record.')),
+                ('title', models.CharField(blank=True, help_text='Original title; blank for budgets.', max_length=50)),
+                ('amount', models.PositiveIntegerField(help_text='Amount in pence.')),
+                ('type', models.CharField(blank=True, choices=[('BILL', 'Bill'), ('SAVING', 'Savings'), ('INVESTMENT', 'Investment')], help_text='Expenditure category; blank for other kinds.', max_length=10)),
+                ('date', models.DateTimeField(help_text='Date the original record applied to.')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, help_text='When the record was moved to the archive.')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_transactions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived Transaction',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['owner', 'date'], name='transaction_owner_i_37a14c_idx')],
+            },
+        ),
+    ]
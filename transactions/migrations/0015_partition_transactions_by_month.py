@@ -0,0 +1,42 @@
+from django.db import migrations
+from transactions import partitions
+
+
+def partition_tables(apps, schema_editor):
+    """
+    Converts the income, expenditure and disposable spending tables to
+    monthly range partitions. Only runs on PostgreSQL.
+    """
+    connection = schema_editor.connection
+    if not partitions.is_supported(connection):
+        return
+
+    with connection.cursor() as cursor:
+        for table in partitions.PARTITIONED_TABLES:
+            if not partitions.is_partitioned(cursor, table):
+                partitions.partition_table(cursor, table)
+
+
+def unpartition_tables(apps, schema_editor):
+    """
+    Converts the partitioned tables back to plain tables.
+    """
+    connection = schema_editor.connection
+    if not partitions.is_supported(connection):
+        return
+
+    with connection.cursor() as cursor:
+        for table in partitions.PARTITIONED_TABLES:
+            if partitions.is_partitioned(cursor, table):
+                partitions.unpartition_table(cursor, table)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0014_archivedtransaction'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_tables, unpartition_tables),
+    ]
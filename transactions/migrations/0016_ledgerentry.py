@@ -0,0 +1,44 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:30
+
+from django.db import migrations, models
+
+
+CREATE_LEDGER_VIEW = """
+CREATE VIEW transactions_ledgerentry AS
+    SELECT id, owner_id, 'income' AS kind, amount, date
+    FROM transactions_income
+    UNION ALL
+    SELECT id, owner_id, LOWER(type) AS kind, amount, date
+    FROM transactions_expenditure
+    UNION ALL
+    SELECT id, owner_id, 'disposable' AS kind, amount, date
+    FROM transactions_disposableincomespending
+"""
+
+DROP_LEDGER_VIEW = "DROP VIEW IF EXISTS transactions_ledgerentry"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0015_partition_transactions_by_month'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_LEDGER_VIEW, DROP_LEDGER_VIEW),
+        migrations.CreateModel(
+            name='LedgerEntry',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('income', 'Income'), ('bill', 'Bill'), ('saving', 'Saving'), ('investment', 'Investment'), ('disposable', 'Disposable Spending')], max_length=10)),
+                ('amount', models.PositiveIntegerField()),
+                ('date', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Ledger Entry',
+                'verbose_name_plural': 'Ledger Entries',
+                'db_table': 'transactions_ledgerentry',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:35
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0016_ledgerentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthDataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month this version applies to.')),
+                ('version', models.UUIDField(default=uuid.uuid4, help_text="Replaced on every write to the month's data.")),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='month_data_versions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Month Data Version',
+                'unique_together': {('owner', 'month')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0017_monthdataversion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the closed month.')),
+                ('version', models.UUIDField(blank=True, help_text='Month data version the snapshot was taken at.', null=True)),
+                ('monthly', models.JSONField(help_text='Raw monthly summary totals in pence.')),
+                ('weekly', models.JSONField(help_text='Raw weekly summaries in pence.')),
+                ('calendar', models.JSONField(help_text='Raw daily summaries in pence.')),
+                ('frozen_at', models.DateTimeField(auto_now=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='month_snapshots', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Month Snapshot',
+                'unique_together': {('owner', 'month')},
+            },
+        ),
+    ]
@@ -2,3 +2,7 @@ from .expenditure import Expenditure
 from .income import Income
 from .disposable import DisposableIncomeBudget, DisposableIncomeSpending
 from .currency import Currency
+from .archive import ArchivedTransaction
+from .ledger import LedgerEntry
+from .version import MonthDataVersion
+from .snapshot import MonthSnapshot
@@ -0,0 +1,74 @@
+from django.db import models
+from django.contrib.auth.models import User
+from .shared import TYPE
+
+
+class ArchivedTransaction(models.Model):
+    """
+    Append-only history of financial records that have left the
+    visible window.
+
+    Rows are written in batches by the purge pipeline when
+    ARCHIVE_OLD_TRANSACTIONS is enabled and are never updated.
+    One compact table holds every source model, distinguished by `kind`.
+
+    Fields:
+        - owner: the user the original record belonged to
+        - kind: which model the record came from
+        - source_id: primary key of the original record
+        - title: original title (blank for budgets)
+        - amount: value in pence
+        - type: expenditure category (blank for other kinds)
+        - date: date the original record applied to
+        - archived_at: when the record was moved to the archive
+    """
+    KIND_CHOICES = [
+        ('INCOME', 'Income'),
+        ('EXPENDITURE', 'Expenditure'),
+        ('DISPOSABLE_SPENDING', 'Disposable Income Spending'),
+        ('DISPOSABLE_BUDGET', 'Disposable Income Budget'),
+    ]
+
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="archived_transactions"
+    )
+    kind = models.CharField(
+        max_length=20,
+        choices=KIND_CHOICES,
+        help_text="Source model of the archived record."
+    )
+    source_id = models.BigIntegerField(
+        help_text="Primary key of the original record."
+    )
+    title = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text="Original title; blank for budgets."
+    )
+    amount = models.PositiveIntegerField(
+        help_text="Amount in pence."
+    )
+    type = models.CharField(
+        max_length=10,
+        choices=TYPE,
+        blank=True,
+        help_text="Expenditure category; blank for other kinds."
+    )
+    date = models.DateTimeField(
+        help_text="Date the original record applied to."
+    )
+    archived_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="When the record was moved to the archive."
+    )
+
+    class Meta:
+        ordering = ['-date']
+        indexes = [models.Index(fields=['owner', 'date'])]
+        verbose_name = "Archived Transaction"
+
+    def __str__(self) -> str:
+        return (f"{self.owner.username} archived {self.kind}: "
+                f"{self.title} - {self.amount}")
@@ -55,6 +55,7 @@ class Expenditure(models.Model):
     )
 
     class Meta:
+        unique_together = ('owner', 'repeat_group_id', 'date')
         ordering = ['-date']
         verbose_name = "Expenditure"
         verbose_name_plural = "Expenditures"
@@ -50,6 +50,7 @@ class Income(models.Model):
     )
 
     class Meta:
+        unique_together = ('owner', 'repeat_group_id', 'date')
         ordering = ['-date']
         verbose_name = "Income"
         verbose_name_plural = "Incomes"
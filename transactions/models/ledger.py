@@ -0,0 +1,48 @@
+from django.db import models
+from django.contrib.auth.models import User
+
+
+class LedgerEntry(models.Model):
+    """
+    Read-only, unified view of every dated money movement for a user.
+
+    Backed by the `transactions_ledgerentry` database view, which is a
+    UNION ALL of the Income, Expenditure and DisposableIncomeSpending
+    tables with a `kind` column. Summaries aggregate over it with a
+    single query and GROUP BY instead of querying each table separately.
+    Writes still go through the source models.
+
+    Fields:
+        - id: primary key of the source row (unique only per kind)
+        - owner: the user who owns the source row
+        - kind: income, bill, saving, investment or disposable
+        - amount: value in pence
+        - date: datetime the source row applies to
+    """
+    KIND_CHOICES = [
+        ('income', 'Income'),
+        ('bill', 'Bill'),
+        ('saving', 'Saving'),
+        ('investment', 'Investment'),
+        ('disposable', 'Disposable Spending'),
+    ]
+
+    id = models.BigIntegerField(primary_key=True)
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+"
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    amount = models.PositiveIntegerField()
+    date = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'transactions_ledgerentry'
+        verbose_name = "Ledger Entry"
+        verbose_name_plural = "Ledger Entries"
+
+    def __str__(self) -> str:
+        return f"{self.owner_id} {self.kind}: {self.amount}"
@@ -0,0 +1,45 @@
+from django.db import models
+from django.contrib.auth.models import User
+
+
+class MonthSnapshot(models.Model):
+    """
+    Frozen summary data for a user's closed (past) month.
+
+    Stores the raw, unformatted output of the monthly, weekly and
+    calendar summaries with amounts in pence, so currency changes do
+    not invalidate it. The snapshot records the month's data version
+    when it was taken and is only served while that version is
+    current; editing a historical row bumps the version and re-opens
+    the month until it is frozen again.
+    """
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="month_snapshots"
+    )
+    month = models.DateField(
+        help_text="First day of the closed month."
+    )
+    version = models.UUIDField(
+        null=True,
+        blank=True,
+        help_text="Month data version the snapshot was taken at."
+    )
+    monthly = models.JSONField(
+        help_text="Raw monthly summary totals in pence."
+    )
+    weekly = models.JSONField(
+        help_text="Raw weekly summaries in pence."
+    )
+    calendar = models.JSONField(
+        help_text="Raw daily summaries in pence."
+    )
+    frozen_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('owner', 'month')
+        verbose_name = "Month Snapshot"
+
+    def __str__(self) -> str:
+        return f"{self.owner_id} {self.month:%Y-%m} snapshot"
@@ -0,0 +1,33 @@
+import uuid
+from django.db import models
+from django.contrib.auth.models import User
+
+
+class MonthDataVersion(models.Model):
+    """
+    Tracks a version token per user and month. The token is replaced
+    whenever the user's income, expenditure, disposable spending or
+    budget for that month is written, so responses for the month can be
+    validated (ETag) or cached without re-reading the underlying rows.
+
+    Months that have never been written have no row.
+    """
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="month_data_versions"
+    )
+    month = models.DateField(
+        help_text="First day of the month this version applies to."
+    )
+    version = models.UUIDField(
+        default=uuid.uuid4,
+        help_text="Replaced on every write to the month's data."
+    )
+
+    class Meta:
+        unique_together = ('owner', 'month')
+        verbose_name = "Month Data Version"
+
+    def __str__(self) -> str:
+        return f"{self.owner_id} {self.month:%Y-%m}: {self.version}"
@@ -0,0 +1,236 @@
+"""
+Helpers for storing transaction tables as PostgreSQL range partitions,
+one partition per calendar month of `date`.
+
+Every list and summary query is scoped to a month, so PostgreSQL prunes
+scans to a single partition, and expired months can be removed with
+DETACH/DROP PARTITION instead of row deletes.
+
+Each partitioned table also has a DEFAULT partition that catches rows
+outside the monthly partitions created so far. Other database backends
+are left unpartitioned and every helper here is a no-op for them.
+"""
+from datetime import date, datetime, timezone
+from dateutil.relativedelta import relativedelta
+
+
+# Tables stored as monthly range partitions on PostgreSQL
+PARTITIONED_TABLES = [
+    'transactions_income',
+    'transactions_expenditure',
+    'transactions_disposableincomespending',
+]
+
+
+def is_supported(connection) -> bool:
+    """
+    Returns True if the database backend supports declarative
+    partitioning.
+    """
+    return connection.vendor == 'postgresql'
+
+
+def partition_name(table: str, month: date) -> str:
+    """
+    Returns the partition table name for a month.
+    Example: transactions_income_p2025_06
+    """
+    return f"{table}_p{month:%Y_%m}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def month_bounds(month: date) -> tuple[datetime, datetime]:
+    """
+    Returns the UTC (start, exclusive end) datetimes of a month.
+    """
+    start = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+    return start, start + relativedelta(months=1)
+
+
+def is_partitioned(cursor, table: str) -> bool:
+    cursor.execute(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+        [table]
+    )
+    return cursor.fetchone() is not None
+
+
+def list_month_partitions(cursor, table: str) -> list[date]:
+    """
+    Returns the months (first day) that have a partition attached to
+    the table, oldest first. The DEFAULT partition is not included.
+    """
+    cursor.execute(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = %s AND pg_table_is_visible(p.oid)",
+        [table]
+    )
+    prefix = f"{table}_p"
+    months = []
+    for (name,) in cursor.fetchall():
+        if name.startswith(prefix):
+            months.append(
+                datetime.strptime(name[len(prefix):], "%Y_%m").date())
+    return sorted(months)
+
+
+def create_month_partition(cursor, table: str, month: date) -> bool:
+    """
+    Creates the partition for a month if it does not exist.
+
+    Rows for that month already sitting in the DEFAULT partition are
+    moved into the new partition, since PostgreSQL refuses to create a
+    partition whose range overlaps rows in the default. Must be called
+    inside a transaction.
+
+    Returns:
+        bool: True if a partition was created.
+    """
+    if month in list_month_partitions(cursor, table):
+        return False
+
+    name = partition_name(table, month)
+    default = default_partition_name(table)
+    start, end = month_bounds(month)
+
+    cursor.execute(
+        f'CREATE TEMP TABLE "{name}_moved" (LIKE "{table}")')
+    cursor.execute(
+        f'WITH moved AS (DELETE FROM "{default}" '
+        f'WHERE "date" >= %s AND "date" < %s RETURNING *) '
+        f'INSERT INTO "{name}_moved" SELECT * FROM moved',
+        [start, end]
+    )
+    cursor.execute(
+        f'CREATE TABLE "{name}" PARTITION OF "{table}" '
+        f'FOR VALUES FROM (%s) TO (%s)',
+        [start, end]
+    )
+    cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{name}_moved"')
+    cursor.execute(f'DROP TABLE "{name}_moved"')
+    return True
+
+
+def drop_month_partition(cursor, table: str, month: date) -> None:
+    """
+    Detaches and drops the partition for a month, discarding its rows.
+    """
+    name = partition_name(table, month)
+    cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+    cursor.execute(f'DROP TABLE "{name}"')
+
+
+def partition_table(cursor, table: str) -> None:
+    """
+    Rebuilds an existing table as a table partitioned by month of
+    `date`, with monthly partitions for every month holding data and
+    a DEFAULT partition.
+    """
+    cursor.execute(
+        f'SELECT DISTINCT date_trunc(\'month\', "date" AT TIME ZONE \'UTC\') '
+        f'FROM "{table}"'
+    )
+    months = sorted(row[0].date() for row in cursor.fetchall())
+
+    def create_partitions():
+        cursor.execute(
+            f'CREATE TABLE "{default_partition_name(table)}" '
+            f'PARTITION OF "{table}" DEFAULT'
+        )
+        for month in months:
+            create_month_partition(cursor, table, month)
+
+    _rebuild_table(
+        cursor, table,
+        partition_clause='PARTITION BY RANGE ("date")',
+        primary_key='("id", "date")',
+        after_create=create_partitions,
+    )
+
+
+def unpartition_table(cursor, table: str) -> None:
+    """
+    Rebuilds a partitioned table as a plain table with all its rows.
+    """
+    _rebuild_table(
+        cursor, table,
+        partition_clause='',
+        primary_key='("id")',
+    )
+
+
+def _rebuild_table(cursor, table: str, partition_clause: str,
+                   primary_key: str, after_create=None) -> None:
+    """
+    Recreates a table with the same columns, indexes and constraints,
+    copies its rows across and drops the original.
+
+    Partitioned tables need the partition key in their primary key and
+    unique constraints, so the primary key is replaced and other
+    constraints are re-added under their original names.
+    """
+    old = f"{table}_old"
+
+    # Capture index and constraint definitions under the original name
+    cursor.execute(
+        "SELECT con.conname, con.contype, pg_get_constraintdef(con.oid) "
+        "FROM pg_constraint con JOIN pg_class c ON c.oid = con.conrelid "
+        "WHERE c.relname = %s AND pg_table_is_visible(c.oid) "
+        "AND con.contype IN ('p', 'u', 'f') "
+        "ORDER BY con.contype",
+        [table]
+    )
+    constraints = cursor.fetchall()
+    constraint_names = {name for name, _, _ in constraints}
+
+    cursor.execute(
+        "SELECT indexname, indexdef FROM pg_indexes "
+        "WHERE tablename = %s AND schemaname = current_schema()",
+        [table]
+    )
+    indexes = [
+        indexdef for name, indexdef in cursor.fetchall()
+        if name not in constraint_names
+    ]
+
+    cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{old}"')
+    cursor.execute(
+        f'CREATE TABLE "{table}" (LIKE "{old}" '
+        f'INCLUDING ALL EXCLUDING INDEXES EXCLUDING IDENTITY) '
+        f'{partition_clause}'
+    )
+    if after_create:
+        after_create()
+
+    cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{old}"')
+    cursor.execute(f'DROP TABLE "{old}" CASCADE')
+
+    # Identity columns on partitioned tables need PostgreSQL 17+, so ids
+    # come from an owned sequence instead, started past the copied ids
+    sequence = f"{table}_id_seq"
+    cursor.execute(
+        f'CREATE SEQUENCE "{sequence}" OWNED BY "{table}"."id"')
+    cursor.execute(
+        f'ALTER TABLE "{table}" ALTER COLUMN "id" '
+        f'SET DEFAULT nextval(\'"{sequence}"\')'
+    )
+    cursor.execute(
+        f'SELECT setval(%s, COALESCE((SELECT MAX("id") FROM "{table}"), 0) '
+        f'+ 1, false)',
+        [f'"{sequence}"']
+    )
+
+    for name, contype, definition in constraints:
+        if contype == 'p':
+            definition = f'PRIMARY KEY {primary_key}'
+        cursor.execute(
+            f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+    for indexdef in indexes:
+        cursor.execute(indexdef)
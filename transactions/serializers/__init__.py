@@ -4,3 +4,4 @@ from .disposable import (
 )
 from .currency import CurrencySerializer
 from .income import IncomeSerializer
+from .archive import ArchivedTransactionSerializer
@@ -0,0 +1,42 @@
+from rest_framework import serializers
+from ..models.archive import ArchivedTransaction
+from core.utils.currency import get_user_currency_symbol
+
+
+class ArchivedTransactionSerializer(serializers.ModelSerializer):
+    """
+    Read-only serializer for a user's archived financial records.
+    Returns formatted amounts with the user's currency symbol.
+    """
+    kind_display = serializers.SerializerMethodField()
+    formatted_amount = serializers.SerializerMethodField()
+    readable_date = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedTransaction
+        fields = [
+            'id', 'kind', 'kind_display', 'title', 'formatted_amount',
+            'type', 'date', 'readable_date',
+        ]
+        read_only_fields = fields
+
+    def get_kind_display(self, obj) -> str:
+        """
+        Returns the human-readable label for the record's source model.
+        """
+        return obj.get_kind_display()
+
+    def get_formatted_amount(self, obj) -> str:
+        """
+        Returns the amount formatted as a string with currency symbol.
+        Example: £23.00
+        """
+        symbol = get_user_currency_symbol(self.context.get('request'))
+        return f"{symbol}{obj.amount / 100:.2f}"
+
+    def get_readable_date(self, obj) -> str:
+        """
+        Returns the date in a human-readable format.
+        Example: "April 12, 2025"
+        """
+        return obj.date.strftime('%B %d, %Y')
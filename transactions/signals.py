@@ -0,0 +1,25 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from core.utils.data_version import bump_data_versions, get_instance_months
+from .models import (
+    Income,
+    Expenditure,
+    DisposableIncomeSpending,
+    DisposableIncomeBudget,
+)
+
+
+@receiver(post_save, sender=Income)
+@receiver(post_save, sender=Expenditure)
+@receiver(post_save, sender=DisposableIncomeSpending)
+@receiver(post_save, sender=DisposableIncomeBudget)
+def bump_month_data_version(sender, instance, **kwargs) -> None:
+    """
+    Signal receiver that bumps the data version of the month a saved
+    entry or budget falls in.
+
+    Deletes, bulk_create and queryset update() do not send post_save,
+    so those paths bump versions explicitly. No post_delete receiver is
+    registered, which keeps queryset deletes as fast deletes.
+    """
+    bump_data_versions(get_instance_months([instance]))
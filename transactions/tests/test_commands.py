@@ -0,0 +1,321 @@
+from io import StringIO
+from unittest import skipIf, skipUnless
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.contrib.auth.models import User
+from django.utils.timezone import now
+from rest_framework.test import APIClient
+from datetime import timedelta
+from dateutil.relativedelta import relativedelta
+from transactions import partitions
+from core.models import UserProfile
+from transactions.models import (
+    Income,
+    Expenditure,
+    DisposableIncomeSpending,
+    DisposableIncomeBudget,
+    ArchivedTransaction,
+    MonthSnapshot,
+    Currency,
+)
+
+
+class PurgeOldTransactionsCommandTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+        self.other_user = User.objects.create_user(
+            username='other', password='pass')
+        self.old_date = now() - relativedelta(months=8)
+        self.recent_date = now()
+
+    def _create_entries(self, user, date, count=1):
+        for i in range(count):
+            Income.objects.create(
+                owner=user, title=f'Income {i}', amount=1000, date=date)
+            Expenditure.objects.create(
+                owner=user, title=f'Bill {i}', amount=500, date=date)
+            DisposableIncomeSpending.objects.create(
+                owner=user, title=f'Coffee {i}', amount=300, date=date)
+
+    def _run(self, *args) -> str:
+        out = StringIO()
+        call_command('purge_old_transactions', *args, stdout=out)
+        return out.getvalue()
+
+    def test_deletes_old_records_for_all_users(self):
+        """Should delete old records of every user, not just one."""
+        self._create_entries(self.user, self.old_date)
+        self._create_entries(self.other_user, self.old_date)
+        DisposableIncomeBudget.objects.create(
+            owner=self.other_user, amount=1000, date=self.old_date)
+
+        self._run()
+
+        self.assertFalse(Income.objects.exists())
+        self.assertFalse(Expenditure.objects.exists())
+        self.assertFalse(DisposableIncomeSpending.objects.exists())
+        self.assertFalse(DisposableIncomeBudget.objects.exists())
+
+    def test_keeps_records_inside_visible_window(self):
+        """Should leave records within the last six months untouched."""
+        self._create_entries(self.user, self.recent_date)
+        self._create_entries(self.user, self.old_date)
+
+        self._run()
+
+        self.assertEqual(Income.objects.count(), 1)
+        self.assertEqual(Expenditure.objects.count(), 1)
+        self.assertEqual(DisposableIncomeSpending.objects.count(), 1)
+
+    def test_deletes_across_multiple_batches(self):
+        """Should delete every old row when it spans several batches."""
+        self._create_entries(self.user, self.old_date, count=5)
+
+        output = self._run('--batch-size', '2')
+
+        self.assertFalse(Income.objects.exists())
+        self.assertIn('Income: 5 rows deleted', output)
+
+    def test_dry_run_reports_without_deleting(self):
+        """Should report counts per model but delete nothing."""
+        self._create_entries(self.user, self.old_date, count=3)
+
+        output = self._run('--dry-run')
+
+        self.assertEqual(Income.objects.count(), 3)
+        self.assertIn('Income: 3 rows would be deleted', output)
+        self.assertIn('Total: 9 rows would be deleted', output)
+
+    def test_rejects_invalid_batch_size(self):
+        """Should raise CommandError for a batch size below 1."""
+        with self.assertRaises(CommandError):
+            self._run('--batch-size', '0')
+
+    @override_settings(ARCHIVE_OLD_TRANSACTIONS=True)
+    def test_archives_each_batch_when_enabled(self):
+        """Should move every old row into the archive across batches."""
+        self._create_entries(self.user, self.old_date, count=3)
+
+        self._run('--batch-size', '2')
+
+        self.assertFalse(Income.objects.exists())
+        self.assertEqual(
+            ArchivedTransaction.objects.filter(kind='INCOME').count(), 3)
+        self.assertEqual(ArchivedTransaction.objects.count(), 9)
+
+
+class ManagePartitionsCommandTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+
+    def _run(self, *args) -> str:
+        out = StringIO()
+        call_command('manage_partitions', *args, stdout=out)
+        return out.getvalue()
+
+    def _months(self, table='transactions_income') -> list:
+        with connection.cursor() as cursor:
+            return partitions.list_month_partitions(cursor, table)
+
+    @skipIf(connection.vendor == 'postgresql', "PostgreSQL partitions")
+    def test_does_nothing_without_postgresql(self):
+        """Should exit cleanly on backends without partitioning."""
+        output = self._run('--drop-expired')
+        self.assertIn('requires PostgreSQL', output)
+
+    @skipUnless(connection.vendor == 'postgresql', "PostgreSQL only")
+    def test_creates_partitions_through_months_ahead(self):
+        """Should create a partition for every month from the start of
+        the visible window to the requested horizon."""
+        self._run('--months-ahead', '6')
+
+        current_month = now().date().replace(day=1)
+        months = self._months()
+        self.assertIn(current_month, months)
+        self.assertIn(current_month + relativedelta(months=6), months)
+        self.assertNotIn(current_month + relativedelta(months=7), months)
+
+    @skipUnless(connection.vendor == 'postgresql', "PostgreSQL only")
+    def test_moves_default_rows_into_new_partition(self):
+        """Should keep rows that landed in the DEFAULT partition when
+        their month's partition is created."""
+        entry = Income.objects.create(
+            owner=self.user, title='Early', amount=100,
+            date=now() + relativedelta(months=3))
+
+        self._run()
+
+        self.assertTrue(Income.objects.filter(pk=entry.pk).exists())
+
+    @skipUnless(connection.vendor == 'postgresql', "PostgreSQL only")
+    def test_drop_expired_removes_old_partitions(self):
+        """Should drop partitions and rows for months before the
+        visible window, leaving current ones."""
+        old_month = (now() - relativedelta(months=8)).date().replace(day=1)
+        with connection.cursor() as cursor:
+            partitions.create_month_partition(
+                cursor, 'transactions_income', old_month)
+        Income.objects.create(
+            owner=self.user, title='Old', amount=100,
+            date=now() - relativedelta(months=8))
+        Income.objects.create(
+            owner=self.user, title='New', amount=100, date=now())
+        # Fire the deferred FK checks so the partition can be dropped
+        # inside the test transaction
+        with connection.cursor() as cursor:
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+        self._run('--drop-expired')
+
+        self.assertNotIn(old_month, self._months())
+        self.assertEqual(
+            list(Income.objects.values_list('title', flat=True)), ['New'])
+
+    @skipUnless(connection.vendor == 'postgresql', "PostgreSQL only")
+    def test_dry_run_creates_nothing(self):
+        """Should report partitions without creating them."""
+        before = self._months()
+        output = self._run('--dry-run')
+
+        self.assertIn('Created', output)
+        self.assertEqual(self._months(), before)
+
+
+class CloseMonthsCommandTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+        self.other_user = User.objects.create_user(
+            username='other', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.last_month = now() - relativedelta(months=1)
+        self.month_param = {'month': self.last_month.strftime('%Y-%m')}
+        self.entry = Income.objects.create(
+            owner=self.user, title='Salary', amount=10000,
+            date=self.last_month)
+
+    def _run(self, *args) -> str:
+        out = StringIO()
+        call_command('close_months', *args, stdout=out)
+        return out.getvalue()
+
+    def test_freezes_closed_months_for_users_with_data(self):
+        """Should snapshot closed months only for users with data."""
+        self._run()
+
+        snapshot = MonthSnapshot.objects.get()
+        self.assertEqual(snapshot.owner, self.user)
+        self.assertEqual(snapshot.monthly['income'], 10000)
+        self.assertEqual(len(snapshot.calendar), len(set(
+            day['date'] for day in snapshot.calendar)))
+
+    def test_summaries_served_from_snapshot(self):
+        """Should serve a closed month from its snapshot without
+        aggregating the ledger."""
+        self._run()
+        MonthSnapshot.objects.update(monthly={
+            **MonthSnapshot.objects.get().monthly, 'income': 12345})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/monthly-summary/', self.month_param)
+
+        self.assertEqual(response.data['formatted_income'], '£123.45')
+        self.assertFalse(any(
+            'transactions_ledgerentry' in query['sql']
+            for query in queries.captured_queries))
+
+    def test_editing_historical_row_reopens_month(self):
+        """Should ignore a snapshot once a row in its month changes and
+        refreeze it on the next run."""
+        self._run()
+        self.entry.amount = 20000
+        self.entry.save()
+
+        response = self.client.get('/monthly-summary/', self.month_param)
+        self.assertEqual(response.data['formatted_income'], '£200.00')
+
+        output = self._run('--month', self.month_param['month'])
+        self.assertIn('1 snapshots frozen', output)
+        self.assertEqual(
+            MonthSnapshot.objects.get().monthly['income'], 20000)
+
+    def test_skips_current_snapshots(self):
+        """Should not rebuild snapshots that are already current."""
+        self._run()
+        output = self._run('--month', self.month_param['month'])
+        self.assertIn('Total: 0 snapshots frozen', output)
+
+    def test_rejects_open_month(self):
+        """Should refuse to close the current month."""
+        with self.assertRaises(CommandError):
+            self._run('--month', now().strftime('%Y-%m'))
+
+
+class SeedFinanceDataCommandTests(TestCase):
+    def _run(self, *args) -> str:
+        out = StringIO()
+        call_command('seed_finance_data', *args, stdout=out)
+        return out.getvalue()
+
+    def _entries(self, username: str) -> list:
+        return [
+            list(model.objects.filter(owner__username=username)
+                 .order_by('date', 'title', 'amount')
+                 .values_list('title', 'amount', 'date'))
+            for model in (Income, Expenditure, DisposableIncomeSpending)
+        ]
+
+    def test_creates_users_with_recurring_data(self):
+        """Should give each user a profile, currency, monthly budgets,
+        5-50 recurring series and daily spending."""
+        output = self._run('--users', '3', '--months', '2')
+
+        self.assertEqual(
+            User.objects.filter(username__startswith='seed').count(), 3)
+        self.assertEqual(Currency.objects.count(), 3)
+        self.assertEqual(DisposableIncomeBudget.objects.count(), 6)
+        self.assertFalse(UserProfile.objects.exclude(
+            last_repeat_check=now().date().replace(day=1)).exists())
+
+        for user in User.objects.all():
+            groups = set(Income.objects.filter(owner=user).values_list(
+                'repeat_group_id', flat=True))
+            groups |= set(Expenditure.objects.filter(
+                owner=user).values_list('repeat_group_id', flat=True))
+            self.assertTrue(5 <= len(groups) <= 50)
+        self.assertTrue(DisposableIncomeSpending.objects.exists())
+        self.assertIn('Total:', output)
+
+    def test_weekly_series_repeat_every_seven_days(self):
+        """Should space weekly repeats by exactly a week."""
+        self._run('--users', '2', '--months', '1')
+
+        entry = Expenditure.objects.filter(repeated='WEEKLY').first() or \
+            Income.objects.filter(repeated='WEEKLY').first()
+        dates = list(type(entry).objects.filter(
+            repeat_group_id=entry.repeat_group_id)
+            .order_by('date').values_list('date', flat=True))
+        self.assertTrue(all(
+            later - earlier == timedelta(days=7)
+            for earlier, later in zip(dates, dates[1:])))
+
+    def test_same_seed_generates_same_data(self):
+        """Should generate identical data for the same seed."""
+        self._run('--users', '1', '--seed', '3', '--prefix', 'a')
+        self._run('--users', '1', '--seed', '3', '--prefix', 'b')
+
+        self.assertEqual(self._entries('a0'), self._entries('b0'))
+
+    def test_rejects_existing_prefix(self):
+        """Should refuse to create users whose names already exist."""
+        self._run('--users', '1')
+        with self.assertRaises(CommandError):
+            self._run('--users', '1')
@@ -0,0 +1,53 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.utils.timezone import now
+from transactions.models import (
+    Income,
+    Expenditure,
+    DisposableIncomeSpending,
+    LedgerEntry,
+)
+
+
+class LedgerEntryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+        self.today = now()
+
+    def test_exposes_rows_from_all_source_tables(self):
+        """Should list income, expenditure and disposable spending rows
+        with a kind derived from their table and expenditure type."""
+        Income.objects.create(
+            owner=self.user, title='Salary', amount=100000, date=self.today)
+        Expenditure.objects.create(
+            owner=self.user, title='Rent', amount=50000,
+            type='BILL', date=self.today)
+        Expenditure.objects.create(
+            owner=self.user, title='ISA', amount=20000,
+            type='SAVING', date=self.today)
+        Expenditure.objects.create(
+            owner=self.user, title='Shares', amount=10000,
+            type='INVESTMENT', date=self.today)
+        DisposableIncomeSpending.objects.create(
+            owner=self.user, title='Coffee', amount=300, date=self.today)
+
+        entries = dict(
+            LedgerEntry.objects.filter(
+                owner=self.user).values_list('kind', 'amount'))
+
+        self.assertEqual(entries, {
+            'income': 100000,
+            'bill': 50000,
+            'saving': 20000,
+            'investment': 10000,
+            'disposable': 300,
+        })
+
+    def test_reflects_changes_to_source_rows(self):
+        """Should read through to the source tables with no copy step."""
+        entry = Income.objects.create(
+            owner=self.user, title='Salary', amount=100000, date=self.today)
+        entry.delete()
+
+        self.assertFalse(LedgerEntry.objects.filter(owner=self.user).exists())
@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth.models import User
 from django.utils.timezone import make_aware, now
 from datetime import datetime, timedelta
@@ -9,13 +9,17 @@ from transactions.models import (
     Expenditure,
     DisposableIncomeSpending,
     DisposableIncomeBudget,
+    ArchivedTransaction,
 )
 from transactions.utils import (
     generate_weekly_repeats_for_6_months,
     generate_monthly_repeats_for_6_months,
     generate_6th_month_repeats,
-    clean_old_transactions
+    get_repeat_dates,
+    clean_old_transactions,
+    purge_transactions
   )
+from core.utils import metrics
 import uuid
 
 
@@ -33,6 +37,23 @@ class GenerateWeeklyRepeatsTests(TestCase):
             repeat_group_id=None
         )
 
+    def test_records_repeat_metrics(self):
+        """Should count the run and the entries it requested."""
+        runs = metrics.repeat_generations.get(generator='weekly')
+        requested = metrics.repeat_entries_requested.get(
+            generator='weekly', model='Income')
+
+        generate_weekly_repeats_for_6_months(self.entry, Income)
+
+        self.assertEqual(
+            metrics.repeat_generations.get(generator='weekly'), runs + 1)
+        self.assertEqual(
+            metrics.repeat_entries_requested.get(
+                generator='weekly', model='Income'),
+            requested + Income.objects.filter(
+                repeat_group_id=self.entry.repeat_group_id
+            ).exclude(pk=self.entry.pk).count())
+
     def test_generates_repeats_up_to_end_of_6th_month(self):
         """Should generate entries weekly until
         the last day of the 6th month."""
@@ -120,6 +141,38 @@ class GenerateWeeklyRepeatsTests(TestCase):
         self.entry.refresh_from_db()
         self.assertEqual(self.entry.repeat_group_id, manual_id)
 
+    def test_rerun_does_not_duplicate_repeats(self):
+        """Should skip dates already present in the repeat group
+        instead of inserting duplicate rows."""
+        generate_weekly_repeats_for_6_months(self.entry, Income)
+        first_count = Income.objects.filter(
+            repeat_group_id=self.entry.repeat_group_id).count()
+
+        generate_weekly_repeats_for_6_months(self.entry, Income)
+        second_count = Income.objects.filter(
+            repeat_group_id=self.entry.repeat_group_id).count()
+
+        self.assertEqual(first_count, second_count)
+
+
+class GetRepeatDatesTests(TestCase):
+    def test_repeats_until_given_date(self):
+        """Should extend repeats past 5 months when given a later
+        end date, clamping monthly days to shorter months."""
+        base_date = make_aware(datetime(2025, 1, 31))
+        until = make_aware(datetime(2025, 12, 31))
+
+        dates = get_repeat_dates(base_date, 'MONTHLY', until)
+
+        self.assertEqual(len(dates), 11)
+        self.assertEqual(dates[0].day, 28)
+        self.assertEqual(dates[-1], until)
+
+    def test_never_has_no_repeats(self):
+        """Should return no dates for one-off entries."""
+        self.assertEqual(
+            get_repeat_dates(make_aware(datetime(2025, 1, 1)), 'NEVER'), [])
+
 
 class GenerateMonthlyRepeatsTests(TestCase):
     def setUp(self):
@@ -457,3 +510,67 @@ class CleanOldTransactionsTests(TestCase):
             entries = model.objects.filter(owner=self.user)
             self.assertEqual(entries.count(), 1)
             self.assertTrue(entries.first().date >= self.cutoff)
+
+    def test_does_not_archive_by_default(self):
+        """Should delete old entries permanently when archiving is off."""
+        self._create_entry(Income, self.user, self.cutoff - timedelta(days=1))
+
+        clean_old_transactions(self.user)
+
+        self.assertFalse(ArchivedTransaction.objects.exists())
+
+    @override_settings(ARCHIVE_OLD_TRANSACTIONS=True)
+    def test_archives_old_entries_when_enabled(self):
+        """Should move old entries of every model into the archive."""
+        for model in self.models:
+            self._create_entry(
+                model, self.user, self.cutoff - timedelta(days=1))
+
+        clean_old_transactions(self.user)
+
+        for model in self.models:
+            self.assertEqual(model.objects.filter(owner=self.user).count(), 0)
+        self.assertEqual(
+            set(ArchivedTransaction.objects.filter(
+                owner=self.user).values_list('kind', flat=True)),
+            {'INCOME', 'EXPENDITURE', 'DISPOSABLE_SPENDING',
+             'DISPOSABLE_BUDGET'}
+        )
+
+
+class PurgeTransactionsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="tester", password="pass")
+        self.date = make_aware(datetime(2024, 1, 10))
+
+    def test_archive_copies_fields_and_deletes_source(self):
+        """Should copy each record into the archive before deleting it."""
+        entry = Expenditure.objects.create(
+            owner=self.user, title="Rent", amount=50000,
+            type="BILL", date=self.date)
+
+        count = purge_transactions(
+            Expenditure.objects.filter(pk=entry.pk), archive=True)
+
+        self.assertEqual(count, 1)
+        self.assertFalse(Expenditure.objects.exists())
+        archived = ArchivedTransaction.objects.get()
+        self.assertEqual(archived.kind, 'EXPENDITURE')
+        self.assertEqual(archived.source_id, entry.pk)
+        self.assertEqual(archived.title, "Rent")
+        self.assertEqual(archived.amount, 50000)
+        self.assertEqual(archived.type, "BILL")
+        self.assertEqual(archived.date, self.date)
+
+    def test_budget_archived_without_title_or_type(self):
+        """Should archive budgets with blank title and type."""
+        DisposableIncomeBudget.objects.create(
+            owner=self.user, amount=20000, date=self.date)
+
+        purge_transactions(DisposableIncomeBudget.objects.all(), archive=True)
+
+        archived = ArchivedTransaction.objects.get()
+        self.assertEqual(archived.kind, 'DISPOSABLE_BUDGET')
+        self.assertEqual(archived.title, '')
+        self.assertEqual(archived.type, '')
@@ -1,6 +1,12 @@
 import uuid
-from django.test import TestCase
-from rest_framework.test import APIClient
+from django.core.cache import cache
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import (
+    APIClient,
+    APIRequestFactory,
+    force_authenticate,
+)
 from django.contrib.auth.models import User
 from django.utils.timezone import now, make_aware
 from transactions.models import (
@@ -9,13 +15,24 @@ from transactions.models import (
     DisposableIncomeSpending,
     Currency,
     DisposableIncomeBudget,
+    ArchivedTransaction,
   )
+from transactions.views import (
+    MonthlySummaryView,
+    WeeklySummaryView,
+    CalendarSummaryView,
+    AsyncMonthlySummaryView,
+    AsyncWeeklySummaryView,
+    AsyncCalendarSummaryView,
+    ExpenditureViewSet,
+)
 from datetime import timedelta, datetime
 from urllib.parse import urlencode
 from dateutil.relativedelta import relativedelta
 from rest_framework import status
 from django.urls import reverse
 from rest_framework.exceptions import MethodNotAllowed
+from unittest.mock import patch
 
 
 class CalendarSummaryViewTests(TestCase):
@@ -479,6 +496,77 @@ class ExpenditureViewSetTests(TestCase):
         self.assertEqual(future.title, 'New Title')
         self.assertEqual(future.amount, 5000)
 
+    def test_moving_repeated_entry_onto_sibling_date(self):
+        """Should regenerate the chain when moved onto a sibling's date."""
+        group_id = uuid.uuid4()
+        initial = Expenditure.objects.create(
+            owner=self.user, title='Sub', amount=1000, type='BILL',
+            date=self.today, repeated='WEEKLY', repeat_group_id=group_id
+        )
+        Expenditure.objects.create(
+            owner=self.user, title='Sub', amount=1000, type='BILL',
+            date=self.today + timedelta(days=7), repeated='WEEKLY',
+            repeat_group_id=group_id
+        )
+        response = self.client.put(f'{self.url}{initial.pk}/', {
+            'title': 'Moved',
+            'amount': 10.00,
+            'type': 'BILL',
+            'date': (self.today + timedelta(days=7)).date(),
+            'repeated': 'WEEKLY'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(Expenditure.objects.filter(
+            repeat_group_id=group_id).exists())
+        moved = Expenditure.objects.filter(
+            owner=self.user, date=self.today + timedelta(days=7))
+        self.assertEqual(moved.count(), 1)
+        self.assertEqual(moved.get().title, 'Moved')
+
+    def _create_weekly_pair(self):
+        group_id = uuid.uuid4()
+        first, second = (
+            Expenditure.objects.create(
+                owner=self.user, title='Sub', amount=1000, type='BILL',
+                date=self.today + timedelta(days=days), repeated='WEEKLY',
+                repeat_group_id=group_id)
+            for days in [0, 7]
+        )
+        return first, second
+
+    def test_leaving_series_onto_sibling_date(self):
+        """Should save an entry made one-off onto a sibling's date."""
+        first, second = self._create_weekly_pair()
+        response = self.client.put(f'{self.url}{first.pk}/', {
+            'title': 'One-off',
+            'amount': 10.00,
+            'type': 'BILL',
+            'date': second.date.date(),
+            'repeated': 'NEVER'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first.refresh_from_db()
+        self.assertEqual(first.date, second.date)
+        self.assertNotEqual(first.repeat_group_id, second.repeat_group_id)
+
+    def test_date_taken_in_series_returns_400(self):
+        """Should reject, not crash on, a clash with the unique series
+        date, e.g. from a concurrent edit of the series."""
+        first, second = self._create_weekly_pair()
+        with patch('transactions.views.expenditure.uuid.uuid4',
+                   return_value=second.repeat_group_id):
+            response = self.client.put(f'{self.url}{first.pk}/', {
+                'title': 'One-off',
+                'amount': 10.00,
+                'type': 'BILL',
+                'date': second.date.date(),
+                'repeated': 'NEVER'
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('date', response.data)
+        first.refresh_from_db()
+        self.assertEqual(first.title, 'Sub')
+
     def test_delete_repeated_entry_removes_future_instances(self):
         """Should delete the current and future entries in the repeat group."""
         group_id = uuid.uuid4()
@@ -812,6 +900,81 @@ class IncomeViewSetTests(TestCase):
         self.assertTrue(Income.objects.filter(
             repeat_group_id=group_id).count() > 1)
 
+    def test_idempotency_key_replays_original_response(self):
+        """Should create a repeated income once and replay the stored
+        response when the same Idempotency-Key is retried."""
+        data = {
+            'title': 'Weekly Pay',
+            'amount': 100.00,
+            'repeated': 'WEEKLY',
+            'date': self.today_date
+        }
+        first = self.client.post(
+            self.url, data, format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+        count = Income.objects.filter(owner=self.user).count()
+
+        second = self.client.post(
+            self.url, data, format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(
+            Income.objects.filter(owner=self.user).count(), count)
+
+    def test_idempotency_key_reused_with_other_data_rejected(self):
+        """Should return 422 when a key is retried with different data,
+        without creating anything."""
+        data = {
+            'title': 'Salary',
+            'amount': 150.00,
+            'date': self.today_date,
+            'repeated': 'NEVER'
+        }
+        self.client.post(
+            self.url, data, format='json', HTTP_IDEMPOTENCY_KEY='reused')
+
+        data['amount'] = 200.00
+        response = self.client.post(
+            self.url, data, format='json', HTTP_IDEMPOTENCY_KEY='reused')
+
+        self.assertEqual(
+            response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(
+            Income.objects.filter(owner=self.user).count(), 1)
+
+    def test_idempotency_key_is_scoped_to_user(self):
+        """Should not replay another user's response for the same key."""
+        data = {
+            'title': 'Salary',
+            'amount': 150.00,
+            'date': self.today_date,
+            'repeated': 'NEVER'
+        }
+        self.client.post(
+            self.url, data, format='json', HTTP_IDEMPOTENCY_KEY='shared')
+
+        self.client.force_authenticate(self.other_user)
+        response = self.client.post(
+            self.url, data, format='json', HTTP_IDEMPOTENCY_KEY='shared')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Income.objects.filter(
+            owner=self.other_user, title='Salary').exists())
+
+    def test_failed_create_does_not_store_idempotency_key(self):
+        """Should allow a corrected retry after a rejected request
+        with the same Idempotency-Key."""
+        data = {'title': '', 'amount': 150.00, 'date': self.today_date}
+        response = self.client.post(
+            self.url, data, format='json', HTTP_IDEMPOTENCY_KEY='fix-me')
+        self.assertEqual(response.status_code, 400)
+
+        data['title'] = 'Salary'
+        response = self.client.post(
+            self.url, data, format='json', HTTP_IDEMPOTENCY_KEY='fix-me')
+        self.assertEqual(response.status_code, 201)
+
     def test_group_update_changes_repeat_group_id(self):
         """Should assign new group ID on update of repeated entry."""
         group_id = uuid.uuid4()
@@ -829,6 +992,56 @@ class IncomeViewSetTests(TestCase):
         entry.refresh_from_db()
         self.assertNotEqual(entry.repeat_group_id, group_id)
 
+    def test_moving_repeated_entry_onto_sibling_date(self):
+        """Should regenerate the chain when moved onto a sibling's date."""
+        group_id = uuid.uuid4()
+        today = self.today.replace(hour=0, minute=0, second=0, microsecond=0)
+        entry = Income.objects.create(
+            owner=self.user, title='Pay', amount=1000,
+            repeated='MONTHLY', repeat_group_id=group_id, date=today)
+        Income.objects.create(
+            owner=self.user, title='Pay', amount=1000,
+            repeated='MONTHLY', repeat_group_id=group_id,
+            date=today + relativedelta(months=1))
+
+        response = self.client.put(f"{self.url}{entry.pk}/", {
+            'title': 'Moved Pay',
+            'amount': '20.00',
+            'date': (today + relativedelta(months=1)).date(),
+            'repeated': 'MONTHLY'
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Income.objects.filter(
+            repeat_group_id=group_id).exists())
+        moved = Income.objects.filter(
+            owner=self.user, date=today + relativedelta(months=1))
+        self.assertEqual(moved.count(), 1)
+        self.assertEqual(moved.get().title, 'Moved Pay')
+
+    def test_leaving_series_onto_sibling_date(self):
+        """Should save an entry made one-off onto a sibling's date."""
+        group_id = uuid.uuid4()
+        entry, sibling = (
+            Income.objects.create(
+                owner=self.user, title='Pay', amount=1000,
+                repeated='WEEKLY', repeat_group_id=group_id,
+                date=self.today + timedelta(weeks=weeks))
+            for weeks in [0, 1]
+        )
+
+        response = self.client.put(f"{self.url}{entry.pk}/", {
+            'title': 'Bonus',
+            'amount': '20.00',
+            'date': sibling.date,
+            'repeated': 'NEVER'
+        })
+
+        self.assertEqual(response.status_code, 200)
+        entry.refresh_from_db()
+        self.assertEqual(entry.date, sibling.date)
+        self.assertNotEqual(entry.repeat_group_id, group_id)
+
     def test_accessing_nonexistent_entry_returns_403(self):
         """Should return 403 instead of leaking 404 if entry isn't owned."""
         other_user = User.objects.create_user(
@@ -1100,3 +1313,426 @@ class WeeklySummaryViewTests(TestCase):
             self.assertEqual(week["income"], "£0.00")
             self.assertEqual(week["cost"], "£0.00")
             self.assertEqual(week["summary"], "£0.00")
+
+
+class ArchivedTransactionViewSetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+        self.other_user = User.objects.create_user(
+            username='other', password='pass')
+        self.client.force_authenticate(user=self.user)
+        self.url = '/archive/'
+        self.date = make_aware(datetime(2024, 3, 15))
+
+    def _archive(self, owner, kind='INCOME', date=None):
+        return ArchivedTransaction.objects.create(
+            owner=owner, kind=kind, source_id=1, title='Old',
+            amount=1234, date=date or self.date)
+
+    def test_lists_own_archived_records_for_month(self):
+        """Should return only the user's archived records in the month."""
+        self._archive(self.user)
+        self._archive(self.user, date=self.date + relativedelta(months=1))
+        self._archive(self.other_user)
+
+        response = self.client.get(self.url, {'month': '2024-03'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['formatted_amount'], '£12.34')
+        self.assertEqual(response.data[0]['kind'], 'INCOME')
+
+    def test_filters_by_kind(self):
+        """Should return only records of the requested kind."""
+        self._archive(self.user, kind='INCOME')
+        self._archive(self.user, kind='EXPENDITURE')
+
+        response = self.client.get(
+            self.url, {'month': '2024-03', 'kind': 'expenditure'})
+
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['kind'], 'EXPENDITURE')
+
+    def test_archive_is_read_only(self):
+        """Should not allow records to be created through the API."""
+        response = self.client.post(self.url, {'title': 'New'})
+        self.assertEqual(
+            response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_requires_authentication(self):
+        """Should return 403 if user is not logged in."""
+        self.client.logout()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+        self.client.force_authenticate(user=self.user)
+        self.date = make_aware(datetime(2025, 3, 15))
+        self.params = {'month': '2025-03'}
+
+    def _etag(self, url='/monthly-summary/', params=None):
+        response = self.client.get(url, params or self.params)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def test_matching_etag_returns_not_modified(self):
+        """Should return 304 with no body when If-None-Match matches."""
+        etag = self._etag()
+
+        response = self.client.get(
+            '/monthly-summary/', self.params, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_list_endpoints_support_etags(self):
+        """Should validate ETags on month-scoped list endpoints."""
+        for url in ['/income/', '/expenditures/', '/disposable-spending/',
+                    '/weekly-summary/', '/calendar-summary/']:
+            etag = self._etag(url)
+            response = self.client.get(
+                url, self.params, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304, url)
+
+    def test_create_changes_etag(self):
+        """Should issue a new ETag after an entry is added to the month."""
+        etag = self._etag()
+
+        self.client.post('/income/', {
+            'title': 'Salary', 'amount': 1000,
+            'date': self.date.isoformat(), 'repeated': 'NEVER'})
+
+        response = self.client.get(
+            '/monthly-summary/', self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_write_to_other_month_keeps_etag(self):
+        """Should keep the ETag when only another month changes."""
+        etag = self._etag()
+
+        Income.objects.create(
+            owner=self.user, title='Later', amount=100,
+            date=self.date + relativedelta(months=1))
+
+        self.assertEqual(self._etag(), etag)
+
+    def test_group_delete_changes_later_month_etags(self):
+        """Should invalidate every month a repeat group delete touches."""
+        self.client.post('/expenditures/', {
+            'title': 'Rent', 'amount': 500, 'type': 'BILL',
+            'date': self.date.isoformat(), 'repeated': 'MONTHLY'})
+        entry = Expenditure.objects.get(date=self.date)
+        later = {'month': '2025-05'}
+        etag = self._etag('/expenditures/', later)
+
+        self.client.delete(f'/expenditures/{entry.pk}/')
+
+        self.assertNotEqual(self._etag('/expenditures/', later), etag)
+
+    def test_moving_entry_changes_original_month_etag(self):
+        """Should invalidate the month an entry was moved out of."""
+        entry = DisposableIncomeSpending.objects.create(
+            owner=self.user, title='Coffee', amount=300, date=self.date)
+        etag = self._etag()
+
+        self.client.patch(
+            f'/disposable-spending/{entry.pk}/',
+            {'date': (self.date + relativedelta(months=1)).isoformat()})
+
+        self.assertNotEqual(self._etag(), etag)
+
+    def test_budget_and_currency_changes_change_etag(self):
+        """Should invalidate on budget updates and currency changes."""
+        etag = self._etag()
+        DisposableIncomeBudget.objects.create(
+            owner=self.user, amount=1000, date=self.date.replace(day=1))
+        budget_etag = self._etag()
+
+        Currency.objects.update_or_create(
+            owner=self.user, defaults={'currency': 'USD'})
+
+        self.assertNotEqual(budget_etag, etag)
+        self.assertNotEqual(self._etag(), budget_etag)
+
+
+class SummaryResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+        self.client.force_authenticate(user=self.user)
+        self.date = make_aware(datetime(2025, 3, 15))
+        self.params = {'month': '2025-03'}
+        Income.objects.create(
+            owner=self.user, title='Salary', amount=10000, date=self.date)
+
+    def test_repeat_request_served_from_cache(self):
+        """Should answer a repeat request with only the version lookup."""
+        for url in ['/monthly-summary/', '/weekly-summary/',
+                    '/calendar-summary/']:
+            first = self.client.get(url, self.params)
+
+            with self.assertNumQueries(1):
+                second = self.client.get(url, self.params)
+
+            self.assertEqual(second.data, first.data)
+            self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_write_invalidates_cached_summary(self):
+        """Should recompute the summary after an entry changes."""
+        self.client.get('/monthly-summary/', self.params)
+
+        entry = Income.objects.get(owner=self.user)
+        self.client.delete(f'/income/{entry.pk}/')
+        self.client.post('/income/', {
+            'title': 'Bonus', 'amount': 500,
+            'date': self.date.isoformat(), 'repeated': 'NEVER'})
+
+        response = self.client.get('/monthly-summary/', self.params)
+        self.assertEqual(response.data['formatted_income'], '£500.00')
+
+    def test_currency_change_invalidates_cached_summary(self):
+        """Should reformat cached amounts with the new currency."""
+        self.client.get('/monthly-summary/', self.params)
+
+        Currency.objects.update_or_create(
+            owner=self.user, defaults={'currency': 'USD'})
+
+        response = self.client.get('/monthly-summary/', self.params)
+        self.assertEqual(response.data['formatted_income'], '$100.00')
+
+    def test_users_do_not_share_cached_responses(self):
+        """Should never serve one user's cached summary to another."""
+        self.client.get('/monthly-summary/', self.params)
+        other = User.objects.create_user(username='other', password='pass')
+        self.client.force_authenticate(user=other)
+
+        response = self.client.get('/monthly-summary/', self.params)
+
+        self.assertEqual(response.data['formatted_income'], '£0.00')
+
+
+class AsyncSummaryViewTests(TransactionTestCase):
+    """
+    The async views query from worker threads with their own database
+    connections, so test data must be committed.
+    """
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+        self.date = make_aware(datetime(2025, 3, 15))
+        Income.objects.create(
+            owner=self.user, title='Salary', amount=10000, date=self.date)
+        Expenditure.objects.create(
+            owner=self.user, title='Rent', amount=4000, type='BILL',
+            date=self.date)
+        DisposableIncomeBudget.objects.create(
+            owner=self.user, amount=2000, date=self.date.replace(day=1))
+        Currency.objects.create(owner=self.user, currency='EUR')
+
+    def _get(self, view_class, user=None, **headers):
+        request = self.factory.get(
+            '/summary/', {'month': '2025-03'}, **headers)
+        if user:
+            force_authenticate(request, user=user)
+        view = view_class.as_view()
+        if iscoroutinefunction(view):
+            view = async_to_sync(view)
+        return view(request).render()
+
+    def test_async_views_match_sync_views(self):
+        """Should return the same data as the sync summary views."""
+        pairs = [
+            (MonthlySummaryView, AsyncMonthlySummaryView),
+            (WeeklySummaryView, AsyncWeeklySummaryView),
+            (CalendarSummaryView, AsyncCalendarSummaryView),
+        ]
+        for sync_view, async_view in pairs:
+            cache.clear()
+            expected = self._get(sync_view, self.user)
+            cache.clear()
+            response = self._get(async_view, self.user)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data, expected.data)
+            self.assertEqual(response['ETag'], expected['ETag'])
+
+    def test_async_view_formats_with_user_currency(self):
+        """Should format amounts with the user's currency symbol."""
+        response = self._get(AsyncMonthlySummaryView, self.user)
+        self.assertEqual(response.data['formatted_income'], '€100.00')
+        self.assertEqual(response.data['formatted_budget'], '€20.00')
+
+    def test_async_view_honours_if_none_match(self):
+        """Should return 304 for a matching ETag."""
+        etag = self._get(AsyncWeeklySummaryView, self.user)['ETag']
+
+        response = self._get(
+            AsyncWeeklySummaryView, self.user, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_async_view_compact_format(self):
+        """Should return raw pence without looking up the symbol."""
+        request = self.factory.get(
+            '/summary/', {'month': '2025-03', 'format': 'compact'})
+        force_authenticate(request, user=self.user)
+
+        with patch('transactions.views.async_summary.'
+                   'get_user_currency_symbol') as get_symbol:
+            response = async_to_sync(AsyncMonthlySummaryView.as_view())(
+                request).render()
+
+        get_symbol.assert_not_called()
+        self.assertEqual(response.data['currency'], 'EUR')
+        self.assertEqual(response.data['income'], 10000)
+        self.assertEqual(response.data['remaining_disposable'], 2000)
+
+    def test_async_view_requires_authentication(self):
+        """Should reject unauthenticated requests."""
+        response = self._get(AsyncCalendarSummaryView)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class StreamingListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+        self.client.force_authenticate(user=self.user)
+        self.params = {'month': '2025-03'}
+        for day in range(1, 6):
+            Expenditure.objects.create(
+                owner=self.user, title=f'Bill\u2028{day}', amount=day * 100,
+                type='BILL', date=make_aware(datetime(2025, 3, day)))
+
+    def test_streamed_list_matches_regular_response(self):
+        """
+        Should stream the same JSON as the regular list, in chunks of
+        stream_chunk_size rows, with the month's ETag.
+        """
+        regular = self.client.get('/expenditures/', self.params)
+
+        with patch.object(ExpenditureViewSet, 'stream_chunk_size', 2):
+            response = self.client.get(
+                '/expenditures/', {**self.params, 'format': 'stream'})
+            chunks = list(response.streaming_content)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response['ETag'], regular['ETag'])
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(b''.join(chunks), regular.content)
+
+    def test_streamed_empty_list_and_not_modified(self):
+        """
+        Should stream an empty array for an empty month and honour
+        If-None-Match.
+        """
+        for url in ['/income/', '/disposable-spending/']:
+            response = self.client.get(
+                url, {**self.params, 'format': 'stream'})
+            self.assertEqual(b''.join(response.streaming_content), b'[]')
+
+            response = self.client.get(
+                url, {**self.params, 'format': 'stream'},
+                HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 304)
+
+
+class CompactFormatTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='tester', password='pass')
+        self.client.force_authenticate(user=self.user)
+        self.date = make_aware(datetime(2025, 3, 15, 9, 30))
+        self.params = {'month': '2025-03', 'format': 'compact'}
+        self.income = Income.objects.create(
+            owner=self.user, title='Salary', amount=250050, date=self.date)
+        Expenditure.objects.create(
+            owner=self.user, title='Rent', amount=99999, type='BILL',
+            date=self.date)
+        Currency.objects.create(owner=self.user, currency='USD')
+
+    def test_list_returns_pence_and_top_level_currency(self):
+        """
+        Should list raw pence and ISO dates under one currency code,
+        without formatted fields or a currency symbol lookup.
+        """
+        with self.assertNumQueries(2):
+            response = self.client.get('/income/', self.params)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'currency': 'USD',
+            'results': [{
+                'id': self.income.pk, 'title': 'Salary', 'amount': 250050,
+                'date': '2025-03-15T09:30:00Z', 'repeated': 'NEVER',
+            }],
+        })
+
+        response = self.client.get('/expenditures/', self.params)
+        self.assertEqual(response.json()['results'][0]['type'], 'BILL')
+
+    def test_summaries_return_raw_pence(self):
+        """
+        Should return the summaries' raw pence totals.
+        """
+        monthly = self.client.get('/monthly-summary/', self.params).json()
+        weekly = self.client.get('/weekly-summary/', self.params).json()
+        calendar = self.client.get('/calendar-summary/', self.params).json()
+
+        self.assertEqual(monthly['currency'], 'USD')
+        self.assertEqual(monthly['income'], 250050)
+        self.assertEqual(monthly['total'], 250050 - 99999)
+        self.assertEqual(weekly['currency'], 'USD')
+        self.assertEqual(
+            sum(week['weekly_income'] for week in weekly['weeks']), 250050)
+        self.assertEqual(calendar['days'][14], {
+            'date': '2025-03-15', 'income': 250050, 'expenditure': 99999})
+
+    def test_default_currency_without_currency_row(self):
+        """
+        Should report GBP for users who never chose a currency.
+        """
+        Currency.objects.filter(owner=self.user).delete()
+
+        response = self.client.get('/disposable-spending/', self.params)
+
+        self.assertEqual(response.json(), {'currency': 'GBP', 'results': []})
+
+    def test_format_has_own_etag_and_cache_entry(self):
+        """
+        Should give compact and formatted responses different ETags
+        and cache them separately.
+        """
+        formatted = self.client.get(
+            '/monthly-summary/', {'month': '2025-03'})
+        compact = self.client.get('/monthly-summary/', self.params)
+
+        self.assertNotEqual(compact['ETag'], formatted['ETag'])
+        self.assertIn('formatted_income', formatted.json())
+        self.assertEqual(compact.json()['income'], 250050)
+
+        response = self.client.get(
+            '/monthly-summary/', self.params,
+            HTTP_IF_NONE_MATCH=formatted['ETag'])
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            '/monthly-summary/', self.params,
+            HTTP_IF_NONE_MATCH=compact['ETag'])
+        self.assertEqual(response.status_code, 304)
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
@@ -9,9 +10,25 @@ from .views import (
     CalendarSummaryView,
     WeeklySummaryView,
     MonthlySummaryView,
+    ArchivedTransactionViewSet,
+    AsyncCalendarSummaryView,
+    AsyncWeeklySummaryView,
+    AsyncMonthlySummaryView,
 )
 
 
+# Serve the summaries from async views (with concurrent queries)
+# when deployed under ASGI
+if settings.ASYNC_SUMMARY_VIEWS:
+    monthly_summary_view = AsyncMonthlySummaryView
+    weekly_summary_view = AsyncWeeklySummaryView
+    calendar_summary_view = AsyncCalendarSummaryView
+else:
+    monthly_summary_view = MonthlySummaryView
+    weekly_summary_view = WeeklySummaryView
+    calendar_summary_view = CalendarSummaryView
+
+
 router = DefaultRouter()
 router.register(r'expenditures', ExpenditureViewSet, basename='expenditures')
 router.register(r'income', IncomeViewSet, basename='income')
@@ -20,13 +37,14 @@ router.register(r'disposable-spending', DisposableIncomeSpendingViewSet,
 router.register(r'disposable-budget', DisposableIncomeBudgetViewSet,
                 basename='disposable-budget')
 router.register(r'currency', CurrencyViewSet, basename='currency')
+router.register(r'archive', ArchivedTransactionViewSet, basename='archive')
 
 urlpatterns = [
      path('', include(router.urls)),
-     path('monthly-summary/', MonthlySummaryView.as_view(),
+     path('monthly-summary/', monthly_summary_view.as_view(),
           name='monthly-summary'),
-     path('weekly-summary/', WeeklySummaryView.as_view(),
+     path('weekly-summary/', weekly_summary_view.as_view(),
           name='weekly-summary'),
-     path('calendar-summary/', CalendarSummaryView.as_view(),
+     path('calendar-summary/', calendar_summary_view.as_view(),
           name='calendar-summary'),
 ]
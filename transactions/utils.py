@@ -1,14 +1,59 @@
+from django.conf import settings
+from contextlib import contextmanager
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.utils.timezone import make_aware, now
 from dateutil.relativedelta import relativedelta
+from rest_framework.exceptions import ValidationError
 from datetime import timedelta, time, datetime
 from calendar import monthrange
+import time as timer
 import uuid
 from transactions.models import (
     Income,
     Expenditure,
     DisposableIncomeSpending,
     DisposableIncomeBudget,
+    ArchivedTransaction,
 )
+from core.utils.data_version import (
+    bump_data_versions,
+    get_data_months,
+    get_instance_months,
+)
+from core.utils import metrics
+
+
+def get_repeat_dates(base_date, repeated, until=None):
+    """
+    Returns the dates a WEEKLY or MONTHLY entry repeats on after its
+    base date, up to and including `until`. By default that is the last
+    visible date: the last day of the month 5 months after the base date.
+    Monthly repeats keep the base day, clamped to shorter months
+    (e.g. Jan 31 -> Feb 28).
+    """
+    if until is None:
+        final_month = base_date.replace(day=1) + relativedelta(months=5)
+        until = final_month.replace(
+            day=monthrange(final_month.year, final_month.month)[1])
+
+    dates = []
+    if repeated == 'WEEKLY':
+        current_date = base_date + timedelta(days=7)
+        while current_date <= until:
+            dates.append(current_date)
+            current_date += timedelta(days=7)
+    elif repeated == 'MONTHLY':
+        i = 1
+        while True:
+            new_date = base_date + relativedelta(months=i)
+            last_day = monthrange(new_date.year, new_date.month)[1]
+            new_date = new_date.replace(day=min(base_date.day, last_day))
+            if new_date > until:
+                break
+            dates.append(new_date)
+            i += 1
+    return dates
 
 
 def generate_weekly_repeats_for_6_months(instance, model_class):
@@ -16,26 +61,14 @@ def generate_weekly_repeats_for_6_months(instance, model_class):
     Repeats an entry weekly for 6 months from its original date.
     No entries are created beyond the end of the month that is 5 months ahead.
     """
+    started = timer.perf_counter()
     if not instance.repeat_group_id:
         instance.repeat_group_id = uuid.uuid4()
         instance.save(update_fields=["repeat_group_id"])
 
-    base_date = instance.date
-    # Define the last valid visible date = start of base month + 5 months
-    final_month = base_date.replace(day=1) + relativedelta(months=5)
-    final_day = monthrange(
-        final_month.year, final_month.month)[1]
-    final_visible_date = final_month.replace(day=final_day)
-
-    # Generate repeated weekly dates
-    current_date = base_date + timedelta(days=7)
-    repeats = []
-
-    while current_date <= final_visible_date:
-        repeats.append(current_date)
-        current_date += timedelta(days=7)
-
-    _bulk_create_repeats(instance, model_class, repeats)
+    requested = _bulk_create_repeats(
+        instance, model_class, get_repeat_dates(instance.date, 'WEEKLY'))
+    _record_repeat_generation('weekly', model_class, requested, started)
 
 
 def generate_monthly_repeats_for_6_months(instance, model_class):
@@ -43,20 +76,14 @@ def generate_monthly_repeats_for_6_months(instance, model_class):
     Repeats an entry monthly for 6 months from its original date.
     Adjusts days to avoid invalid dates (e.g., Feb 30).
     """
+    started = timer.perf_counter()
     if not instance.repeat_group_id:
         instance.repeat_group_id = uuid.uuid4()
         instance.save(update_fields=["repeat_group_id"])
 
-    repeats = []
-    base_date = instance.date
-
-    for i in range(1, 6):
-        new_date = base_date + relativedelta(months=i)
-        last_day = monthrange(new_date.year, new_date.month)[1]
-        new_date = new_date.replace(day=min(base_date.day, last_day))
-        repeats.append(new_date)
-
-    _bulk_create_repeats(instance, model_class, repeats)
+    requested = _bulk_create_repeats(
+        instance, model_class, get_repeat_dates(instance.date, 'MONTHLY'))
+    _record_repeat_generation('monthly', model_class, requested, started)
 
 
 def generate_6th_month_repeats(model_class, user, current_month):
@@ -65,6 +92,8 @@ def generate_6th_month_repeats(model_class, user, current_month):
     by checking existing repeated entries in the 5th month (current + 4).
     Avoids duplicate generation. Handles both weekly and monthly types.
     """
+    started = timer.perf_counter()
+
     # Define 5th and 6th months
     fifth_month = current_month + relativedelta(months=4)
     sixth_month = current_month + relativedelta(months=5)
@@ -137,8 +166,14 @@ def generate_6th_month_repeats(model_class, user, current_month):
             next_date += timedelta(days=7)
 
     # ---- 3. Create all entries at once ----
+    # Rows inserted by a concurrent run are skipped by the
+    # (owner, repeat_group_id, date) unique constraint.
     if new_entries:
-        model_class.objects.bulk_create(new_entries)
+        model_class.objects.bulk_create(new_entries, ignore_conflicts=True)
+        bump_data_versions(get_instance_months(new_entries))
+
+    _record_repeat_generation(
+        'sixth_month', model_class, len(new_entries), started)
 
 
 def _clone_entry(entry, date):
@@ -158,9 +193,11 @@ def _clone_entry(entry, date):
     return entry.__class__(**data)
 
 
-def _bulk_create_repeats(instance, model_class, date_list):
+def _bulk_create_repeats(instance, model_class, date_list) -> int:
     """
     Helper to bulk-create repeated entries based on a list of dates.
+    Returns the number of entries submitted, including any the unique
+    constraint skipped because they already exist.
     """
     entries = [
         model_class(
@@ -174,39 +211,134 @@ def _bulk_create_repeats(instance, model_class, date_list):
         )
         for date in date_list
     ]
-    model_class.objects.bulk_create(entries)
+    model_class.objects.bulk_create(entries, ignore_conflicts=True)
+    bump_data_versions(get_instance_months(entries))
+    return len(entries)
 
 
-def clean_old_transactions(user):
+def _record_repeat_generation(generator, model_class, requested, started):
     """
-    Deletes all of a user's financial records that are older than
-    the start of the visible window (current month - 5 months).
+    Records a repeat generator run, the entries it submitted for
+    insertion and its duration since `started` (a perf_counter value)
+    in the metrics registry.
+    """
+    metrics.repeat_generations.inc(generator=generator)
+    metrics.repeat_entries_requested.inc(
+        requested, generator=generator, model=model_class.__name__)
+    metrics.repeat_generation_duration.observe(
+        timer.perf_counter() - started, generator=generator)
+
+
+# Models whose rows are pruned once they leave the visible window
+TRANSACTION_MODELS = [
+    Income,
+    Expenditure,
+    DisposableIncomeSpending,
+    DisposableIncomeBudget,
+]
+
+# ArchivedTransaction.kind recorded for each transaction model
+ARCHIVE_KINDS = {
+    Income: 'INCOME',
+    Expenditure: 'EXPENDITURE',
+    DisposableIncomeSpending: 'DISPOSABLE_SPENDING',
+    DisposableIncomeBudget: 'DISPOSABLE_BUDGET',
+}
+
+
+def get_cleanup_cutoff():
+    """
+    Returns the start of the visible window (start of current month
+    - 6 months). Financial records dated before this are pruned.
     """
     # 1. Get current month as datetime (first day of month)
     current_month_start = now().replace(
         day=1, hour=0, minute=0, second=0, microsecond=0)
 
     # 2. Calculate the cutoff date (start of current month - 6 months)
-    cutoff_date = current_month_start - relativedelta(months=6)
-
-    # 3. Models to clean
-    transaction_models = [
-        Income,
-        Expenditure,
-        DisposableIncomeSpending,
-        DisposableIncomeBudget,
-    ]
+    return current_month_start - relativedelta(months=6)
+
+
+def clean_old_transactions(user):
+    """
+    Deletes all of a user's financial records that are older than
+    the start of the visible window (current month - 5 months).
+    Records are archived first when ARCHIVE_OLD_TRANSACTIONS is enabled.
+    """
+    cutoff_date = get_cleanup_cutoff()
 
-    # 4. Loop through and delete anything outside the visible window
-    for model in transaction_models:
-        model.objects.filter(owner=user, date__lt=cutoff_date).delete()
+    # Loop through and delete anything outside the visible window
+    for model in TRANSACTION_MODELS:
+        purge_transactions(
+            model.objects.filter(owner=user, date__lt=cutoff_date),
+            archive=settings.ARCHIVE_OLD_TRANSACTIONS
+        )
 
 
-def repeat_on_date_change(instance, model_class):
+def purge_transactions(queryset, archive=False) -> int:
+    """
+    Deletes the records in the queryset, first copying them into
+    ArchivedTransaction when `archive` is True. Archiving and deleting
+    run in one transaction so no record is lost or archived twice.
+    The data versions of the affected months are bumped.
+
+    Returns:
+        int: Number of records deleted.
+    """
+    if not archive:
+        months = get_data_months(queryset)
+        count, _ = queryset.delete()
+        bump_data_versions(months)
+        return count
+
+    kind = ARCHIVE_KINDS[queryset.model]
+
+    with transaction.atomic():
+        entries = list(queryset)
+        ArchivedTransaction.objects.bulk_create([
+            ArchivedTransaction(
+                owner_id=entry.owner_id,
+                kind=kind,
+                source_id=entry.pk,
+                title=getattr(entry, 'title', ''),
+                amount=entry.amount,
+                type=getattr(entry, 'type', ''),
+                date=entry.date,
+            )
+            for entry in entries
+        ])
+        # Delete exactly the archived rows, not a re-evaluated queryset
+        count, _ = queryset.model.objects.filter(
+            pk__in=[entry.pk for entry in entries]).delete()
+        bump_data_versions(get_instance_months(entries))
+
+    return count
+
+
+@contextmanager
+def reject_repeat_date_conflicts():
+    """
+    Runs the writes of an entry update in a transaction, and turns a
+    clash with the (owner, repeat_group_id, date) unique constraint
+    into a 400 instead of a 500.
+    """
+    try:
+        with transaction.atomic():
+            yield
+    except IntegrityError:
+        raise ValidationError(
+            {'date': "Another entry in this series is on this date."})
+
+
+def repeat_on_date_change(instance, model_class, old_group_id=None):
     """
     Handles the regeneration of a repeat chain when the `date`
     on an entry is changed by the user.
 
+    `old_group_id` is the group the entry belonged to before the edit,
+    for callers that saved the new date outside the group: a sibling
+    may already be on that date, which unique_together forbids.
+
     Steps:
     1. Save current form data.
     2. Delete this instance and all future ones in the group.
@@ -214,7 +346,8 @@ def repeat_on_date_change(instance, model_class):
     4. Use the model's repeat function to generate new entries.
     """
     user = instance.owner
-    old_group_id = instance.repeat_group_id
+    if old_group_id is None:
+        old_group_id = instance.repeat_group_id
     new_group_id = uuid.uuid4()
     repeat_type = instance.repeated
 
@@ -233,11 +366,16 @@ def repeat_on_date_change(instance, model_class):
         base_data['type'] = instance.type
 
     # Delete the edited and future instances in the old group
-    model_class.objects.filter(
-        owner=user,
-        repeat_group_id=old_group_id,
-        date__gte=instance.date
-    ).delete()
+    old_entries = model_class.objects.filter(
+        Q(pk=instance.pk) | Q(
+            owner=user,
+            repeat_group_id=old_group_id,
+            date__gte=instance.date
+        )
+    )
+    months = get_data_months(old_entries)
+    old_entries.delete()
+    bump_data_versions(months)
 
     # Create new updated instance with same values but new group
     new_instance = model_class.objects.create(**base_data)
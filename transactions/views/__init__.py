@@ -6,3 +6,9 @@ from .currency import CurrencyViewSet
 from .calendar_summary import CalendarSummaryView
 from .monthly_summary import MonthlySummaryView
 from .weekly_summary import WeeklySummaryView
+from .archive import ArchivedTransactionViewSet
+from .async_summary import (
+    AsyncCalendarSummaryView,
+    AsyncMonthlySummaryView,
+    AsyncWeeklySummaryView,
+)
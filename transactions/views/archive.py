@@ -0,0 +1,34 @@
+from rest_framework import mixins, viewsets, permissions
+from core.utils.date_helpers import get_user_and_month_range
+from ..models.archive import ArchivedTransaction
+from ..serializers.archive import ArchivedTransactionSerializer
+
+
+class ArchivedTransactionViewSet(mixins.ListModelMixin,
+                                 viewsets.GenericViewSet):
+    """
+    Read-only access to a user's archived financial history.
+
+    - GET /archive/?month=YYYY-MM             → all archived records
+    - GET /archive/?month=YYYY-MM&kind=INCOME → records of one kind
+    """
+    serializer_class = ArchivedTransactionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        Returns the current user's archived records for the selected
+        month, optionally filtered by kind.
+        """
+        user, start, end = get_user_and_month_range(self.request)
+        queryset = ArchivedTransaction.objects.filter(
+            owner=user,
+            date__gte=start,
+            date__lt=end
+        )
+
+        kind = self.request.GET.get('kind')
+        if kind:
+            queryset = queryset.filter(kind=kind.upper())
+
+        return queryset.order_by('date')
@@ -0,0 +1,83 @@
+import asyncio
+from rest_framework.response import Response
+from transactions.serializers.calendar_summary import CalendarSummarySerializer
+from transactions.serializers.monthly_summary import MonthlySummarySerializer
+from transactions.serializers.weekly_summary import WeeklySummarySerializer
+from core.utils.async_views import AsyncAPIViewMixin, run_query
+from core.utils.currency import get_user_currency_symbol
+from core.utils.date_helpers import get_user_and_month_range
+from .calendar_summary import CalendarSummaryView
+from .monthly_summary import MonthlySummaryView
+from .weekly_summary import WeeklySummaryView
+
+
+class AsyncSummaryMixin(AsyncAPIViewMixin):
+    """
+    Shared async flow for the summary views: the snapshot lookup (or
+    the view's own aggregates) and the currency symbol lookup run
+    concurrently, then the response is serialized without further
+    queries. Compact responses skip the currency symbol lookup.
+    """
+    serializer_class = None
+
+    async def get(self, request) -> Response:
+        user, start, end = get_user_and_month_range(request)
+
+        if self.is_compact():
+            data = await self.aget_summary_data(user, start, end)
+            return self.compact_response(data)
+
+        data, _ = await asyncio.gather(
+            self.aget_summary_data(user, start, end),
+            run_query(get_user_currency_symbol, request),
+        )
+
+        serializer = self.serializer_class(
+            data, many=isinstance(data, list), context={'request': request})
+        return Response(self.wrap_response_data(serializer.data))
+
+    async def aget_summary_data(self, user, start, end):
+        data = await run_query(self._get_snapshot_data, user, start)
+        if data is not None:
+            return data
+        return await self.abuild_summary_data(user, start, end)
+
+    async def abuild_summary_data(self, user, start, end):
+        return await run_query(self.build_summary_data, user, start, end)
+
+    def wrap_response_data(self, data):
+        return data
+
+
+class AsyncMonthlySummaryView(AsyncSummaryMixin, MonthlySummaryView):
+    """
+    Async MonthlySummaryView: the per-kind ledger totals and the
+    budget are queried concurrently.
+    """
+    serializer_class = MonthlySummarySerializer
+
+    async def abuild_summary_data(self, user, start, end) -> dict:
+        totals, budget_amount = await asyncio.gather(
+            run_query(self._get_totals_by_kind, user, start, end),
+            run_query(self._get_budget_amount, user, start),
+        )
+        return self._combine_totals(totals, budget_amount)
+
+
+class AsyncWeeklySummaryView(AsyncSummaryMixin, WeeklySummaryView):
+    """
+    Async WeeklySummaryView. Its single aggregate query runs alongside
+    the currency lookup.
+    """
+    serializer_class = WeeklySummarySerializer
+
+    def wrap_response_data(self, data):
+        return {'weeks': data}
+
+
+class AsyncCalendarSummaryView(AsyncSummaryMixin, CalendarSummaryView):
+    """
+    Async CalendarSummaryView. Its single aggregate query runs
+    alongside the currency lookup.
+    """
+    serializer_class = CalendarSummarySerializer
@@ -1,56 +1,75 @@
 from collections import defaultdict
 from datetime import timedelta
+from django.db.models import Q, Sum
+from django.db.models.functions import TruncDate
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from transactions.models import Income, Expenditure, DisposableIncomeSpending
+from transactions.models import LedgerEntry
 from transactions.serializers.calendar_summary import CalendarSummarySerializer
+from core.utils.compact import CompactResponseMixin
+from core.utils.conditional import CachedMonthResponseMixin
 from core.utils.date_helpers import get_user_and_month_range
+from core.utils.snapshots import MonthSnapshotMixin
 
 
-class CalendarSummaryView(APIView):
+class CalendarSummaryView(
+        CachedMonthResponseMixin, CompactResponseMixin, MonthSnapshotMixin,
+        APIView):
     """
     API view that returns a daily summary of income and expenditure
     for the current or requested month. Used in the calendar view.
     """
     permission_classes = [IsAuthenticated]
+    snapshot_field = 'calendar'
+    compact_key = 'days'
 
     def get(self, request) -> Response:
         # 1. Get user and this month's date range
         user, start_of_month, end_of_month = get_user_and_month_range(request)
 
-        # 2. Set up a daily income/expenditure tracker
-        day_totals = defaultdict(lambda: {"income": 0, "expenditure": 0})
-
-        # 3. Preload financial records and aggregate by day
-        self._aggregate_by_day(
-            Income, "income", user, start_of_month, end_of_month, day_totals)
-        self._aggregate_by_day(
-            Expenditure, "expenditure", user, start_of_month,
-            end_of_month, day_totals)
-        self._aggregate_by_day(
-            DisposableIncomeSpending, "expenditure", user,
-            start_of_month, end_of_month, day_totals)
-
-        # 4. Generate a list of daily summaries in order
-        result = self._build_result(start_of_month, end_of_month, day_totals)
+        # 2. Get raw daily summaries, frozen for closed months
+        result = self.get_summary_data(user, start_of_month, end_of_month)
+        if self.is_compact():
+            return self.compact_response(result)
 
-        # 5. Serialize and return the summary data
+        # 3. Serialize and return the summary data
         serializer = CalendarSummarySerializer(
             result, many=True, context={"request": request})
         return Response(serializer.data)
 
-    def _aggregate_by_day(
-            self, model, field: str, user, start, end, day_totals):
+    def build_summary_data(self, user, start_of_month,
+                           end_of_month) -> list[dict]:
+        """
+        Computes raw (pence) income and expenditure for every day of
+        the month, in order.
+        """
+        # 1. Set up a daily income/expenditure tracker
+        day_totals = defaultdict(lambda: {"income": 0, "expenditure": 0})
+
+        # 2. Aggregate daily totals in one grouped query
+        self._aggregate_by_day(user, start_of_month, end_of_month, day_totals)
+
+        # 3. Generate a list of daily summaries in order
+        return self._build_result(start_of_month, end_of_month, day_totals)
+
+    def _aggregate_by_day(self, user, start, end, day_totals):
         """
-        Fetches records from a given model and adds daily totals
-        to the day_totals dict using date keys.
+        Sums income and expenditure (including disposable spending)
+        per day from the ledger and adds them to the day_totals dict
+        using date keys.
         """
-        records = model.objects.filter(
-            owner=user, date__gte=start, date__lt=end)
-        for item in records:
-            date_key = item.date.date().isoformat()
-            day_totals[date_key][field] += item.amount
+        rows = LedgerEntry.objects.filter(
+            owner=user, date__gte=start, date__lt=end
+        ).annotate(day=TruncDate('date')).values('day').annotate(
+            income=Sum('amount', filter=Q(kind='income')),
+            expenditure=Sum('amount', filter=~Q(kind='income')),
+        ).order_by()
+
+        for row in rows:
+            date_key = row['day'].isoformat()
+            day_totals[date_key]['income'] += row['income'] or 0
+            day_totals[date_key]['expenditure'] += row['expenditure'] or 0
 
     def _build_result(self, start, end, day_totals) -> list[dict]:
         """
@@ -1,11 +1,18 @@
 from rest_framework import viewsets, permissions
 from rest_framework.exceptions import PermissionDenied
 from core.utils.date_helpers import get_user_and_month_range
+from core.utils.conditional import ConditionalMonthMixin
+from core.utils.data_version import bump_data_versions, get_instance_months
+from core.utils.compact import CompactListMixin
+from core.utils.idempotency import IdempotentCreateMixin
+from core.utils.streaming import StreamingListMixin
 from ..models.disposable import DisposableIncomeSpending
 from ..serializers.disposable import DisposableIncomeSpendingSerializer
 
 
-class DisposableIncomeSpendingViewSet(viewsets.ModelViewSet):
+class DisposableIncomeSpendingViewSet(
+        ConditionalMonthMixin, IdempotentCreateMixin, CompactListMixin,
+        StreamingListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing disposable income spending entries.
 
@@ -26,7 +33,7 @@ class DisposableIncomeSpendingViewSet(viewsets.ModelViewSet):
             owner=user,
             date__gte=start,
             date__lt=end
-        ).order_by('date')
+        ).select_related('owner').order_by('date')
 
     def perform_create(self, serializer):
         """
@@ -34,6 +41,23 @@ class DisposableIncomeSpendingViewSet(viewsets.ModelViewSet):
         """
         serializer.save(owner=self.request.user)
 
+    def perform_update(self, serializer):
+        """
+        Saves the entry and bumps the data version of the month it was
+        in before the update, in case its date moved it to another month.
+        """
+        months = get_instance_months([serializer.instance])
+        serializer.save()
+        bump_data_versions(months)
+
+    def perform_destroy(self, instance):
+        """
+        Deletes the entry and bumps the data version of its month.
+        """
+        months = get_instance_months([instance])
+        instance.delete()
+        bump_data_versions(months)
+
     def get_object(self):
         """
         Ensures that only the owner can access the spending entry.
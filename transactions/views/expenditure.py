@@ -5,14 +5,26 @@ import uuid
 from ..models.expenditure import Expenditure
 from ..serializers.expenditure import ExpenditureSerializer
 from core.utils.date_helpers import get_user_and_month_range
+from core.utils.conditional import ConditionalMonthMixin
+from core.utils.data_version import (
+    bump_data_versions,
+    get_data_months,
+    get_instance_months,
+)
+from core.utils.compact import CompactListMixin
+from core.utils.idempotency import IdempotentCreateMixin
+from core.utils.streaming import StreamingListMixin
 from ..utils import (
     generate_weekly_repeats_for_6_months,
     generate_monthly_repeats_for_6_months,
-    repeat_on_date_change
+    reject_repeat_date_conflicts,
+    repeat_on_date_change,
 )
 
 
-class ExpenditureViewSet(viewsets.ModelViewSet):
+class ExpenditureViewSet(ConditionalMonthMixin, IdempotentCreateMixin,
+                         CompactListMixin, StreamingListMixin,
+                         viewsets.ModelViewSet):
     """
     Handles CRUD for a user's monthly expenditure entries.
 
@@ -20,9 +32,12 @@ class ExpenditureViewSet(viewsets.ModelViewSet):
     - Automatic generation of repeated entries (weekly/monthly)
     - Grouped deletion of future repeated entries
     - Group-aware update propagation
+    - Opt-in streamed (?format=stream) and compact (?format=compact)
+      list responses
     """
     serializer_class = ExpenditureSerializer
     permission_classes = [permissions.IsAuthenticated]
+    compact_fields = ('id', 'title', 'amount', 'type', 'date', 'repeated')
 
     def get_queryset(self):
         """
@@ -33,7 +48,7 @@ class ExpenditureViewSet(viewsets.ModelViewSet):
             owner=user,
             date__gte=start,
             date__lt=end
-        ).order_by('date')
+        ).select_related('owner').order_by('date')
 
     def perform_create(self, serializer):
         """
@@ -70,51 +85,68 @@ class ExpenditureViewSet(viewsets.ModelViewSet):
             instance.repeated in ['WEEKLY', 'MONTHLY']
             and instance.repeat_group_id
         ):
-            Expenditure.objects.filter(
+            group_entries = Expenditure.objects.filter(
                 owner=request.user,
                 repeat_group_id=instance.repeat_group_id,
                 date__gte=instance.date
-            ).delete()
+            )
+            months = get_data_months(group_entries)
+            group_entries.delete()
         else:
+            months = get_instance_months([instance])
             instance.delete()
 
+        bump_data_versions(months)
+
         return Response(
             status=status.HTTP_204_NO_CONTENT)
 
+    @reject_repeat_date_conflicts()
     def perform_update(self, serializer):
         """
         Updates the expenditure and propagates changes to future
         repeated entries.
         """
         original = self.get_object()
-        instance = serializer.save()
+        data = serializer.validated_data
 
         # Check if this is a repeated entry with a date change
         if (
-            instance.repeated in ['WEEKLY', 'MONTHLY']
-            and instance.repeat_group_id
-            and instance.date != original.date
+            data.get('repeated', original.repeated) in ['WEEKLY', 'MONTHLY']
+            and original.repeat_group_id
+            and data.get('date', original.date) != original.date
         ):
-            # Handle regeneration logic and exit early
-            repeat_on_date_change(instance, model_class=Expenditure)
+            # Save outside the group, as a sibling may already be on the
+            # new date, then handle regeneration logic and exit early
+            instance = serializer.save(repeat_group_id=None)
+            repeat_on_date_change(
+                instance, model_class=Expenditure,
+                old_group_id=original.repeat_group_id)
+            bump_data_versions(get_instance_months([original]))
             return
 
-        old_group_id = instance.repeat_group_id
+        old_group_id = original.repeat_group_id
         new_group_id = uuid.uuid4()
 
-        # Update the edited instance with the new group ID
-        instance.repeat_group_id = new_group_id
-        instance.save(update_fields=['repeat_group_id'])
+        # Save straight into the new group, as the entry may have moved
+        # onto a date its old group already uses
+        instance = serializer.save(repeat_group_id=new_group_id)
 
         # Update future entries in the group
-        Expenditure.objects.filter(
+        future_entries = Expenditure.objects.filter(
             owner=self.request.user,
             repeat_group_id=old_group_id,
             date__gt=instance.date
-        ).update(
+        )
+        months = get_data_months(future_entries)
+        future_entries.update(
             title=instance.title,
             amount=instance.amount,
             repeated=instance.repeated,
             repeat_group_id=new_group_id,
             type=instance.type
         )
+
+        # The saved instance bumped its new month; also bump the updated
+        # entries and the month the entry may have moved out of
+        bump_data_versions(months | get_instance_months([original]))
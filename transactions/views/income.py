@@ -5,20 +5,33 @@ import uuid
 from ..models.income import Income
 from ..serializers.income import IncomeSerializer
 from core.utils.date_helpers import get_user_and_month_range
+from core.utils.conditional import ConditionalMonthMixin
+from core.utils.data_version import (
+    bump_data_versions,
+    get_data_months,
+    get_instance_months,
+)
+from core.utils.compact import CompactListMixin
+from core.utils.idempotency import IdempotentCreateMixin
+from core.utils.streaming import StreamingListMixin
 from ..utils import (
     generate_weekly_repeats_for_6_months,
     generate_monthly_repeats_for_6_months,
-    repeat_on_date_change
+    reject_repeat_date_conflicts,
+    repeat_on_date_change,
 )
 
 
-class IncomeViewSet(viewsets.ModelViewSet):
+class IncomeViewSet(ConditionalMonthMixin, IdempotentCreateMixin,
+                    CompactListMixin, StreamingListMixin,
+                    viewsets.ModelViewSet):
     """
     Handles listing, creating, updating, and deleting income entries
     for the current user within the selected or current month.
     """
     serializer_class = IncomeSerializer
     permission_classes = [permissions.IsAuthenticated]
+    compact_fields = ('id', 'title', 'amount', 'date', 'repeated')
 
     def get_queryset(self):
         """
@@ -29,7 +42,7 @@ class IncomeViewSet(viewsets.ModelViewSet):
             owner=user,
             date__gte=start,
             date__lt=end
-        ).order_by('date')
+        ).select_related('owner').order_by('date')
 
     def perform_create(self, serializer):
         """
@@ -54,14 +67,19 @@ class IncomeViewSet(viewsets.ModelViewSet):
             instance.repeated in ['WEEKLY', 'MONTHLY']
             and instance.repeat_group_id
         ):
-            Income.objects.filter(
+            group_entries = Income.objects.filter(
                 owner=request.user,
                 repeat_group_id=instance.repeat_group_id,
                 date__gte=instance.date
-            ).delete()
+            )
+            months = get_data_months(group_entries)
+            group_entries.delete()
         else:
+            months = get_instance_months([instance])
             instance.delete()
 
+        bump_data_versions(months)
+
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     def get_object(self):
@@ -75,6 +93,7 @@ class IncomeViewSet(viewsets.ModelViewSet):
                 "You do not have permission to access this income entry.")
         return obj
 
+    @reject_repeat_date_conflicts()
     def perform_update(self, serializer):
         """
         Handles update logic for Income entries, including repeated entries.
@@ -93,32 +112,37 @@ class IncomeViewSet(viewsets.ModelViewSet):
         """
         # Fetch the original (pre-update) version to compare the date
         original = self.get_object()
-
-        instance = serializer.save()
+        data = serializer.validated_data
 
         # Check if this is a repeated entry with a date change
         if (
-            instance.repeated in ['WEEKLY', 'MONTHLY']
-            and instance.repeat_group_id
-            and instance.date != original.date
+            data.get('repeated', original.repeated) in ['WEEKLY', 'MONTHLY']
+            and original.repeat_group_id
+            and data.get('date', original.date) != original.date
         ):
-
-            # Handle regeneration logic and exit early
-            repeat_on_date_change(instance, model_class=Income)
+            # Save outside the group, as a sibling may already be on the
+            # new date, then handle regeneration logic and exit early
+            instance = serializer.save(repeat_group_id=None)
+            repeat_on_date_change(
+                instance, model_class=Income,
+                old_group_id=original.repeat_group_id)
+            bump_data_versions(get_instance_months([original]))
             return
 
-        old_group_id = instance.repeat_group_id
+        old_group_id = original.repeat_group_id
         new_group_id = uuid.uuid4()
 
-        # Update the edited instance with the new group ID
-        instance.repeat_group_id = new_group_id
-        instance.save(update_fields=['repeat_group_id'])
+        # Save straight into the new group, as the entry may have moved
+        # onto a date its old group already uses
+        instance = serializer.save(repeat_group_id=new_group_id)
 
         future_entries = Income.objects.filter(
             owner=self.request.user,
             repeat_group_id=old_group_id,
             date__gt=instance.date)
 
+        months = get_data_months(future_entries)
+
         # Update all future entries (same group, same user,
         # after the edited date)
         future_entries.update(
@@ -127,3 +151,7 @@ class IncomeViewSet(viewsets.ModelViewSet):
             repeated=instance.repeated,
             repeat_group_id=new_group_id
         )
+
+        # The saved instance bumped its new month; also bump the updated
+        # entries and the month the entry may have moved out of
+        bump_data_versions(months | get_instance_months([original]))
@@ -2,59 +2,69 @@ from django.db.models import Sum
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from transactions.models import (
-    Income,
-    Expenditure,
-    DisposableIncomeSpending,
-    DisposableIncomeBudget
-)
+from transactions.models import DisposableIncomeBudget, LedgerEntry
 from transactions.serializers.monthly_summary import MonthlySummarySerializer
-from core.utils.date_helpers import get_weeks_in_month_clipped
+from core.utils.compact import CompactResponseMixin
+from core.utils.conditional import CachedMonthResponseMixin
+from core.utils.date_helpers import get_user_and_month_range
+from core.utils.snapshots import MonthSnapshotMixin
 
 
-class MonthlySummaryView(APIView):
+class MonthlySummaryView(
+        CachedMonthResponseMixin, CompactResponseMixin, MonthSnapshotMixin,
+        APIView):
     """
     API view that returns a monthly summary of all financial categories
     (income, spending, saving, investment, and disposable tracking)
     for the authenticated user.
     """
     permission_classes = [IsAuthenticated]
+    snapshot_field = 'monthly'
 
     def get(self, request) -> Response:
         # 1. Extract user and date range
-        user, weeks, start_date, end_date = get_weeks_in_month_clipped(request)
+        user, start_date, end_date = get_user_and_month_range(request)
 
-        # 2. Aggregate income total
-        total_income = self._get_total(Income, user, start_date, end_date)
+        # 2. Get raw totals, frozen for closed months
+        raw_data = self.get_summary_data(user, start_date, end_date)
+        if self.is_compact():
+            return self.compact_response(raw_data)
 
-        # 3. Aggregate expenditures by type
-        bills_total = self._get_total(
-            Expenditure, user, start_date, end_date, type='BILL')
-        saving_total = self._get_total(
-            Expenditure, user, start_date, end_date, type='SAVING')
-        investment_total = self._get_total(
-            Expenditure, user, start_date, end_date, type='INVESTMENT')
+        # 3. Build and return formatted response
+        serializer = MonthlySummarySerializer(
+            raw_data, context={'request': request})
+        return Response(serializer.data)
 
-        # 4. Get disposable income spending
-        disposable_spending = self._get_total(
-            DisposableIncomeSpending, user, start_date, end_date)
+    def build_summary_data(self, user, start_date, end_date) -> dict:
+        """
+        Computes the raw monthly totals (in pence) from the ledger
+        and the month's budget.
+        """
+        totals = self._get_totals_by_kind(user, start_date, end_date)
+        budget_amount = self._get_budget_amount(user, start_date)
+        return self._combine_totals(totals, budget_amount)
 
-        # 5. Get budget for the month
-        budget = DisposableIncomeBudget.objects.filter(
-          owner=user,
-          date__month=start_date.month,
-          date__year=start_date.year
-        ).first()
-        budget_amount = budget.amount if budget else 0
+    def _combine_totals(self, totals: dict[str, int],
+                        budget_amount: int) -> dict:
+        """
+        Builds the raw summary from per-kind totals and the budget.
+        """
+        # 1. Income and expenditures by type
+        total_income = totals.get('income', 0)
+        bills_total = totals.get('bill', 0)
+        saving_total = totals.get('saving', 0)
+        investment_total = totals.get('investment', 0)
 
-        # 6. Summary calculations
+        # 2. Disposable income spending
+        disposable_spending = totals.get('disposable', 0)
+
+        # 3. Summary calculations
         total = total_income - (
             bills_total + saving_total + investment_total +
             disposable_spending)
         remaining_disposable = budget_amount - disposable_spending
 
-        # 7. Build and return formatted response
-        raw_data = {
+        return {
             'income': total_income,
             'bills': bills_total,
             'saving': saving_total,
@@ -64,18 +74,27 @@ class MonthlySummaryView(APIView):
             'budget': budget_amount,
             'remaining_disposable': remaining_disposable,
         }
-        serializer = MonthlySummarySerializer(
-            raw_data, context={'request': request})
-        return Response(serializer.data)
 
-    def _get_total(self, model, user, start, end, **filters) -> int:
+    def _get_budget_amount(self, user, start_date) -> int:
+        """
+        Returns the user's disposable budget for the month, or 0.
+        """
+        budget = DisposableIncomeBudget.objects.filter(
+          owner=user,
+          date__month=start_date.month,
+          date__year=start_date.year
+        ).first()
+        return budget.amount if budget else 0
+
+    def _get_totals_by_kind(self, user, start, end) -> dict[str, int]:
         """
-        Aggregates the total 'amount' for a given model, user, and time range.
-        Optionally filters by expenditure type.
+        Sums 'amount' per ledger kind (income, bill, saving, investment,
+        disposable) for a user and time range in a single query.
+        Kinds without entries are omitted.
         """
-        return model.objects.filter(
+        rows = LedgerEntry.objects.filter(
             owner=user,
             date__gte=start,
-            date__lt=end,
-            **filters
-        ).aggregate(total=Sum('amount')).get('total') or 0
+            date__lt=end
+        ).values('kind').annotate(total=Sum('amount')).order_by()
+        return {row['kind']: row['total'] for row in rows}
@@ -1,36 +1,63 @@
 from datetime import timedelta
-from django.db.models import Sum
+from django.db.models import Q, Sum
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from transactions.models import Income, Expenditure, DisposableIncomeSpending
-from core.utils.date_helpers import get_weeks_in_month_clipped
+from transactions.models import LedgerEntry
+from core.utils.compact import CompactResponseMixin
+from core.utils.conditional import CachedMonthResponseMixin
+from core.utils.date_helpers import (
+    get_user_and_month_range,
+    get_weeks_clipped,
+)
+from core.utils.snapshots import MonthSnapshotMixin
 from transactions.serializers.weekly_summary import WeeklySummarySerializer
 
 
-class WeeklySummaryView(APIView):
+class WeeklySummaryView(
+        CachedMonthResponseMixin, CompactResponseMixin, MonthSnapshotMixin,
+        APIView):
     """
     Returns a list of weekly financial summaries for the current or#
     selected month,
     including total income, combined costs, and net difference per week.
     """
     permission_classes = [IsAuthenticated]
+    snapshot_field = 'weekly'
+    compact_key = 'weeks'
 
     def get(self, request):
-        # 1. Get user and week ranges clipped to current month
-        user, weeks, _, _ = get_weeks_in_month_clipped(request)
+        # 1. Get user and this month's date range
+        user, start, end = get_user_and_month_range(request)
 
+        # 2. Get raw weekly summaries, frozen for closed months
+        weekly_data = self.get_summary_data(user, start, end)
+        if self.is_compact():
+            return self.compact_response(weekly_data)
+
+        serializer = WeeklySummarySerializer(
+            weekly_data, many=True, context={'request': request})
+        return Response({'weeks': serializer.data})
+
+    def build_summary_data(self, user, start, end) -> list[dict]:
+        """
+        Computes raw (pence) income, cost and net totals for each week
+        of the month, with weeks clipped to the month.
+        """
+        weeks = get_weeks_clipped(start, end)
+
+        # Aggregate income and costs for every week in one query
+        totals = self._get_weekly_totals(user, weeks)
+        return self._build_weekly_data(weeks, totals)
+
+    def _build_weekly_data(self, weeks, totals: dict) -> list[dict]:
+        """
+        Builds the raw weekly summaries from the aggregated totals.
+        """
         weekly_data = []
-        for week_start, week_end in weeks:
-            # 2. Aggregate financial data in this week
-            income = self._get_total(
-                Income, user, week_start, week_end)
-            expenditures = self._get_total(
-                Expenditure, user, week_start, week_end)
-            disposable = self._get_total(
-                DisposableIncomeSpending, user, week_start, week_end)
-
-            total_cost = expenditures + disposable
+        for index, (week_start, week_end) in enumerate(weeks):
+            income = totals[f'income_{index}'] or 0
+            total_cost = totals[f'cost_{index}'] or 0
             summary = income - total_cost
 
             weekly_data.append({
@@ -40,17 +67,24 @@ class WeeklySummaryView(APIView):
                 'weekly_cost': total_cost,
                 'summary': summary,
             })
+        return weekly_data
 
-        serializer = WeeklySummarySerializer(
-            weekly_data, many=True, context={'request': request})
-        return Response({'weeks': serializer.data})
-
-    def _get_total(self, model, user, start, end) -> int:
+    def _get_weekly_totals(self, user, weeks) -> dict:
         """
-        Returns the sum of 'amount' for the given model, user, and date range.
+        Returns income and cost (all expenditure and disposable spending)
+        sums for each week, keyed 'income_<n>' and 'cost_<n>', using
+        conditional aggregates over the ledger in a single query.
         """
-        return model.objects.filter(
+        aggregates = {}
+        for index, (week_start, week_end) in enumerate(weeks):
+            in_week = Q(date__gte=week_start, date__lt=week_end)
+            aggregates[f'income_{index}'] = Sum(
+                'amount', filter=in_week & Q(kind='income'))
+            aggregates[f'cost_{index}'] = Sum(
+                'amount', filter=in_week & ~Q(kind='income'))
+
+        return LedgerEntry.objects.filter(
             owner=user,
-            date__gte=start,
-            date__lt=end
-        ).aggregate(total=Sum('amount')).get('total') or 0
+            date__gte=weeks[0][0],
+            date__lt=weeks[-1][1]
+        ).aggregate(**aggregates)